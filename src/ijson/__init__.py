@@ -13,7 +13,7 @@ Top-level ``ijson`` module exposes method from the pure Python backend. There's
 also two other backends using the C library yajl in ``ijson.backends`` that have
 the same API and are faster under CPython.
 '''
-from ijson.common import JSONError, IncompleteJSONError, ObjectBuilder
+from ijson.common import JSONError, IncompleteJSONError, ObjectBuilder, EVENT_NAMES
 
 from ijson.utils import coroutine, sendable_list
 from .version import __version__
@@ -45,15 +45,29 @@ del _default_backend
 
 basic_parse = backend.basic_parse
 basic_parse_coro = backend.basic_parse_coro
+basic_parse_batched = backend.basic_parse_batched
+basic_parse_columnar = backend.basic_parse_columnar
 parse = backend.parse
 parse_coro = backend.parse_coro
+parse_batched = backend.parse_batched
 items = backend.items
 items_coro = backend.items_coro
+numeric_items = backend.numeric_items
 kvitems = backend.kvitems
 kvitems_coro = backend.kvitems_coro
+columns = backend.columns
 basic_parse_async = backend.basic_parse_async
 parse_async = backend.parse_async
 items_async = backend.items_async
 kvitems_async = backend.kvitems_async
+Parser = backend.Parser
 backend_name = backend.backend_name
-backend = backend.backend
\ No newline at end of file
+backend = backend.backend
+
+
+def __getattr__(name):
+    # the executor machinery of parse_many is imported only when needed
+    if name == 'parse_many':
+        from ijson.parallel import parse_many
+        return parse_many
+    raise AttributeError("module %r has no attribute %r" % (__name__, name))
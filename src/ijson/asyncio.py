@@ -0,0 +1,112 @@
+'''
+asyncio protocol parsing JSON streams straight out of the receive buffer of
+their transport.
+'''
+
+import asyncio
+import collections
+
+import ijson
+
+
+class JSONStreamProtocol(asyncio.BufferedProtocol):
+    '''
+    A protocol parsing the JSON document streamed through its transport,
+    and an async iterable over the results of ``method`` (one of
+    ``basic_parse``, ``parse``, ``items`` or ``kvitems``) found in it.
+    Additional arguments are given to ``method``.
+
+    Data is parsed directly out of a receive buffer of ``buf_size`` bytes as
+    soon as it arrives, using an ``ijson.Parser`` of the named ``backend``
+    (the current one by default), so no awaiting is needed for each chunk.
+    Reading is paused when ``max_pending`` results are waiting to be
+    consumed, until half of them have been. Parsing errors close the
+    transport, and are raised once all previous results have been consumed,
+    as are errors of the connection.
+    '''
+
+    def __init__(self, method='items', *args, max_pending=1024, buf_size=64*1024,
+                 backend=None, **kwargs):
+        backend = ijson.get_backend(backend) if backend else ijson
+        self._parser = backend.Parser(method, *args, **kwargs)
+        self._buffer = memoryview(bytearray(buf_size))
+        self._max_pending = max_pending
+        self._pending = collections.deque()
+        self._transport = None
+        self._paused = False
+        self._waiter = None
+        self._done = False
+        self._exception = None
+
+    def connection_made(self, transport):
+        self._transport = transport
+
+    def get_buffer(self, sizehint):
+        return self._buffer
+
+    def buffer_updated(self, nbytes):
+        try:
+            results = self._parser.feed(self._buffer[:nbytes])
+        except Exception as e:
+            self._add_results(self._parser.close())
+            self._finish(e)
+            self._transport.close()
+            return
+        if results:
+            self._add_results(results)
+
+    def eof_received(self):
+        # connection_lost() follows
+        return False
+
+    def connection_lost(self, exc):
+        if self._done:
+            return
+        if exc is None:
+            try:
+                self._add_results(self._parser.close())
+            except Exception as e:
+                self._add_results(self._parser.close())
+                exc = e
+        else:
+            # the document is incomplete
+            try:
+                self._parser.close()
+            except Exception:
+                pass
+        self._finish(exc)
+
+    def _add_results(self, results):
+        self._pending.extend(results)
+        if not self._paused and len(self._pending) >= self._max_pending:
+            self._paused = True
+            self._transport.pause_reading()
+        self._wake_up()
+
+    def _finish(self, exc):
+        self._done = True
+        self._exception = exc
+        self._wake_up()
+
+    def _wake_up(self):
+        waiter, self._waiter = self._waiter, None
+        if waiter is not None and not waiter.done():
+            waiter.set_result(None)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        while not self._pending:
+            if self._done:
+                if self._exception is not None:
+                    exception, self._exception = self._exception, None
+                    raise exception
+                raise StopAsyncIteration
+            self._waiter = asyncio.get_running_loop().create_future()
+            await self._waiter
+        result = self._pending.popleft()
+        if self._paused and len(self._pending) <= self._max_pending // 2 and not self._done:
+            self._paused = False
+            self._transport.resume_reading()
+        return result
@@ -25,8 +25,9 @@ static int async_reading_generator_init(async_reading_generator *self, PyObject
 	self->events = NULL;
 	self->index = 0;
 	self->file_exhausted = 0;
+	self->batched = 0;
 
-	M1_Z(PyArg_ParseTuple(args, "OO", &self->file, &self->buf_size));
+	M1_Z(PyArg_ParseTuple(args, "OO|p", &self->file, &self->buf_size, &self->batched));
 	Py_INCREF(self->file);
 	Py_INCREF(self->buf_size);
 	if (!PyNumber_Check(self->buf_size)) {
@@ -80,6 +81,16 @@ static PyObject *maybe_pop_event(async_reading_generator *self)
 	if (nevents == 0) {
 		return NULL;
 	}
+	// all events of the last chunk are returned at once
+	if (self->batched) {
+		PyObject *batch = PyList_GetSlice(events, 0, nevents);
+		if (!batch || PyList_SetSlice(events, 0, nevents, NULL) == -1) {
+			Py_XDECREF(batch);
+			Py_RETURN_NONE;
+		}
+		raise_stopiteration(batch);
+		return batch;
+	}
 	PyObject *event = PyList_GET_ITEM(events, self->index++);
 	Py_INCREF(event);
 	if (self->index == nevents) {
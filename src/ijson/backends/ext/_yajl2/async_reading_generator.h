@@ -30,6 +30,7 @@ typedef struct {
 	PyObject *events;
 	Py_ssize_t index;
 	int file_exhausted;
+	int batched;
 } async_reading_generator;
 
 /*
@@ -0,0 +1,216 @@
+/*
+ * automaton_t type and associated methods
+ */
+
+#ifndef AUTOMATON_H
+#define AUTOMATON_H
+
+#include <string.h>
+
+#define PY_SSIZE_T_CLEAN
+#include <Python.h>
+
+#include "common.h"
+
+typedef struct _automaton_container {
+	Py_ssize_t state;
+	int is_array;
+} automaton_container;
+
+/**
+ * automaton_t structure.
+ *
+ * Runs a deterministic automaton matching wildcard prefixes over the structure
+ * of the document, as compiled by ijson.common._compile_wildcards: a
+ * (transitions, defaults, items, accepts) tuple of per-state tuples.
+ * The automaton keeps the state of each open container, and advances on
+ * map_key, start and end events, so each value's state is found with at most
+ * one dictionary lookup.
+ */
+typedef struct _automaton {
+	PyObject *transitions;
+	PyObject *accepts;
+	Py_ssize_t n_states;
+	Py_ssize_t *defaults;
+	Py_ssize_t *items;
+	automaton_container *stack;
+	Py_ssize_t stack_size;
+	Py_ssize_t stack_used;
+	Py_ssize_t key_state;
+} automaton_t;
+
+/**
+ * Initializes an empty automaton which can be safely destroyed.
+ *
+ * @param automaton the automaton to empty-initialize
+ */
+static inline
+void automaton_create(automaton_t *automaton)
+{
+	memset(automaton, 0, sizeof(automaton_t));
+}
+
+static inline
+Py_ssize_t _automaton_state(automaton_t *automaton, PyObject *state)
+{
+	Py_ssize_t value = PyLong_AsSsize_t(state);
+	if (value == -1 && PyErr_Occurred()) {
+		return -1;
+	}
+	if (value < 0 || value >= automaton->n_states) {
+		PyErr_SetString(PyExc_ValueError, "Invalid automaton state");
+		return -1;
+	}
+	return value;
+}
+
+/**
+ * Initializes an automaton from its compiled tables.
+ *
+ * @param automaton the automaton to initialize
+ * @param tables a (transitions, defaults, items, accepts) tuple
+ * @return 0 if successful, -1 in case of an error
+ */
+static inline
+int automaton_init(automaton_t *automaton, PyObject *tables)
+{
+	PyObject *transitions, *defaults, *items, *accepts;
+	M1_Z(PyArg_ParseTuple(tables, "O!O!O!O!",
+	                      &PyTuple_Type, &transitions, &PyTuple_Type, &defaults,
+	                      &PyTuple_Type, &items, &PyTuple_Type, &accepts));
+	Py_ssize_t n_states = PyTuple_GET_SIZE(transitions);
+	if (n_states == 0 || PyTuple_GET_SIZE(defaults) != n_states ||
+	    PyTuple_GET_SIZE(items) != n_states || PyTuple_GET_SIZE(accepts) != n_states) {
+		PyErr_SetString(PyExc_ValueError, "Invalid automaton tables");
+		return -1;
+	}
+	automaton->n_states = n_states;
+	Py_INCREF(transitions);
+	automaton->transitions = transitions;
+	Py_INCREF(accepts);
+	automaton->accepts = accepts;
+	automaton->defaults = PyMem_Malloc(n_states * sizeof(Py_ssize_t));
+	automaton->items = PyMem_Malloc(n_states * sizeof(Py_ssize_t));
+	if (!automaton->defaults || !automaton->items) {
+		PyErr_NoMemory();
+		return -1;
+	}
+	for (Py_ssize_t i = 0; i != n_states; i++) {
+		if (!PyDict_Check(PyTuple_GET_ITEM(transitions, i))) {
+			PyErr_SetString(PyExc_ValueError, "Invalid automaton transitions");
+			return -1;
+		}
+		M1_M1(automaton->defaults[i] = _automaton_state(automaton, PyTuple_GET_ITEM(defaults, i)));
+		M1_M1(automaton->items[i] = _automaton_state(automaton, PyTuple_GET_ITEM(items, i)));
+	}
+	return 0;
+}
+
+/**
+ * Destroys an automaton and all its associated contents
+ * @param automaton The automaton to destroy
+ */
+static inline
+void automaton_destroy(automaton_t *automaton)
+{
+	Py_XDECREF(automaton->transitions);
+	Py_XDECREF(automaton->accepts);
+	PyMem_Free(automaton->defaults);
+	PyMem_Free(automaton->items);
+	PyMem_Free(automaton->stack);
+}
+
+/**
+ * Whether the automaton has been initialized with some tables
+ */
+#define automaton_isactive(automaton) ((automaton)->transitions != NULL)
+
+/**
+ * Advances the automaton over a map key.
+ *
+ * @param automaton An automaton
+ * @param key The map key
+ * @return 0 if successful, -1 in case of an error
+ */
+static inline
+int automaton_map_key(automaton_t *automaton, PyObject *key)
+{
+	Py_ssize_t map_state = automaton->stack[automaton->stack_used - 1].state;
+	PyObject *next = PyDict_GetItemWithError(PyTuple_GET_ITEM(automaton->transitions, map_state), key);
+	if (next) {
+		M1_M1(automaton->key_state = _automaton_state(automaton, next));
+	}
+	else if (PyErr_Occurred()) {
+		return -1;
+	}
+	else {
+		automaton->key_state = automaton->defaults[map_state];
+	}
+	return 0;
+}
+
+/**
+ * The state of a new value (a scalar, or the start of a map or array) found
+ * at the current position.
+ *
+ * @param automaton An automaton
+ * @return The state of the value
+ */
+static inline
+Py_ssize_t automaton_value_state(automaton_t *automaton)
+{
+	if (automaton->stack_used == 0) {
+		return 0;
+	}
+	automaton_container *parent = &automaton->stack[automaton->stack_used - 1];
+	return parent->is_array ? automaton->items[parent->state] : automaton->key_state;
+}
+
+/**
+ * The prefix accepted by the given state, if any.
+ *
+ * @param automaton An automaton
+ * @param state A state
+ * @return A borrowed reference to the accepted prefix, or Py_None
+ */
+#define automaton_accepts(automaton, state) PyTuple_GET_ITEM((automaton)->accepts, state)
+
+/**
+ * Notifies the automaton that a map or array with the given state has started.
+ *
+ * @param automaton An automaton
+ * @param state The state of the new container
+ * @param is_array Whether the container is an array
+ * @return 0 if successful, -1 in case of an error
+ */
+static inline
+int automaton_push(automaton_t *automaton, Py_ssize_t state, int is_array)
+{
+	if (automaton->stack_used == automaton->stack_size) {
+		Py_ssize_t new_size = automaton->stack_size ? automaton->stack_size * 2 : 8;
+		automaton_container *stack = PyMem_Realloc(automaton->stack, new_size * sizeof(automaton_container));
+		if (!stack) {
+			PyErr_NoMemory();
+			return -1;
+		}
+		automaton->stack = stack;
+		automaton->stack_size = new_size;
+	}
+	automaton_container *container = &automaton->stack[automaton->stack_used++];
+	container->state = state;
+	container->is_array = is_array;
+	return 0;
+}
+
+/**
+ * Notifies the automaton that a map or array has finished.
+ *
+ * @param automaton An automaton
+ */
+static inline
+void automaton_end(automaton_t *automaton)
+{
+	automaton->stack_used--;
+}
+
+#endif /* AUTOMATON_H */
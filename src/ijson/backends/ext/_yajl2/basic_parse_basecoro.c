@@ -12,6 +12,8 @@
 
 #include "basic_parse_basecoro.h"
 #include "common.h"
+#include "numeric_items_basecoro.h"
+#include "offsets_basecoro.h"
 #include "parse_basecoro.h"
 
 static inline enames_t get_enames(void *ctx)
@@ -24,7 +26,12 @@ static inline enames_t get_enames(void *ctx)
  */
 static inline
 int add_event_and_value(void *ctx, PyObject *evt_name, PyObject *val) {
-	PyObject *target_send = ((yajl_parse_context *)ctx)->target_send;
+	yajl_parse_context *context = (yajl_parse_context *)ctx;
+	if (context->columns) {
+		Z_M1(event_columns_add(context->columns, &context->module_state->enames, evt_name, val));
+		return 1;
+	}
+	PyObject *target_send = context->target_send;
 	if (ParseBasecoro_Check(target_send)) {
 		Z_N(parse_basecoro_send_impl(target_send, evt_name, val));
 		Py_DECREF(val);
@@ -40,12 +47,31 @@ int add_event_and_value(void *ctx, PyObject *evt_name, PyObject *val) {
 	return 1;
 }
 
+/*
+ * When feeding an items/kvitems pipeline, events that can't affect their
+ * results are skipped altogether, avoiding the creation of their values
+ */
+#define SKIP_UNWANTED(ctx, matcher_call) \
+	{ \
+		prefix_matcher_t *matcher = ((yajl_parse_context *)ctx)->matcher; \
+		if (matcher) { \
+			int wanted = matcher_call; \
+			if (wanted != 1) { \
+				return wanted != -1; \
+			} \
+		} \
+	}
+#define SKIP_UNWANTED_VALUE(ctx, is_container) SKIP_UNWANTED(ctx, prefix_matcher_value(matcher, is_container))
+#define SKIP_UNWANTED_END(ctx) SKIP_UNWANTED(ctx, prefix_matcher_end(matcher))
+
 static int null(void * ctx) {
+	SKIP_UNWANTED_VALUE(ctx, 0);
 	Py_INCREF(Py_None);
 	return add_event_and_value(ctx, get_enames(ctx).null_ename, Py_None);
 }
 
 static int boolean(void * ctx, int val) {
+	SKIP_UNWANTED_VALUE(ctx, 0);
 	PyObject *bval = val == 0 ? Py_False : Py_True;
 	Py_INCREF(bval);
 	return add_event_and_value(ctx, get_enames(ctx).boolean_ename, bval);
@@ -53,6 +79,7 @@ static int boolean(void * ctx, int val) {
 
 static int yajl_integer(void *ctx, long long val)
 {
+	SKIP_UNWANTED_VALUE(ctx, 0);
 	PyObject *ival;
 	Z_N(ival = PyLong_FromLongLong(val))
 	return add_event_and_value(ctx, get_enames(ctx).number_ename, ival);
@@ -60,12 +87,14 @@ static int yajl_integer(void *ctx, long long val)
 
 static int yajl_double(void *ctx, double val)
 {
+	SKIP_UNWANTED_VALUE(ctx, 0);
 	PyObject *dval;
 	Z_N(dval = PyFloat_FromDouble(val))
 	return add_event_and_value(ctx, get_enames(ctx).number_ename, dval);
 }
 
 static int number(void * ctx, const char *numberVal, size_t numberLen) {
+	SKIP_UNWANTED_VALUE(ctx, 0);
 
 	// If original string has a dot or an "e/E" we return a Decimal
 	// just like in the common module
@@ -99,33 +128,39 @@ static int number(void * ctx, const char *numberVal, size_t numberLen) {
 }
 
 static int string_cb(void * ctx, const unsigned char *stringVal, size_t stringLen) {
+	SKIP_UNWANTED_VALUE(ctx, 0);
 	PyObject *val;
 	Z_N(val = PyUnicode_FromStringAndSize((const char *)stringVal, stringLen))
 	return add_event_and_value(ctx, get_enames(ctx).string_ename, val);
 }
 
 static int start_map(void *ctx) {
+	SKIP_UNWANTED_VALUE(ctx, 1);
 	Py_INCREF(Py_None);
 	return add_event_and_value(ctx, get_enames(ctx).start_map_ename, Py_None);
 }
 
 static int map_key(void *ctx, const unsigned char *key, size_t stringLen) {
+	SKIP_UNWANTED(ctx, prefix_matcher_map_key(matcher, (const char *)key, stringLen));
 	PyObject *val;
-	Z_N(val = PyUnicode_FromStringAndSize((const char *)key, stringLen))
+	Z_N(val = key_cache_get(&((yajl_parse_context *)ctx)->keys, (const char *)key, stringLen))
 	return add_event_and_value(ctx, get_enames(ctx).map_key_ename, val);
 }
 
 static int end_map(void *ctx) {
+	SKIP_UNWANTED_END(ctx);
 	Py_INCREF(Py_None);
 	return add_event_and_value(ctx, get_enames(ctx).end_map_ename, Py_None);
 }
 
 static int start_array(void *ctx) {
+	SKIP_UNWANTED_VALUE(ctx, 2);
 	Py_INCREF(Py_None);
 	return add_event_and_value(ctx, get_enames(ctx).start_array_ename, Py_None);
 }
 
 static int end_array(void *ctx) {
+	SKIP_UNWANTED_END(ctx);
 	Py_INCREF(Py_None);
 	return add_event_and_value(ctx, get_enames(ctx).end_array_ename, Py_None);
 }
@@ -140,21 +175,131 @@ static yajl_callbacks float_callbacks = {
 	start_map, map_key, end_map, start_array, end_array
 };
 
+/*
+ * The YAJL callbacks recording the actual ones in a tape, without the GIL
+ */
+#define get_tape(ctx) \
+	(&((BasicParseBasecoro *)((char *)(ctx) - offsetof(BasicParseBasecoro, ctx)))->tape)
 
-PyObject* ijson_yajl_parse(BasicParseBasecoro *coro, char *buffer, size_t length)
+static int tape_null(void *ctx) {
+	return event_tape_push(get_tape(ctx), TAPE_NULL) != NULL;
+}
+
+static int tape_boolean(void *ctx, int val) {
+	tape_entry_t *entry;
+	Z_N(entry = event_tape_push(get_tape(ctx), TAPE_BOOLEAN));
+	entry->value.boolean = val;
+	return 1;
+}
+
+static int tape_integer(void *ctx, long long val) {
+	tape_entry_t *entry;
+	Z_N(entry = event_tape_push(get_tape(ctx), TAPE_INTEGER));
+	entry->value.integer = val;
+	return 1;
+}
+
+static int tape_double(void *ctx, double val) {
+	tape_entry_t *entry;
+	Z_N(entry = event_tape_push(get_tape(ctx), TAPE_DOUBLE));
+	entry->value.number = val;
+	return 1;
+}
+
+static int tape_number(void *ctx, const char *numberVal, size_t numberLen) {
+	return event_tape_push_bytes(get_tape(ctx), TAPE_NUMBER, numberVal, numberLen);
+}
+
+static int tape_string(void *ctx, const unsigned char *stringVal, size_t stringLen) {
+	return event_tape_push_bytes(get_tape(ctx), TAPE_STRING, stringVal, stringLen);
+}
+
+static int tape_start_map(void *ctx) {
+	return event_tape_push(get_tape(ctx), TAPE_START_MAP) != NULL;
+}
+
+static int tape_map_key(void *ctx, const unsigned char *key, size_t stringLen) {
+	return event_tape_push_bytes(get_tape(ctx), TAPE_MAP_KEY, key, stringLen);
+}
+
+static int tape_end_map(void *ctx) {
+	return event_tape_push(get_tape(ctx), TAPE_END_MAP) != NULL;
+}
+
+static int tape_start_array(void *ctx) {
+	return event_tape_push(get_tape(ctx), TAPE_START_ARRAY) != NULL;
+}
+
+static int tape_end_array(void *ctx) {
+	return event_tape_push(get_tape(ctx), TAPE_END_ARRAY) != NULL;
+}
+
+static yajl_callbacks decimal_tape_callbacks = {
+	tape_null, tape_boolean, NULL, NULL, tape_number, tape_string,
+	tape_start_map, tape_map_key, tape_end_map, tape_start_array, tape_end_array
+};
+
+static yajl_callbacks float_tape_callbacks = {
+	tape_null, tape_boolean, tape_integer, tape_double, NULL, tape_string,
+	tape_start_map, tape_map_key, tape_end_map, tape_start_array, tape_end_array
+};
+
+
+/*
+ * Parses a slice of data, or finishes parsing if the slice is empty. When
+ * taping, YAJL parses it without the GIL, and its callbacks are replayed
+ * afterwards.
+ */
+static yajl_status ijson_yajl_parse_slice(BasicParseBasecoro *coro, unsigned char *buffer, size_t length)
 {
-	yajl_handle handle = coro->h;
 	yajl_status status;
+	PyThreadState *thread_state = coro->taping ? PyEval_SaveThread() : NULL;
 	if (length == 0) {
-		status = yajl_complete_parse(handle);
+		status = yajl_complete_parse(coro->h);
 	}
 	else {
-		status = yajl_parse(handle, (unsigned char *)buffer, length);
+		status = yajl_parse(coro->h, buffer, length);
+		coro->ctx.consumed += length;
 	}
+	if (thread_state) {
+		PyEval_RestoreThread(thread_state);
+	}
+
+	// callbacks recorded before any errors are replayed, like they would have
+	// been called, and any errors they raise take precedence
+	if (coro->taping && !event_tape_replay(&coro->tape, coro->callbacks, &coro->ctx)) {
+		status = yajl_status_client_canceled;
+	}
+	return status;
+}
+
+PyObject* ijson_yajl_parse(BasicParseBasecoro *coro, char *buffer, size_t length)
+{
+	yajl_handle handle = coro->h;
+	yajl_status status = yajl_status_ok;
+	if (coro->parsing) {
+		PyErr_SetString(PyExc_ValueError, "parser already executing");
+		return NULL;
+	}
+	coro->parsing = 1;
+	// Big chunks are parsed in slices, so the tape only needs to hold the
+	// events of one slice at a time
+	unsigned char *slice = (unsigned char *)buffer;
+	size_t slice_length = 0;
+	if (length == 0) {
+		status = ijson_yajl_parse_slice(coro, NULL, 0);
+	}
+	for (size_t offset = 0; status == yajl_status_ok && offset != length; offset += slice_length) {
+		slice = (unsigned char *)buffer + offset;
+		slice_length = length - offset < IJSON_YAJL_SLICE_SIZE ? length - offset : IJSON_YAJL_SLICE_SIZE;
+		status = ijson_yajl_parse_slice(coro, slice, slice_length);
+	}
+	coro->parsing = 0;
+
 	if (status != yajl_status_ok) {
 		// An actual problem with the JSON data (otherwise a user error)
 		if (status != yajl_status_client_canceled) {
-			unsigned char *perror = yajl_get_error(handle, 1, (unsigned char *)buffer, length);
+			unsigned char *perror = yajl_get_error(handle, 1, slice, slice_length);
 			PyObject *error_obj = PyUnicode_FromString((char *)perror);
 			// error about invalid UTF8 byte sequences can't be converted to string
 			// automatically, so we show the bytes instead
@@ -176,6 +321,45 @@ PyObject* ijson_yajl_parse(BasicParseBasecoro *coro, char *buffer, size_t length
 }
 
 
+/*
+ * Allocates and configures a yajl handle for the coroutine
+ */
+static yajl_handle basic_parse_basecoro_alloc(BasicParseBasecoro *self)
+{
+	yajl_callbacks *callbacks;
+	if (!self->taping) {
+		callbacks = self->callbacks;
+	}
+	else if (self->callbacks->yajl_number) {
+		callbacks = &decimal_tape_callbacks;
+	}
+	else {
+		callbacks = &float_tape_callbacks;
+	}
+	yajl_handle h = yajl_alloc(callbacks, NULL, (void *)&self->ctx);
+	if (!h) {
+		PyErr_SetString(PyExc_RuntimeError, "Cannot allocate yajl handler");
+		return NULL;
+	}
+	if (self->allow_comments) {
+		yajl_config(h, yajl_allow_comments, 1);
+	}
+	if (self->multiple_values) {
+		yajl_config(h, yajl_allow_multiple_values, 1);
+	}
+	return h;
+}
+
+int ijson_yajl_reset(BasicParseBasecoro *coro)
+{
+	yajl_handle h;
+	M1_N(h = basic_parse_basecoro_alloc(coro));
+	yajl_free(coro->h);
+	coro->h = h;
+	coro->ctx.consumed = 0;
+	return 0;
+}
+
 /*
  * __init__, destructor, __iter__ and __next__
  */
@@ -187,6 +371,10 @@ static int basic_parse_basecoro_init(BasicParseBasecoro *self, PyObject *args, P
 	PyObject *target_send = NULL;
 
 	self->h = NULL;
+	self->taping = 0;
+	self->parsing = 0;
+	key_cache_create(&self->ctx.keys);
+	event_tape_create(&self->tape);
 
 	char *kwlist[] = {"target_send", "allow_comments", "multiple_values",
 	                  "use_float", NULL};
@@ -197,32 +385,36 @@ static int basic_parse_basecoro_init(BasicParseBasecoro *self, PyObject *args, P
 	}
 	self->ctx.target_send = target_send;
 	Py_INCREF(self->ctx.target_send);
+	self->ctx.matcher = NULL;
+	self->ctx.columns = NULL;
+	self->ctx.consumed = 0;
+	if (ParseBasecoro_Check(target_send) && ((ParseBasecoro *)target_send)->matcher.enabled) {
+		self->ctx.matcher = &((ParseBasecoro *)target_send)->matcher;
+	}
 	M1_N(self->ctx.module_state = get_state_from_imported_module());
 
 	/*
 	 * Prepare yajl handle and configure it
 	 * The context given to yajl is the coroutine's target, so the callbacks
-	 * directly send values to the target
+	 * directly send values to the target. Only the offsets callbacks need to
+	 * be called while yajl parses the data
 	 */
-	yajl_callbacks *callbacks;
-	if (PyObject_IsTrue(use_float)) {
-		callbacks = &float_callbacks;
-	}
-	else {
-		callbacks = &decimal_callbacks;
+	if (NumericItemsBasecoro_Check(target_send)) {
+		self->callbacks = &numeric_items_callbacks;
 	}
-	self->h = yajl_alloc(callbacks, NULL, (void *)&self->ctx);
-	if (!self->h) {
-		PyErr_SetString(PyExc_RuntimeError, "Cannot allocate yajl handler");
-		return -1;
+	else if (OffsetsBasecoro_Check(target_send)) {
+		self->callbacks = &offsets_callbacks;
 	}
-	if (PyObject_IsTrue(allow_comments)) {
-		yajl_config(self->h, yajl_allow_comments, 1);
+	else if (PyObject_IsTrue(use_float)) {
+		self->callbacks = &float_callbacks;
 	}
-	if (PyObject_IsTrue(multiple_values)) {
-		yajl_config(self->h, yajl_allow_multiple_values, 1);
+	else {
+		self->callbacks = &decimal_callbacks;
 	}
-
+	self->taping = self->callbacks != &offsets_callbacks;
+	self->allow_comments = PyObject_IsTrue(allow_comments);
+	self->multiple_values = PyObject_IsTrue(multiple_values);
+	M1_N(self->h = basic_parse_basecoro_alloc(self));
 	return 0;
 }
 
@@ -232,6 +424,8 @@ static void basic_parse_basecoro_dealloc(BasicParseBasecoro *self)
 		yajl_free(self->h);
 	}
 	Py_XDECREF(self->ctx.target_send);
+	key_cache_destroy(&self->ctx.keys);
+	event_tape_destroy(&self->tape);
 	Py_TYPE(self)->tp_free((PyObject*)self);
 }
 
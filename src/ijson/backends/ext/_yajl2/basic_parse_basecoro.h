@@ -11,26 +11,46 @@
 #ifndef BASIC_PARSE_BASECORO_H
 #define BASIC_PARSE_BASECORO_H
 
+#include <stddef.h>
+
 #define PY_SSIZE_T_CLEAN
 #include <Python.h>
 #include <yajl/yajl_common.h>
 #include <yajl/yajl_parse.h>
 
+#include "event_columns.h"
+#include "event_tape.h"
+#include "key_cache.h"
 #include "module_state.h"
+#include "prefix_matcher.h"
 
 typedef struct _yajl_parse_context {
 	yajl2_state *module_state;
 	PyObject *target_send;
+	prefix_matcher_t *matcher;
+	event_columns_t *columns;
+	key_cache_t keys;
+	unsigned long long consumed;
 } yajl_parse_context;
 
 
 /**
  * basic_parse_basecoro coroutine object structure
+ *
+ * Unless its callbacks need to know the position of the tokens in the
+ * document, YAJL parses each chunk of data without holding the GIL, recording
+ * its callbacks in a tape, which are then replayed on the actual callbacks.
  */
 typedef struct {
     PyObject_HEAD
     yajl_handle h;
     yajl_parse_context ctx;
+    yajl_callbacks *callbacks;
+    event_tape_t tape;
+    int taping;
+    int parsing;
+    int allow_comments;
+    int multiple_values;
 } BasicParseBasecoro;
 
 /**
@@ -43,9 +63,33 @@ extern PyTypeObject BasicParseBasecoro_Type;
  */
 #define BasicParseBasecoro_Check(o) (Py_TYPE(o) == &BasicParseBasecoro_Type)
 
+/**
+ * The offset in the document just past the last token parsed by YAJL,
+ * valid only within YAJL callbacks
+ */
+static inline
+unsigned long long yajl_parse_context_offset(yajl_parse_context *ctx)
+{
+	BasicParseBasecoro *coro = (BasicParseBasecoro *)((char *)ctx - offsetof(BasicParseBasecoro, ctx));
+	return ctx->consumed + yajl_get_bytes_consumed(coro->h);
+}
+
+/**
+ * The maximum size of the slices data is given to YAJL in
+ */
+#define IJSON_YAJL_SLICE_SIZE (64 * 1024)
+
 /**
  * yajl parsing routine wrapper that turns yajl errors into exceptions
  */
 PyObject* ijson_yajl_parse(BasicParseBasecoro *coro, char *buffer, size_t length);
 
+/**
+ * Replaces the yajl handle of a coroutine with a new one, so it can parse a
+ * new document. The rest of its state (e.g., cached keys) is kept.
+ *
+ * @return 0 if successful, -1 otherwise
+ */
+int ijson_yajl_reset(BasicParseBasecoro *coro);
+
 #endif // BASIC_PARSE_BASECORO_H
\ No newline at end of file
@@ -0,0 +1,147 @@
+/*
+ * columns_basecoro coroutine implementation for ijson's C backend
+ */
+
+#include "common.h"
+#include "columns_basecoro.h"
+
+/*
+ * __init__, destructor, __iter__ and __next__
+ */
+static int columns_basecoro_init(ColumnsBasecoro *self, PyObject *args, PyObject *kwargs)
+{
+	self->target_send = NULL;
+	self->prefix = NULL;
+	self->in_row = 0;
+	self->column = -2;
+	self->object_depth = 0;
+	M1_N(self->module_state = get_state_from_imported_module());
+	builder_create(&self->builder);
+	columns_builder_create(&self->columns);
+
+	PyObject *fields = Py_None;
+	M1_Z(PyArg_ParseTuple(args, "OO|O", &(self->target_send), &(self->prefix), &fields));
+	Py_INCREF(self->target_send);
+	Py_INCREF(self->prefix);
+	M1_M1(builder_init(&self->builder, Py_None));
+	M1_M1(columns_builder_init(&self->columns, fields));
+
+	return 0;
+}
+
+static void columns_basecoro_dealloc(ColumnsBasecoro *self)
+{
+	Py_XDECREF(self->prefix);
+	Py_XDECREF(self->target_send);
+	builder_destroy(&self->builder);
+	columns_builder_destroy(&self->columns);
+	Py_TYPE(self)->tp_free((PyObject*)self);
+}
+
+PyObject* columns_basecoro_send_impl(PyObject *self, PyObject *path, PyObject *event, PyObject *value)
+{
+	ColumnsBasecoro *coro = (ColumnsBasecoro *)self;
+	enames_t enames = coro->module_state->enames;
+	int is_start = event == enames.start_map_ename || event == enames.start_array_ename;
+	int is_end = event == enames.end_map_ename || event == enames.end_array_ename;
+
+	// members whose values are containers are built (or skipped) first
+	if (coro->object_depth) {
+		coro->object_depth += is_start - is_end;
+		if (coro->column >= 0) {
+			N_M1(builder_event(&coro->builder, enames, event, value));
+			if (coro->object_depth == 0) {
+				PyObject *member = builder_value(&coro->builder);
+				int res = columns_builder_set(&coro->columns, coro->column, member);
+				Py_DECREF(member);
+				N_M1(res);
+			}
+		}
+		Py_RETURN_NONE;
+	}
+
+	if (!coro->in_row) {
+		if (path && event == enames.start_map_ename) {
+			int cmp = PyObject_RichCompareBool(path, coro->prefix, Py_EQ);
+			N_M1(cmp);
+			coro->in_row = cmp;
+		}
+		Py_RETURN_NONE;
+	}
+
+	if (event == enames.map_key_ename) {
+		N_M1(coro->column = columns_builder_column(&coro->columns, value));
+	}
+	else if (event == enames.end_map_ename) {
+		coro->in_row = 0;
+		N_M1(columns_builder_end_row(&coro->columns));
+	}
+	else if (is_start) {
+		coro->object_depth = 1;
+		if (coro->column >= 0) {
+			N_M1(builder_reset(&coro->builder));
+			N_M1(builder_event(&coro->builder, enames, event, value));
+		}
+	}
+	else if (coro->column >= 0) {
+		N_M1(columns_builder_set(&coro->columns, coro->column, value));
+	}
+	Py_RETURN_NONE;
+}
+
+static PyObject* columns_basecoro_send(PyObject *self, PyObject *tuple)
+{
+	PyObject *path = NULL;
+	PyObject *event = NULL;
+	PyObject *value = NULL;
+	PyObject *result = NULL;
+	if(!ijson_unpack(tuple, 3, &path, &event, &value)) {
+		event = get_builtin_ename(&((ColumnsBasecoro *)self)->module_state->enames, event);
+		result = columns_basecoro_send_impl(self, path, event, value);
+	}
+	Py_XDECREF(value);
+	Py_XDECREF(event);
+	Py_XDECREF(path);
+	return result;
+}
+
+static PyObject* columns_basecoro_close(PyObject *self, PyObject *args)
+{
+	ColumnsBasecoro *coro = (ColumnsBasecoro *)self;
+	PyObject *result;
+	N_N(result = columns_builder_result(&coro->columns));
+	PyObject *ret;
+	if (PyList_Check(coro->target_send)) {
+		ret = PyList_Append(coro->target_send, result) == 0 ? Py_None : NULL;
+		Py_XINCREF(ret);
+	}
+	else {
+		ret = PyObject_CallFunctionObjArgs(coro->target_send, result, NULL);
+	}
+	Py_DECREF(result);
+	N_N(ret);
+	Py_DECREF(ret);
+	Py_RETURN_NONE;
+}
+
+static PyMethodDef columns_basecoro_methods[] = {
+	{"send", columns_basecoro_send, METH_O, "coroutine's send method"},
+	{"close", columns_basecoro_close, METH_NOARGS, "coroutine's close method, sends the columns to the target"},
+	{NULL, NULL, 0, NULL}
+};
+
+/*
+ * columns_basecoro coroutine object type
+ */
+PyTypeObject ColumnsBasecoro_Type = {
+	PyVarObject_HEAD_INIT(NULL, 0)
+	.tp_basicsize = sizeof(ColumnsBasecoro),
+	.tp_name = "_yajl2.columns_basecoro",
+	.tp_doc = "Coroutine building columns out of the members of objects",
+	.tp_init = (initproc)columns_basecoro_init,
+	.tp_dealloc = (destructor)columns_basecoro_dealloc,
+	.tp_flags = Py_TPFLAGS_DEFAULT,
+	.tp_iter = ijson_return_self,
+	.tp_iternext = ijson_return_none,
+	.tp_methods = columns_basecoro_methods
+};
@@ -0,0 +1,51 @@
+/*
+ * columns_basecoro coroutine for ijson's C backend
+ */
+
+#ifndef COLUMNS_BASECORO_H
+#define COLUMNS_BASECORO_H
+
+#define PY_SSIZE_T_CLEAN
+#include <Python.h>
+
+#include "builder.h"
+#include "columns_builder.h"
+#include "module_state.h"
+
+/**
+ * columns_basecoro coroutine object structure
+ */
+typedef struct {
+    PyObject_HEAD
+    builder_t builder;
+    columns_builder_t columns;
+    PyObject *target_send;
+    PyObject *prefix;
+    int in_row;
+    Py_ssize_t column;
+    int object_depth;
+    yajl2_state *module_state;
+} ColumnsBasecoro;
+
+/**
+ * columns_basecoro coroutine object type
+ */
+extern PyTypeObject ColumnsBasecoro_Type;
+
+/**
+ * Utility function to check if an object is a columns_basecoro coroutine or not
+ */
+#define ColumnsBasecoro_Check(o) (Py_TYPE(o) == &ColumnsBasecoro_Type)
+
+/**
+ * The implementation of the columns_basecoro.send() method accepting an unpacked
+ * event
+ * @param self A columns_basecoro coroutine
+ * @param path The path of this event, or NULL if it is known not to match
+ * @param event The event name
+ * @param value The value of this event
+ * @return None, or NULL in case of an error
+ */
+PyObject* columns_basecoro_send_impl(PyObject *self, PyObject *path, PyObject *event, PyObject *value);
+
+#endif /* COLUMNS_BASECORO_H */
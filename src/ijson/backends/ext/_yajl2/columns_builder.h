@@ -0,0 +1,362 @@
+/*
+ * columns_builder_t type and associated methods
+ */
+
+#ifndef COLUMNS_BUILDER_H
+#define COLUMNS_BUILDER_H
+
+#include <string.h>
+
+#define PY_SSIZE_T_CLEAN
+#include <Python.h>
+
+#include "common.h"
+
+/*
+ * The kinds of columns. Columns start empty (i.e., with only missing values),
+ * and become arrays of integers or floats, or lists of objects, as needed.
+ */
+typedef enum _column_kind {
+	COLUMN_EMPTY,
+	COLUMN_INTEGERS,
+	COLUMN_FLOATS,
+	COLUMN_OBJECTS,
+} column_kind;
+
+typedef struct _column {
+	column_kind kind;
+	Py_ssize_t size;
+	Py_ssize_t capacity;
+	void *numbers;
+	PyObject *objects;
+} column_t;
+
+/**
+ * columns_builder_t structure.
+ *
+ * Builds a set of columns out of the members of a sequence of rows, keeping
+ * all columns the same length: members missing from a row have a None value.
+ * Integers and floats are stored in C buffers (and exported as array.array
+ * objects) as long as a column contains nothing else.
+ */
+typedef struct _columns_builder {
+	PyObject *names;
+	PyObject *indices;
+	column_t *columns;
+	Py_ssize_t n_columns;
+	Py_ssize_t size;
+	Py_ssize_t rows;
+	int fixed;
+	PyObject *array_type;
+} columns_builder_t;
+
+/**
+ * Initializes an empty columns builder which can be safely destroyed.
+ *
+ * @param builder the builder to empty-initialize
+ */
+static inline
+void columns_builder_create(columns_builder_t *builder)
+{
+	memset(builder, 0, sizeof(columns_builder_t));
+}
+
+static inline
+Py_ssize_t _columns_builder_add(columns_builder_t *builder, PyObject *name)
+{
+	if (builder->n_columns == builder->size) {
+		Py_ssize_t new_size = builder->size ? builder->size * 2 : 8;
+		column_t *columns = PyMem_Realloc(builder->columns, new_size * sizeof(column_t));
+		if (!columns) {
+			PyErr_NoMemory();
+			return -1;
+		}
+		builder->columns = columns;
+		builder->size = new_size;
+	}
+	Py_ssize_t index = builder->n_columns;
+	PyObject *pindex;
+	M1_N(pindex = PyLong_FromSsize_t(index));
+	int res = PyDict_SetItem(builder->indices, name, pindex);
+	Py_DECREF(pindex);
+	M1_M1(res);
+	M1_M1(PyList_Append(builder->names, name));
+	// previous rows didn't have this member
+	column_t *column = &builder->columns[index];
+	memset(column, 0, sizeof(column_t));
+	column->size = builder->rows;
+	builder->n_columns++;
+	return index;
+}
+
+/**
+ * Initializes a columns builder.
+ *
+ * @param builder the builder to initialize
+ * @param fields an iterable with the names of the only columns to build,
+ * or None to build columns for all members found in the rows
+ * @return 0 if successful, -1 in case of an error
+ */
+static inline
+int columns_builder_init(columns_builder_t *builder, PyObject *fields)
+{
+	PyObject *array_module;
+	M1_N(array_module = PyImport_ImportModule("array"));
+	builder->array_type = PyObject_GetAttrString(array_module, "array");
+	Py_DECREF(array_module);
+	M1_N(builder->array_type);
+	M1_N(builder->names = PyList_New(0));
+	M1_N(builder->indices = PyDict_New());
+	if (fields == Py_None) {
+		return 0;
+	}
+	if (PyUnicode_Check(fields) || PyBytes_Check(fields)) {
+		PyErr_SetString(PyExc_TypeError, "fields must be a collection of field names, not a string");
+		return -1;
+	}
+	PyObject *iter, *name;
+	M1_N(iter = PyObject_GetIter(fields));
+	while ((name = PyIter_Next(iter))) {
+		int contains = PyDict_Contains(builder->indices, name);
+		Py_ssize_t index = contains ? contains : _columns_builder_add(builder, name);
+		Py_DECREF(name);
+		if (index == -1) {
+			Py_DECREF(iter);
+			return -1;
+		}
+	}
+	Py_DECREF(iter);
+	if (PyErr_Occurred()) {
+		return -1;
+	}
+	builder->fixed = 1;
+	return 0;
+}
+
+/**
+ * Destroys a columns builder and all its associated contents
+ * @param builder The builder to destroy
+ */
+static inline
+void columns_builder_destroy(columns_builder_t *builder)
+{
+	for (Py_ssize_t i = 0; i != builder->n_columns; i++) {
+		PyMem_Free(builder->columns[i].numbers);
+		Py_XDECREF(builder->columns[i].objects);
+	}
+	PyMem_Free(builder->columns);
+	Py_XDECREF(builder->names);
+	Py_XDECREF(builder->indices);
+	Py_XDECREF(builder->array_type);
+}
+
+/**
+ * Finds the index of the column for the given member.
+ *
+ * @param builder A columns builder
+ * @param name The name of the member
+ * @return The index of the member's column, -1 in case of an error, or -2
+ * if the member is not wanted
+ */
+static inline
+Py_ssize_t columns_builder_column(columns_builder_t *builder, PyObject *name)
+{
+	PyObject *index = PyDict_GetItemWithError(builder->indices, name);
+	if (index) {
+		return PyLong_AsSsize_t(index);
+	}
+	else if (PyErr_Occurred()) {
+		return -1;
+	}
+	else if (builder->fixed) {
+		return -2;
+	}
+	return _columns_builder_add(builder, name);
+}
+
+/* Whether a value can be stored as an integer in a column */
+static inline
+int _column_integer(PyObject *value, long long *ival)
+{
+	if (!PyLong_CheckExact(value)) {
+		return 0;
+	}
+	int overflow;
+	*ival = PyLong_AsLongLongAndOverflow(value, &overflow);
+	if (*ival == -1 && PyErr_Occurred()) {
+		return -1;
+	}
+	return !overflow;
+}
+
+/* Moves the contents of a column into a list of objects */
+static inline
+int _column_to_objects(column_t *column)
+{
+	PyObject *objects;
+	M1_N(objects = PyList_New(column->size));
+	for (Py_ssize_t i = 0; i != column->size; i++) {
+		PyObject *value;
+		if (column->kind == COLUMN_INTEGERS) {
+			value = PyLong_FromLongLong(((long long *)column->numbers)[i]);
+		}
+		else if (column->kind == COLUMN_FLOATS) {
+			value = PyFloat_FromDouble(((double *)column->numbers)[i]);
+		}
+		else {
+			value = Py_None;
+			Py_INCREF(value);
+		}
+		if (!value) {
+			Py_DECREF(objects);
+			return -1;
+		}
+		PyList_SET_ITEM(objects, i, value);
+	}
+	PyMem_Free(column->numbers);
+	column->numbers = NULL;
+	column->objects = objects;
+	column->kind = COLUMN_OBJECTS;
+	return 0;
+}
+
+/* Stores a number at the end of a column, whose elements are 8 bytes long */
+static inline
+int _column_push(column_t *column, void *number)
+{
+	if (column->size == column->capacity) {
+		Py_ssize_t new_capacity = column->capacity ? column->capacity * 2 : 1024;
+		void *numbers = PyMem_Realloc(column->numbers, new_capacity * 8);
+		if (!numbers) {
+			PyErr_NoMemory();
+			return -1;
+		}
+		column->numbers = numbers;
+		column->capacity = new_capacity;
+	}
+	memcpy((char *)column->numbers + column->size++ * 8, number, 8);
+	return 0;
+}
+
+/* Appends a value to a column, changing its kind if needed */
+static inline
+int _column_append(column_t *column, PyObject *value)
+{
+	long long ival = 0;
+	int is_integer;
+	M1_M1(is_integer = _column_integer(value, &ival));
+	int is_float = PyFloat_CheckExact(value);
+
+	if (column->kind == COLUMN_EMPTY && column->size == 0 && (is_integer || is_float)) {
+		column->kind = is_integer ? COLUMN_INTEGERS : COLUMN_FLOATS;
+	}
+	else if (column->kind == COLUMN_EMPTY && value == Py_None) {
+		column->size++;
+		return 0;
+	}
+	else if (column->kind == COLUMN_INTEGERS && is_float) {
+		long long *integers = column->numbers;
+		double *floats = column->numbers;
+		for (Py_ssize_t i = 0; i != column->size; i++) {
+			floats[i] = (double)integers[i];
+		}
+		column->kind = COLUMN_FLOATS;
+	}
+
+	if (column->kind == COLUMN_INTEGERS && is_integer) {
+		return _column_push(column, &ival);
+	}
+	else if (column->kind == COLUMN_FLOATS && (is_integer || is_float)) {
+		double dval = is_float ? PyFloat_AS_DOUBLE(value) : (double)ival;
+		return _column_push(column, &dval);
+	}
+	if (column->kind != COLUMN_OBJECTS) {
+		M1_M1(_column_to_objects(column));
+	}
+	M1_M1(PyList_Append(column->objects, value));
+	column->size++;
+	return 0;
+}
+
+/**
+ * Sets the value of a column for the current row.
+ *
+ * @param builder A columns builder
+ * @param index The index of the column
+ * @param value The value
+ * @return 0 if successful, -1 in case of an error
+ */
+static inline
+int columns_builder_set(columns_builder_t *builder, Py_ssize_t index, PyObject *value)
+{
+	column_t *column = &builder->columns[index];
+	// repeated members replace previous ones, like in a dictionary
+	if (column->size > builder->rows) {
+		column->size--;
+		if (column->kind == COLUMN_OBJECTS) {
+			M1_M1(PyList_SetSlice(column->objects, column->size, column->size + 1, NULL));
+		}
+	}
+	return _column_append(column, value);
+}
+
+/**
+ * Finishes the current row, setting a None value for the columns it didn't
+ * have members for.
+ *
+ * @param builder A columns builder
+ * @return 0 if successful, -1 in case of an error
+ */
+static inline
+int columns_builder_end_row(columns_builder_t *builder)
+{
+	builder->rows++;
+	for (Py_ssize_t i = 0; i != builder->n_columns; i++) {
+		if (builder->columns[i].size < builder->rows) {
+			M1_M1(_column_append(&builder->columns[i], Py_None));
+		}
+	}
+	return 0;
+}
+
+/* A new reference to the exported contents of a column */
+static inline
+PyObject *_column_export(columns_builder_t *builder, column_t *column)
+{
+	if (column->kind == COLUMN_INTEGERS || column->kind == COLUMN_FLOATS) {
+		return PyObject_CallFunction(builder->array_type, "sy#",
+		                             column->kind == COLUMN_INTEGERS ? "q" : "d",
+		                             (const char *)column->numbers, column->size * 8);
+	}
+	if (column->kind == COLUMN_EMPTY) {
+		N_M1(_column_to_objects(column));
+	}
+	Py_INCREF(column->objects);
+	return column->objects;
+}
+
+/**
+ * Exports the columns built so far.
+ *
+ * @param builder A columns builder
+ * @return A new dictionary with the columns, indexed by their names, or NULL
+ * in case of an error
+ */
+static inline
+PyObject *columns_builder_result(columns_builder_t *builder)
+{
+	PyObject *result;
+	N_N(result = PyDict_New());
+	for (Py_ssize_t i = 0; i != builder->n_columns; i++) {
+		PyObject *column = _column_export(builder, &builder->columns[i]);
+		int res = column ? PyDict_SetItem(result, PyList_GET_ITEM(builder->names, i), column) : -1;
+		Py_XDECREF(column);
+		if (res == -1) {
+			Py_DECREF(result);
+			return NULL;
+		}
+	}
+	return result;
+}
+
+#endif /* COLUMNS_BUILDER_H */
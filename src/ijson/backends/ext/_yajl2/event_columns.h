@@ -0,0 +1,178 @@
+/*
+ * event_columns_t type and associated methods
+ */
+
+#ifndef EVENT_COLUMNS_H
+#define EVENT_COLUMNS_H
+
+#include <string.h>
+
+#define PY_SSIZE_T_CLEAN
+#include <Python.h>
+
+#include "common.h"
+#include "event_names.h"
+
+/**
+ * event_columns_t structure.
+ *
+ * Accumulates basic_parse events in columnar form: a buffer with the code of
+ * each event (its index in FOR_EACH_EVENT), an optional buffer with their
+ * depths, and a list with their values. Events are exported as
+ * (array('B'), array('I') or None, list) tuples.
+ */
+typedef struct _event_columns {
+	unsigned char *codes;
+	unsigned int *depths;
+	Py_ssize_t size;
+	Py_ssize_t used;
+	PyObject *values;
+	PyObject *array_type;
+	int track_depths;
+	unsigned int depth;
+} event_columns_t;
+
+/**
+ * Initializes an empty event_columns_t object which can be safely destroyed.
+ *
+ * @param columns the object to empty-initialize
+ */
+static inline
+void event_columns_create(event_columns_t *columns)
+{
+	memset(columns, 0, sizeof(event_columns_t));
+}
+
+/**
+ * Initializes an event_columns_t object.
+ *
+ * @param columns the object to initialize
+ * @param track_depths whether the depth of each event should be recorded
+ * @return 0 if successful, -1 in case of an error
+ */
+static inline
+int event_columns_init(event_columns_t *columns, int track_depths)
+{
+	PyObject *array_module;
+	M1_N(array_module = PyImport_ImportModule("array"));
+	columns->array_type = PyObject_GetAttrString(array_module, "array");
+	Py_DECREF(array_module);
+	M1_N(columns->array_type);
+	M1_N(columns->values = PyList_New(0));
+	columns->track_depths = track_depths;
+	return 0;
+}
+
+/**
+ * Destroys an event_columns_t object and all its associated contents
+ * @param columns The object to destroy
+ */
+static inline
+void event_columns_destroy(event_columns_t *columns)
+{
+	PyMem_Free(columns->codes);
+	PyMem_Free(columns->depths);
+	Py_XDECREF(columns->values);
+	Py_XDECREF(columns->array_type);
+}
+
+/* The code of a module-internal event name */
+static inline
+unsigned char _event_columns_code(enames_t *enames, PyObject *event)
+{
+#define MATCH(i, member, _value) if (enames->member == event) return i;
+	FOR_EACH_EVENT(MATCH)
+#undef MATCH
+	return N_EVENTS;
+}
+
+/**
+ * Adds an event to the columns.
+ *
+ * @param columns An event_columns_t object
+ * @param enames The module-internal event names
+ * @param event The event name
+ * @param value The event value, whose reference is stolen
+ * @return 0 if successful, -1 in case of an error
+ */
+static inline
+int event_columns_add(event_columns_t *columns, enames_t *enames, PyObject *event, PyObject *value)
+{
+	int res = PyList_Append(columns->values, value);
+	Py_DECREF(value);
+	M1_M1(res);
+
+	if (columns->used == columns->size) {
+		Py_ssize_t new_size = columns->size ? columns->size * 2 : 1024;
+		unsigned char *codes = PyMem_Realloc(columns->codes, new_size);
+		if (!codes) {
+			PyErr_NoMemory();
+			return -1;
+		}
+		columns->codes = codes;
+		if (columns->track_depths) {
+			unsigned int *depths = PyMem_Realloc(columns->depths, new_size * sizeof(unsigned int));
+			if (!depths) {
+				PyErr_NoMemory();
+				return -1;
+			}
+			columns->depths = depths;
+		}
+		columns->size = new_size;
+	}
+
+	unsigned char code = _event_columns_code(enames, event);
+	if (columns->track_depths) {
+		// containers' start and end events are at the depth of their parent
+		if (event == enames->end_map_ename || event == enames->end_array_ename) {
+			columns->depth--;
+		}
+		columns->depths[columns->used] = columns->depth;
+		if (event == enames->start_map_ename || event == enames->start_array_ename) {
+			columns->depth++;
+		}
+	}
+	columns->codes[columns->used++] = code;
+	return 0;
+}
+
+/**
+ * Returns the number of events accumulated in the columns
+ */
+#define event_columns_size(columns) ((columns)->used)
+
+/**
+ * Exports all accumulated events as a (codes, depths, values) tuple, and
+ * resets the columns to accumulate new ones.
+ *
+ * @param columns An event_columns_t object
+ * @return A new (codes, depths, values) tuple, or NULL in case of an error
+ */
+static inline
+PyObject *event_columns_export(event_columns_t *columns)
+{
+	PyObject *codes, *depths, *values, *result;
+	Py_ssize_t used = columns->used;
+	N_N(codes = PyObject_CallFunction(columns->array_type, "sy#", "B", columns->codes, used));
+	if (columns->track_depths) {
+		depths = PyObject_CallFunction(columns->array_type, "sy#", "I",
+		                               (const char *)columns->depths, used * sizeof(unsigned int));
+	}
+	else {
+		Py_INCREF(Py_None);
+		depths = Py_None;
+	}
+	values = depths ? PyList_New(0) : NULL;
+	result = values ? PyTuple_Pack(3, codes, depths, columns->values) : NULL;
+	Py_DECREF(codes);
+	Py_XDECREF(depths);
+	if (!result) {
+		Py_XDECREF(values);
+		return NULL;
+	}
+	Py_SETREF(columns->values, values);
+	columns->used = 0;
+	return result;
+}
+
+#endif /* EVENT_COLUMNS_H */
@@ -0,0 +1,223 @@
+/*
+ * event_tape_t type and associated methods
+ */
+
+#ifndef EVENT_TAPE_H
+#define EVENT_TAPE_H
+
+#include <string.h>
+
+#define PY_SSIZE_T_CLEAN
+#include <Python.h>
+#include <yajl/yajl_parse.h>
+
+/*
+ * The YAJL callbacks recorded in a tape
+ */
+typedef enum _tape_code {
+	TAPE_NULL,
+	TAPE_BOOLEAN,
+	TAPE_INTEGER,
+	TAPE_DOUBLE,
+	TAPE_NUMBER,
+	TAPE_STRING,
+	TAPE_START_MAP,
+	TAPE_MAP_KEY,
+	TAPE_END_MAP,
+	TAPE_START_ARRAY,
+	TAPE_END_ARRAY,
+} tape_code;
+
+typedef struct _tape_entry {
+	tape_code code;
+	union {
+		int boolean;
+		long long integer;
+		double number;
+		struct {
+			size_t offset;
+			size_t length;
+		} bytes;
+	} value;
+} tape_entry_t;
+
+/**
+ * event_tape_t structure.
+ *
+ * Records the YAJL callbacks made while parsing a chunk of data without
+ * touching any Python object, so the parsing can happen without holding the
+ * GIL. Strings and numbers are copied into a single bytes buffer, since YAJL
+ * might give them out of its own (reused) buffers. The recorded callbacks are
+ * later replayed, with the GIL held, on the callbacks that do create Python
+ * objects. Memory is allocated with the raw allocator, which can be used
+ * without the GIL, and allocation failures are flagged until the GIL is held
+ * again.
+ */
+typedef struct _event_tape {
+	tape_entry_t *entries;
+	size_t size;
+	size_t used;
+	char *bytes;
+	size_t bytes_size;
+	size_t bytes_used;
+	int out_of_memory;
+} event_tape_t;
+
+/**
+ * Initializes an empty tape which can be safely destroyed.
+ *
+ * @param tape the tape to empty-initialize
+ */
+static inline
+void event_tape_create(event_tape_t *tape)
+{
+	memset(tape, 0, sizeof(event_tape_t));
+}
+
+/**
+ * Destroys a tape and all its associated contents
+ * @param tape The tape to destroy
+ */
+static inline
+void event_tape_destroy(event_tape_t *tape)
+{
+	PyMem_RawFree(tape->entries);
+	PyMem_RawFree(tape->bytes);
+}
+
+/**
+ * Records a callback in the tape. Doesn't need the GIL.
+ *
+ * @param tape A tape
+ * @param code The code of the callback
+ * @return The entry of the callback, whose value should be set by the caller,
+ * or NULL if memory couldn't be allocated
+ */
+static inline
+tape_entry_t *event_tape_push(event_tape_t *tape, tape_code code)
+{
+	if (tape->used == tape->size) {
+		size_t new_size = tape->size ? tape->size * 2 : 1024;
+		tape_entry_t *entries = PyMem_RawRealloc(tape->entries, new_size * sizeof(tape_entry_t));
+		if (!entries) {
+			tape->out_of_memory = 1;
+			return NULL;
+		}
+		tape->entries = entries;
+		tape->size = new_size;
+	}
+	tape_entry_t *entry = &tape->entries[tape->used++];
+	entry->code = code;
+	return entry;
+}
+
+/**
+ * Records a callback with a string (or number) value in the tape. Doesn't need
+ * the GIL.
+ *
+ * @param tape A tape
+ * @param code The code of the callback
+ * @param bytes The string given to the callback
+ * @param length The length of the string
+ * @return 1 if successful, 0 if memory couldn't be allocated
+ */
+static inline
+int event_tape_push_bytes(event_tape_t *tape, tape_code code, const void *bytes, size_t length)
+{
+	if (tape->bytes_size - tape->bytes_used < length) {
+		size_t new_size = tape->bytes_size ? tape->bytes_size : 64 * 1024;
+		while (new_size - tape->bytes_used < length) {
+			new_size *= 2;
+		}
+		char *new_bytes = PyMem_RawRealloc(tape->bytes, new_size);
+		if (!new_bytes) {
+			tape->out_of_memory = 1;
+			return 0;
+		}
+		tape->bytes = new_bytes;
+		tape->bytes_size = new_size;
+	}
+	tape_entry_t *entry = event_tape_push(tape, code);
+	if (!entry) {
+		return 0;
+	}
+	entry->value.bytes.offset = tape->bytes_used;
+	entry->value.bytes.length = length;
+	memcpy(tape->bytes + tape->bytes_used, bytes, length);
+	tape->bytes_used += length;
+	return 1;
+}
+
+/**
+ * The sizes above which the buffers of an empty tape are freed, rather than
+ * kept for reuse
+ */
+#define EVENT_TAPE_MAX_KEPT_ENTRIES 4096
+#define EVENT_TAPE_MAX_KEPT_BYTES (64 * 1024)
+
+/**
+ * Frees the buffers of an empty tape if they grew too big (e.g., after a
+ * chunk with many events, or a very long string), so they don't stay
+ * allocated for the lifetime of the tape.
+ *
+ * @param tape An empty tape
+ */
+static inline
+void event_tape_shrink(event_tape_t *tape)
+{
+	if (tape->size > EVENT_TAPE_MAX_KEPT_ENTRIES) {
+		PyMem_RawFree(tape->entries);
+		tape->entries = NULL;
+		tape->size = 0;
+	}
+	if (tape->bytes_size > EVENT_TAPE_MAX_KEPT_BYTES) {
+		PyMem_RawFree(tape->bytes);
+		tape->bytes = NULL;
+		tape->bytes_size = 0;
+	}
+}
+
+/**
+ * Replays the callbacks recorded in the tape, in order, and empties it.
+ *
+ * @param tape A tape
+ * @param callbacks The callbacks to replay the recorded ones on
+ * @param ctx The context given to the callbacks
+ * @return 1 if successful, 0 if a callback failed (and replaying stopped),
+ * like YAJL callbacks do. This includes memory allocation failures while
+ * recording, for which an exception is set.
+ */
+static inline
+int event_tape_replay(event_tape_t *tape, yajl_callbacks *callbacks, void *ctx)
+{
+	int ok = 1;
+	for (size_t i = 0; ok && i != tape->used; i++) {
+		tape_entry_t *entry = &tape->entries[i];
+		const unsigned char *bytes = (const unsigned char *)tape->bytes + entry->value.bytes.offset;
+		size_t length = entry->value.bytes.length;
+		switch (entry->code) {
+		case TAPE_NULL: ok = callbacks->yajl_null(ctx); break;
+		case TAPE_BOOLEAN: ok = callbacks->yajl_boolean(ctx, entry->value.boolean); break;
+		case TAPE_INTEGER: ok = callbacks->yajl_integer(ctx, entry->value.integer); break;
+		case TAPE_DOUBLE: ok = callbacks->yajl_double(ctx, entry->value.number); break;
+		case TAPE_NUMBER: ok = callbacks->yajl_number(ctx, (const char *)bytes, length); break;
+		case TAPE_STRING: ok = callbacks->yajl_string(ctx, bytes, length); break;
+		case TAPE_START_MAP: ok = callbacks->yajl_start_map(ctx); break;
+		case TAPE_MAP_KEY: ok = callbacks->yajl_map_key(ctx, bytes, length); break;
+		case TAPE_END_MAP: ok = callbacks->yajl_end_map(ctx); break;
+		case TAPE_START_ARRAY: ok = callbacks->yajl_start_array(ctx); break;
+		case TAPE_END_ARRAY: ok = callbacks->yajl_end_array(ctx); break;
+		}
+	}
+	if (ok && tape->out_of_memory) {
+		PyErr_NoMemory();
+		ok = 0;
+	}
+	tape->used = 0;
+	tape->bytes_used = 0;
+	tape->out_of_memory = 0;
+	event_tape_shrink(tape);
+	return ok;
+}
+
+#endif /* EVENT_TAPE_H */
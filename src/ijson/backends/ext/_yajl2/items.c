@@ -20,7 +20,7 @@
 static int itemsgen_init(ItemsGen *self, PyObject *args, PyObject *kwargs)
 {
 	PyObject *reading_args = PySequence_GetSlice(args, 0, 2);
-	PyObject *items_args = PySequence_GetSlice(args, 2, 4);
+	PyObject *items_args = PySequence_GetSlice(args, 2, 8);
 	pipeline_node coro_pipeline[] = {
 		{&ItemsBasecoro_Type, items_args, NULL},
 		{&ParseBasecoro_Type, NULL, NULL},
@@ -29,8 +29,8 @@ typedef struct {
  */
 static int itemsasync_init(ItemsAsync *self, PyObject *args, PyObject *kwargs)
 {
-	PyObject *reading_args = PySequence_GetSlice(args, 0, 2);
-	PyObject *items_args = PySequence_GetSlice(args, 2, 4);
+	PyObject *reading_args = PySequence_GetSlice(args, 0, 3);
+	PyObject *items_args = PySequence_GetSlice(args, 3, 9);
 	pipeline_node coro_pipeline[] = {
 		{&ItemsBasecoro_Type, items_args, NULL},
 		{&ParseBasecoro_Type, NULL, NULL},
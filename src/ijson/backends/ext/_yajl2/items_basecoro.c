@@ -18,27 +18,98 @@ static int items_basecoro_init(ItemsBasecoro *self, PyObject *args, PyObject *kw
 {
 	self->target_send = NULL;
 	self->prefix = NULL;
+	self->prefixes = NULL;
+	self->prefix_set = NULL;
+	self->matched_prefix = NULL;
+	self->fields = NULL;
+	self->kept_fields = NULL;
+	self->multiple = 0;
 	self->object_depth = 0;
 	M1_N(self->module_state = get_state_from_imported_module());
 	builder_create(&self->builder);
+	automaton_create(&self->automaton);
+	prefix_matcher_create(&self->projection);
+	predicate_create(&self->predicate);
 
 	PyObject *map_type;
-	M1_Z(PyArg_ParseTuple(args, "OOO", &(self->target_send), &(self->prefix), &map_type));
+	PyObject *prefixes = Py_None;
+	PyObject *automaton = Py_None;
+	PyObject *fields = Py_None;
+	PyObject *where = Py_None;
+	M1_Z(PyArg_ParseTuple(args, "OOO|OOOO", &(self->target_send), &(self->prefix), &map_type, &prefixes,
+	                      &automaton, &fields, &where));
 	Py_INCREF(self->target_send);
 	Py_INCREF(self->prefix);
 	M1_M1(builder_init(&self->builder, map_type));
+	if (automaton != Py_None) {
+		M1_M1(automaton_init(&self->automaton, automaton));
+	}
+	if (where != Py_None) {
+		M1_M1(predicate_init(&self->predicate, where));
+	}
+	if (fields != Py_None) {
+		M1_N(self->fields = prefix_matcher_fields(fields, "fields"));
+		M1_M1(prefix_matcher_init(&self->projection, self->fields));
+		// fields needed to evaluate the predicate must reach us too
+		if (predicate_isactive(&self->predicate)) {
+			M1_N(self->kept_fields = PySequence_Concat(self->fields, self->predicate.paths));
+		}
+		else {
+			Py_INCREF(self->fields);
+			self->kept_fields = self->fields;
+		}
+	}
+
+	// A single prefix is treated as a set of one, whose results are sent
+	// without their prefix
+	if (prefixes == Py_None) {
+		M1_N(self->prefixes = PyTuple_Pack(1, self->prefix));
+		return 0;
+	}
+	if (self->prefix != Py_None) {
+		PyErr_SetString(PyExc_ValueError, "Only one of prefix or prefixes can be given");
+		return -1;
+	}
+	if (PyUnicode_Check(prefixes) || PyBytes_Check(prefixes)) {
+		PyErr_SetString(PyExc_TypeError, "prefixes must be a collection of prefixes, not a string");
+		return -1;
+	}
+	M1_N(self->prefixes = PySequence_Tuple(prefixes));
+	M1_N(self->prefix_set = PyFrozenSet_New(self->prefixes));
+	self->multiple = 1;
 
 	return 0;
 }
 
 static void items_basecoro_dealloc(ItemsBasecoro *self)
 {
+	Py_XDECREF(self->matched_prefix);
+	prefix_matcher_destroy(&self->projection);
+	predicate_destroy(&self->predicate);
+	Py_XDECREF(self->kept_fields);
+	Py_XDECREF(self->fields);
+	Py_XDECREF(self->prefix_set);
+	Py_XDECREF(self->prefixes);
 	Py_XDECREF(self->prefix);
 	Py_XDECREF(self->target_send);
 	builder_destroy(&self->builder);
+	automaton_destroy(&self->automaton);
 	Py_TYPE(self)->tp_free((PyObject*)self);
 }
 
+/*
+ * The result to send for a value found under the given prefix, which is paired
+ * with its prefix when matching a set of prefixes
+ */
+static PyObject *items_basecoro_result(ItemsBasecoro *coro, PyObject *prefix, PyObject *value)
+{
+	if (!coro->multiple) {
+		Py_INCREF(value);
+		return value;
+	}
+	return PyTuple_Pack(2, prefix, value);
+}
+
 PyObject* items_basecoro_send_impl(PyObject *self, PyObject *path, PyObject *event, PyObject *value)
 {
 	ItemsBasecoro *coro = (ItemsBasecoro *)self;
@@ -48,25 +119,91 @@ PyObject* items_basecoro_send_impl(PyObject *self, PyObject *path, PyObject *eve
 		coro->object_depth += (event == enames.start_map_ename || event == enames.start_array_ename);
 		coro->object_depth -= (event == enames.end_map_ename || event == enames.end_array_ename);
 		if (coro->object_depth > 0) {
-			N_M1( builder_event(&coro->builder, enames, event, value) );
+			// objects rejected by the predicate stop being built, and
+			// only their selected fields are built, if given
+			int wanted = 1;
+			if (predicate_isactive(&coro->predicate)) {
+				N_M1(wanted = predicate_event(&coro->predicate, &enames, event, value));
+			}
+			if (wanted && coro->fields) {
+				N_M1(wanted = prefix_matcher_event(&coro->projection, &enames, event, value));
+			}
+			if (wanted) {
+				N_M1( builder_event(&coro->builder, enames, event, value) );
+			}
 		}
 		else {
-			PyObject *retval = builder_value(&coro->builder);
-			CORO_SEND(coro->target_send, retval);
-			Py_DECREF(retval);
+			if (!predicate_isactive(&coro->predicate) || predicate_accepted(&coro->predicate)) {
+				PyObject *value = builder_value(&coro->builder);
+				N_N(value);
+				PyObject *retval = items_basecoro_result(coro, coro->matched_prefix, value);
+				Py_DECREF(value);
+				N_N(retval);
+				CORO_SEND(coro->target_send, retval);
+				Py_DECREF(retval);
+			}
+			Py_CLEAR(coro->matched_prefix);
 			N_M1(builder_reset(&coro->builder));
 		}
 	}
 	else {
-		int cmp = PyObject_RichCompareBool(path, coro->prefix, Py_EQ);
-		N_M1(cmp);
-		if (cmp) {
+		PyObject *matched = NULL;
+		if (automaton_isactive(&coro->automaton)) {
+			if (event == enames.map_key_ename) {
+				N_M1(automaton_map_key(&coro->automaton, value));
+				Py_RETURN_NONE;
+			}
+			else if (event == enames.end_map_ename || event == enames.end_array_ename) {
+				automaton_end(&coro->automaton);
+				Py_RETURN_NONE;
+			}
+			Py_ssize_t state = automaton_value_state(&coro->automaton);
+			PyObject *accepted = automaton_accepts(&coro->automaton, state);
+			if (accepted != Py_None) {
+				matched = accepted;
+			}
+			else if (event == enames.start_map_ename || event == enames.start_array_ename) {
+				N_M1(automaton_push(&coro->automaton, state, event == enames.start_array_ename));
+			}
+		}
+		else if (path) {
+			int cmp;
+			if (coro->prefix_set) {
+				cmp = PySet_Contains(coro->prefix_set, path);
+			}
+			else {
+				cmp = PyObject_RichCompareBool(path, coro->prefix, Py_EQ);
+			}
+			N_M1(cmp);
+			matched = cmp ? path : NULL;
+		}
+		if (matched) {
 			if (event == enames.start_map_ename || event == enames.start_array_ename) {
 				coro->object_depth = 1;
+				if (predicate_isactive(&coro->predicate)) {
+					N_M1(predicate_start(&coro->predicate, &enames, event, value));
+				}
+				if (coro->fields) {
+					prefix_matcher_reset(&coro->projection);
+					N_M1(prefix_matcher_event(&coro->projection, &enames, event, value));
+				}
 				N_M1(builder_event(&coro->builder, enames, event, value));
+				if (coro->multiple) {
+					Py_INCREF(matched);
+					coro->matched_prefix = matched;
+				}
 			}
 			else {
-				CORO_SEND(coro->target_send, value);
+				if (predicate_isactive(&coro->predicate)) {
+					N_M1(predicate_start(&coro->predicate, &enames, event, value));
+					if (!predicate_accepted(&coro->predicate)) {
+						Py_RETURN_NONE;
+					}
+				}
+				PyObject *retval;
+				N_N(retval = items_basecoro_result(coro, matched, value));
+				CORO_SEND(coro->target_send, retval);
+				Py_DECREF(retval);
 			}
 		}
 	}
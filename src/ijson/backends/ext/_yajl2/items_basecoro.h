@@ -11,8 +11,11 @@
 #ifndef ITEMS_BASECORO_H
 #define ITEMS_BASECORO_H
 
+#include "automaton.h"
 #include "builder.h"
 #include "module_state.h"
+#include "predicate.h"
+#include "prefix_matcher.h"
 
 /**
  * items_basecoro coroutine object structure
@@ -22,6 +25,15 @@ typedef struct {
     builder_t builder;
     PyObject *target_send;
     PyObject *prefix;
+    PyObject *prefixes;
+    PyObject *prefix_set;
+    PyObject *matched_prefix;
+    automaton_t automaton;
+    PyObject *fields;
+    PyObject *kept_fields;
+    prefix_matcher_t projection;
+    predicate_t predicate;
+    int multiple;
     int object_depth;
     yajl2_state *module_state;
 } ItemsBasecoro;
@@ -36,11 +48,19 @@ extern PyTypeObject ItemsBasecoro_Type;
  */
 #define ItemsBasecoro_Check(o) (Py_TYPE(o) == &ItemsBasecoro_Type)
 
+/**
+ * Whether the object being built by an items_basecoro coroutine has been
+ * rejected by its predicate, so the rest of its events are not needed
+ */
+#define items_basecoro_rejected(o) \
+	(predicate_isactive(&((ItemsBasecoro *)(o))->predicate) && \
+	 ((ItemsBasecoro *)(o))->predicate.rejected && ((ItemsBasecoro *)(o))->object_depth > 0)
+
 /**
  * The implementation of the items_basecoro.send() method accepting an unpacked
  * event
  * @param self An items_basecoro coroutine
- * @param path The path of this event
+ * @param path The path of this event, or NULL if it is known not to match
  * @param event The event name
  * @param value The value of this event
  * @return None, or NULL in case of an error
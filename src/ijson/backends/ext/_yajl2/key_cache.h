@@ -0,0 +1,122 @@
+/*
+ * key_cache_t type and associated methods
+ */
+
+#ifndef KEY_CACHE_H
+#define KEY_CACHE_H
+
+#include <stdint.h>
+#include <string.h>
+
+#define PY_SSIZE_T_CLEAN
+#include <Python.h>
+
+/* Number of entries in the cache, must be a power of two */
+#define KEY_CACHE_SIZE 512
+
+/* Longer keys are not cached, as they are unlikely to be repeated */
+#define KEY_CACHE_MAX_KEY_LENGTH 64
+
+/**
+ * key_cache_t structure.
+ *
+ * A direct-mapped cache of the map keys most recently seen by a parser,
+ * indexed by a hash of their UTF-8 bytes. Documents usually repeat the same
+ * keys over and over, so most keys are found in the cache and don't need to
+ * be decoded again. This also makes the dictionaries built out of them share
+ * their key objects.
+ */
+typedef struct _key_cache {
+	PyObject *keys[KEY_CACHE_SIZE];
+} key_cache_t;
+
+/**
+ * Initializes an empty key cache.
+ *
+ * @param cache the cache to initialize
+ */
+static inline
+void key_cache_create(key_cache_t *cache)
+{
+	memset(cache, 0, sizeof(key_cache_t));
+}
+
+/**
+ * Destroys a key cache, releasing all the keys it holds
+ * @param cache The cache to destroy
+ */
+static inline
+void key_cache_destroy(key_cache_t *cache)
+{
+	for (size_t i = 0; i != KEY_CACHE_SIZE; i++) {
+		Py_CLEAR(cache->keys[i]);
+	}
+}
+
+/*
+ * Creates a str out of UTF-8 bytes, copying them directly when they are
+ * pure ASCII
+ */
+static inline
+PyObject *_key_cache_decode(const char *key, size_t len, int is_ascii)
+{
+	if (!is_ascii) {
+		return PyUnicode_DecodeUTF8(key, len, NULL);
+	}
+	PyObject *str = PyUnicode_New(len, 127);
+	if (str) {
+		memcpy(PyUnicode_1BYTE_DATA(str), key, len);
+	}
+	return str;
+}
+
+/**
+ * Returns a str with the given UTF-8 contents, reusing a cached one if
+ * possible.
+ *
+ * @param cache A key cache
+ * @param key The UTF-8 bytes of the key
+ * @param len The length of the key
+ * @return A new reference to the key, or NULL in case of an error
+ */
+static inline
+PyObject *key_cache_get(key_cache_t *cache, const char *key, size_t len)
+{
+	// FNV-1a, also checking whether the key is pure ASCII
+	uint32_t hash = 2166136261u;
+	unsigned char high_bits = 0;
+	for (size_t i = 0; i != len; i++) {
+		unsigned char c = (unsigned char)key[i];
+		high_bits |= c;
+		hash = (hash ^ c) * 16777619u;
+	}
+	int is_ascii = high_bits < 128;
+
+	if (len > KEY_CACHE_MAX_KEY_LENGTH) {
+		return _key_cache_decode(key, len, is_ascii);
+	}
+
+	PyObject **entry = &cache->keys[hash & (KEY_CACHE_SIZE - 1)];
+	if (*entry) {
+		// ASCII strings' data is their UTF-8 representation,
+		// the rest cache theirs after the first call
+		Py_ssize_t cached_len;
+		const char *cached = PyUnicode_AsUTF8AndSize(*entry, &cached_len);
+		if (!cached) {
+			return NULL;
+		}
+		if ((size_t)cached_len == len && memcmp(cached, key, len) == 0) {
+			Py_INCREF(*entry);
+			return *entry;
+		}
+	}
+
+	PyObject *str = _key_cache_decode(key, len, is_ascii);
+	if (str) {
+		Py_XSETREF(*entry, str);
+		Py_INCREF(str);
+	}
+	return str;
+}
+
+#endif /* KEY_CACHE_H */
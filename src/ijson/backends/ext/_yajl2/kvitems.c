@@ -20,7 +20,7 @@
 static int kvitemsgen_init(KVItemsGen *self, PyObject *args, PyObject *kwargs)
 {
 	PyObject *reading_args = PySequence_GetSlice(args, 0, 2);
-	PyObject *kvitems_args = PySequence_GetSlice(args, 2, 4);
+	PyObject *kvitems_args = PySequence_GetSlice(args, 2, 5);
 	pipeline_node coro_pipeline[] = {
 		{&KVItemsBasecoro_Type, kvitems_args, NULL},
 		{&ParseBasecoro_Type, NULL, NULL},
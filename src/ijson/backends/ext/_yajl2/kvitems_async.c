@@ -29,8 +29,8 @@ typedef struct {
  */
 static int kvitemsasync_init(KVItemsAsync *self, PyObject *args, PyObject *kwargs)
 {
-	PyObject *reading_args = PySequence_GetSlice(args, 0, 2);
-	PyObject *kvitems_args = PySequence_GetSlice(args, 2, 4);
+	PyObject *reading_args = PySequence_GetSlice(args, 0, 3);
+	PyObject *kvitems_args = PySequence_GetSlice(args, 3, 6);
 	pipeline_node coro_pipeline[] = {
 		{&KVItemsBasecoro_Type, kvitems_args, NULL},
 		{&ParseBasecoro_Type, NULL, NULL},
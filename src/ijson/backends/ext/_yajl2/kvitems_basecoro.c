@@ -19,14 +19,21 @@ static int kvitems_basecoro_init(KVItemsBasecoro *self, PyObject *args, PyObject
 	self->target_send = NULL;
 	self->prefix = NULL;
 	self->key = NULL;
+	self->keys = NULL;
+	self->key_set = NULL;
 	M1_N(self->module_state = get_state_from_imported_module());
 	builder_create(&self->builder);
 
 	PyObject *map_type;
-	M1_Z(PyArg_ParseTuple(args, "OOO", &(self->target_send), &(self->prefix), &map_type));
+	PyObject *keys = Py_None;
+	M1_Z(PyArg_ParseTuple(args, "OOO|O", &(self->target_send), &(self->prefix), &map_type, &keys));
 	Py_INCREF(self->target_send);
 	Py_INCREF(self->prefix);
 	M1_M1(builder_init(&self->builder, map_type));
+	if (keys != Py_None) {
+		M1_N(self->keys = prefix_matcher_fields(keys, "keys"));
+		M1_N(self->key_set = PyFrozenSet_New(self->keys));
+	}
 
 	return 0;
 }
@@ -35,6 +42,8 @@ static void kvitems_basecoro_dealloc(KVItemsBasecoro *self)
 {
 	Py_XDECREF(self->prefix);
 	Py_XDECREF(self->key);
+	Py_XDECREF(self->key_set);
+	Py_XDECREF(self->keys);
 	Py_XDECREF(self->target_send);
 	builder_destroy(&self->builder);
 	Py_TYPE(self)->tp_free((PyObject*)self);
@@ -42,6 +51,16 @@ static void kvitems_basecoro_dealloc(KVItemsBasecoro *self)
 
 static int kvitems_basecoro_start_new_member(KVItemsBasecoro *coro, PyObject *key)
 {
+	// members not selected by the keys given, if any, are skipped
+	if (coro->key_set) {
+		int wanted;
+		M1_M1(wanted = PySet_Contains(coro->key_set, key));
+		if (!wanted) {
+			Py_CLEAR(coro->key);
+			coro->builder.active = 0;
+			return 0;
+		}
+	}
 	coro->object_depth = 0;
 	Py_XDECREF(coro->key);
 	coro->key = key;
@@ -78,7 +97,7 @@ PyObject* kvitems_basecoro_send_impl(PyObject *self, PyObject *path, PyObject *e
 			}
 		}
 	}
-	else {
+	else if (path) {
 		int cmp = PyObject_RichCompareBool(path, coro->prefix, Py_EQ);
 		N_M1(cmp);
 		if (cmp == 1 && event == enames.map_key_ename) {
@@ -16,6 +16,7 @@
 
 #include "builder.h"
 #include "module_state.h"
+#include "prefix_matcher.h"
 
 /**
  * kvitems_basecoro coroutine object structure
@@ -26,6 +27,8 @@ typedef struct {
     PyObject *target_send;
     PyObject *prefix;
     PyObject *key;
+    PyObject *keys;
+    PyObject *key_set;
     int object_depth;
     yajl2_state *module_state;
 } KVItemsBasecoro;
@@ -44,7 +47,7 @@ extern PyTypeObject KVItemsBasecoro_Type;
  * The implementation of the kvitems_basecoro.send() method accepting an unpacked
  * event
  * @param self A kvitems_basecoro coroutine
- * @param path The path of this event
+ * @param path The path of this event, or NULL if it is known not to match
  * @param event The event name
  * @param value The value of this event
  * @return None, or NULL in case of an error
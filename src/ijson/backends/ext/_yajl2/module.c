@@ -15,19 +15,27 @@
 #include "basic_parse.h"
 #include "basic_parse_async.h"
 #include "basic_parse_basecoro.h"
+#include "columns_basecoro.h"
 #include "parse.h"
 #include "parse_async.h"
 #include "parse_basecoro.h"
+#include "parser.h"
 #include "items.h"
 #include "items_async.h"
 #include "items_basecoro.h"
 #include "kvitems.h"
 #include "kvitems_async.h"
 #include "kvitems_basecoro.h"
+#include "numeric_items.h"
+#include "numeric_items_basecoro.h"
+#include "offsets.h"
+#include "offsets_basecoro.h"
+#include "structure_scan.h"
 
 #define MODULE_NAME "_yajl2"
 
 static PyMethodDef yajl2_methods[] = {
+	{"scan_structure", ijson_scan_structure, METH_O, "Speculatively scans the structure of a chunk of a JSON document"},
 	{NULL, NULL, 0, NULL}        /* Sentinel */
 };
 
@@ -149,11 +157,17 @@ static int _yajl2_mod_exec(PyObject *m)
 	ADD_TYPE("kvitems", KVItemsGen_Type);
 	ADD_TYPE("items_basecoro", ItemsBasecoro_Type);
 	ADD_TYPE("items", ItemsGen_Type);
+	ADD_TYPE("columns_basecoro", ColumnsBasecoro_Type);
+	ADD_TYPE("numeric_items_basecoro", NumericItemsBasecoro_Type);
+	ADD_TYPE("numeric_items", NumericItemsGen_Type);
+	ADD_TYPE("offsets_basecoro", OffsetsBasecoro_Type);
+	ADD_TYPE("offsets", OffsetsGen_Type);
 	ADD_TYPE("_async_reading_iterator", AsyncReadingGeneratorType);
 	ADD_TYPE("basic_parse_async", BasicParseAsync_Type);
 	ADD_TYPE("parse_async", ParseAsync_Type);
 	ADD_TYPE("kvitems_async", KVItemsAsync_Type);
 	ADD_TYPE("items_async", ItemsAsync_Type);
+	ADD_TYPE("parser", Parser_Type);
 
 	yajl2_state *state;
 	M1_N(state = get_state(m));
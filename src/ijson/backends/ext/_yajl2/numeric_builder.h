@@ -0,0 +1,365 @@
+/*
+ * numeric_builder_t type and associated methods
+ */
+
+#ifndef NUMERIC_BUILDER_H
+#define NUMERIC_BUILDER_H
+
+#include <ctype.h>
+#include <errno.h>
+#include <float.h>
+#include <limits.h>
+#include <math.h>
+#include <stdlib.h>
+#include <string.h>
+
+#define PY_SSIZE_T_CLEAN
+#include <Python.h>
+
+#include "common.h"
+
+/* The array typecodes numbers can be stored as */
+#define NUMERIC_TYPECODES "bBhHiIlLqQfd"
+
+/* Numbers longer than this are copied to the heap to be parsed */
+#define NUMERIC_BUILDER_MAX_STACK_NUMBER 64
+
+/**
+ * numeric_builder_t structure.
+ *
+ * Builds an array of numbers (possibly nested in other arrays) directly into
+ * a bytearray, storing them with the C type of an array typecode. The shape of
+ * the array is inferred as the array is built, and arrays that are not
+ * rectangular or contain non-numeric values are rejected.
+ */
+typedef struct _numeric_builder {
+	char typecode;
+	Py_ssize_t itemsize;
+	PyObject *data;
+	Py_ssize_t used;
+	Py_ssize_t capacity;
+	Py_ssize_t depth;
+	Py_ssize_t max_depth;
+	Py_ssize_t ndim;
+	Py_ssize_t *dims;
+	Py_ssize_t *counts;
+	Py_ssize_t levels;
+} numeric_builder_t;
+
+/**
+ * Initializes an empty numeric builder which can be safely destroyed.
+ *
+ * @param builder the builder to empty-initialize
+ */
+static inline
+void numeric_builder_create(numeric_builder_t *builder)
+{
+	memset(builder, 0, sizeof(numeric_builder_t));
+}
+
+/**
+ * Initializes a numeric builder.
+ *
+ * @param builder the builder to initialize
+ * @param typecode the array typecode numbers are stored as
+ * @return 0 if successful, -1 in case of an error
+ */
+static inline
+int numeric_builder_init(numeric_builder_t *builder, PyObject *typecode)
+{
+	Py_ssize_t len;
+	const char *code;
+	M1_N(code = PyUnicode_AsUTF8AndSize(typecode, &len));
+	if (len != 1 || !strchr(NUMERIC_TYPECODES, code[0])) {
+		PyErr_Format(PyExc_ValueError, "Unsupported typecode: %R", typecode);
+		return -1;
+	}
+	builder->typecode = code[0];
+	switch (builder->typecode) {
+	case 'b': case 'B': builder->itemsize = sizeof(char); break;
+	case 'h': case 'H': builder->itemsize = sizeof(short); break;
+	case 'i': case 'I': builder->itemsize = sizeof(int); break;
+	case 'l': case 'L': builder->itemsize = sizeof(long); break;
+	case 'q': case 'Q': builder->itemsize = sizeof(long long); break;
+	case 'f': builder->itemsize = sizeof(float); break;
+	default: builder->itemsize = sizeof(double); break;
+	}
+	return 0;
+}
+
+/**
+ * Destroys a numeric builder and all its associated contents
+ * @param builder The builder to destroy
+ */
+static inline
+void numeric_builder_destroy(numeric_builder_t *builder)
+{
+	Py_XDECREF(builder->data);
+	PyMem_Free(builder->dims);
+	PyMem_Free(builder->counts);
+}
+
+/**
+ * Starts building a new array.
+ *
+ * @param builder A numeric builder
+ * @return 0 if successful, -1 in case of an error
+ */
+static inline
+int numeric_builder_start(numeric_builder_t *builder)
+{
+	PyObject *data;
+	M1_N(data = PyByteArray_FromStringAndSize(NULL, 0));
+	Py_XSETREF(builder->data, data);
+	builder->used = 0;
+	builder->capacity = 0;
+	builder->depth = 0;
+	builder->max_depth = 0;
+	builder->ndim = -1;
+	return 0;
+}
+
+static inline
+int _numeric_builder_not_rectangular(void)
+{
+	PyErr_SetString(PyExc_ValueError, "Numeric arrays must be rectangular");
+	return -1;
+}
+
+/* Counts a new element in the innermost array being built */
+static inline
+void _numeric_builder_count(numeric_builder_t *builder)
+{
+	if (builder->depth) {
+		builder->counts[builder->depth - 1]++;
+	}
+}
+
+/**
+ * Notifies the builder that a nested array has started.
+ *
+ * @param builder A numeric builder
+ * @return 0 if successful, -1 in case of an error
+ */
+static inline
+int numeric_builder_start_array(numeric_builder_t *builder)
+{
+	if (builder->ndim != -1 && builder->depth >= builder->ndim) {
+		return _numeric_builder_not_rectangular();
+	}
+	_numeric_builder_count(builder);
+	if (builder->depth == builder->levels) {
+		Py_ssize_t new_levels = builder->levels ? builder->levels * 2 : 4;
+		Py_ssize_t *dims = PyMem_Realloc(builder->dims, new_levels * sizeof(Py_ssize_t));
+		if (!dims) {
+			PyErr_NoMemory();
+			return -1;
+		}
+		builder->dims = dims;
+		Py_ssize_t *counts = PyMem_Realloc(builder->counts, new_levels * sizeof(Py_ssize_t));
+		if (!counts) {
+			PyErr_NoMemory();
+			return -1;
+		}
+		builder->counts = counts;
+		builder->levels = new_levels;
+	}
+	if (builder->depth == builder->max_depth) {
+		builder->dims[builder->max_depth++] = -1;
+	}
+	builder->counts[builder->depth++] = 0;
+	return 0;
+}
+
+/**
+ * Notifies the builder that a nested array has finished.
+ *
+ * @param builder A numeric builder
+ * @return 0 if successful, -1 in case of an error
+ */
+static inline
+int numeric_builder_end_array(numeric_builder_t *builder)
+{
+	builder->depth--;
+	Py_ssize_t count = builder->counts[builder->depth];
+	Py_ssize_t *dim = &builder->dims[builder->depth];
+	if (*dim == -1) {
+		*dim = count;
+	}
+	else if (*dim != count) {
+		return _numeric_builder_not_rectangular();
+	}
+	return 0;
+}
+
+/* Converts an integer, checking it is within the given range */
+static inline
+int _numeric_builder_integer(numeric_builder_t *builder, const char *number,
+                             long long *sval, unsigned long long *uval)
+{
+	int is_signed = islower(builder->typecode);
+	int overflow = 0;
+	if (strpbrk(number, ".eE")) {
+		double dval = PyOS_string_to_double(number, NULL, NULL);
+		if (dval == -1.0 && PyErr_Occurred()) {
+			return -1;
+		}
+		if (dval != floor(dval)) {
+			PyErr_Format(PyExc_ValueError, "%s is not an integer", number);
+			return -1;
+		}
+		if (is_signed) {
+			overflow = !(dval >= (double)LLONG_MIN && dval < -(double)LLONG_MIN);
+			*sval = overflow ? 0 : (long long)dval;
+		}
+		else {
+			overflow = !(dval >= 0 && dval < 2.0 * -(double)LLONG_MIN);
+			*uval = overflow ? 0 : (unsigned long long)dval;
+		}
+	}
+	else {
+		errno = 0;
+		if (is_signed) {
+			*sval = strtoll(number, NULL, 10);
+		}
+		else {
+			overflow = number[0] == '-' && strcmp(number, "-0") != 0;
+			*uval = strtoull(number, NULL, 10);
+		}
+		overflow |= errno == ERANGE;
+	}
+	return overflow;
+}
+
+/* Stores a number with the builder's C type at the given location */
+static inline
+int _numeric_builder_store(numeric_builder_t *builder, const char *number, char *out)
+{
+	if (builder->typecode == 'f' || builder->typecode == 'd') {
+		double dval = PyOS_string_to_double(number, NULL, NULL);
+		if (dval == -1.0 && PyErr_Occurred()) {
+			return -1;
+		}
+		if (builder->typecode == 'f') {
+			// like in python, numbers too large for a float become infinite
+			float fval = fabs(dval) > FLT_MAX ? (float)copysign(INFINITY, dval) : (float)dval;
+			memcpy(out, &fval, sizeof(float));
+		}
+		else {
+			memcpy(out, &dval, sizeof(double));
+		}
+		return 0;
+	}
+
+	long long sval = 0;
+	unsigned long long uval = 0;
+	int overflow;
+	M1_M1(overflow = _numeric_builder_integer(builder, number, &sval, &uval));
+#define STORE(code, ctype, val, min, max) \
+	case code: \
+		overflow |= val < min || val > max; \
+		{ \
+			ctype cval = (ctype)val; \
+			memcpy(out, &cval, sizeof(ctype)); \
+		} \
+		break;
+	switch (builder->typecode) {
+	STORE('b', signed char, sval, SCHAR_MIN, SCHAR_MAX)
+	STORE('h', short, sval, SHRT_MIN, SHRT_MAX)
+	STORE('i', int, sval, INT_MIN, INT_MAX)
+	STORE('l', long, sval, LONG_MIN, LONG_MAX)
+	STORE('q', long long, sval, LLONG_MIN, LLONG_MAX)
+	STORE('B', unsigned char, uval, 0, UCHAR_MAX)
+	STORE('H', unsigned short, uval, 0, USHRT_MAX)
+	STORE('I', unsigned int, uval, 0, UINT_MAX)
+	STORE('L', unsigned long, uval, 0, ULONG_MAX)
+	STORE('Q', unsigned long long, uval, 0, ULLONG_MAX)
+	}
+#undef STORE
+	if (overflow) {
+		PyErr_Format(PyExc_OverflowError, "%s is out of range for typecode '%c'", number, builder->typecode);
+		return -1;
+	}
+	return 0;
+}
+
+/**
+ * Adds a number to the array being built.
+ *
+ * @param builder A numeric builder
+ * @param number The textual representation of the number, as found in the
+ * JSON document
+ * @param len The length of the number
+ * @return 0 if successful, -1 in case of an error
+ */
+static inline
+int numeric_builder_number(numeric_builder_t *builder, const char *number, size_t len)
+{
+	if (builder->ndim == -1) {
+		// numbers must be found at the deepest level
+		if (builder->depth != builder->max_depth) {
+			return _numeric_builder_not_rectangular();
+		}
+		builder->ndim = builder->depth;
+	}
+	else if (builder->depth != builder->ndim) {
+		return _numeric_builder_not_rectangular();
+	}
+	_numeric_builder_count(builder);
+
+	if (builder->used + builder->itemsize > builder->capacity) {
+		Py_ssize_t new_capacity = builder->capacity ? builder->capacity * 2 : builder->itemsize * 64;
+		M1_M1(PyByteArray_Resize(builder->data, new_capacity));
+		builder->capacity = new_capacity;
+	}
+
+	// yajl's numbers are not null-terminated
+	char stack_number[NUMERIC_BUILDER_MAX_STACK_NUMBER];
+	char *nval = stack_number;
+	if (len >= NUMERIC_BUILDER_MAX_STACK_NUMBER && !(nval = PyMem_Malloc(len + 1))) {
+		PyErr_NoMemory();
+		return -1;
+	}
+	memcpy(nval, number, len);
+	nval[len] = 0;
+	int res = _numeric_builder_store(builder, nval, PyByteArray_AS_STRING(builder->data) + builder->used);
+	if (nval != stack_number) {
+		PyMem_Free(nval);
+	}
+	M1_M1(res);
+	builder->used += builder->itemsize;
+	return 0;
+}
+
+/**
+ * Finishes building the current array.
+ *
+ * @param builder A numeric builder
+ * @return A new (data, shape) tuple, with the array's contents in a bytearray
+ * and its shape as a tuple of integers, or NULL in case of an error
+ */
+static inline
+PyObject *numeric_builder_finish(numeric_builder_t *builder)
+{
+	// arrays without numbers are as deep as their deepest empty array
+	if (builder->ndim == -1) {
+		builder->ndim = builder->max_depth;
+	}
+	N_M1(PyByteArray_Resize(builder->data, builder->used));
+	PyObject *shape;
+	N_N(shape = PyTuple_New(builder->ndim));
+	for (Py_ssize_t i = 0; i != builder->ndim; i++) {
+		PyObject *dim = PyLong_FromSsize_t(builder->dims[i]);
+		if (!dim) {
+			Py_DECREF(shape);
+			return NULL;
+		}
+		PyTuple_SET_ITEM(shape, i, dim);
+	}
+	PyObject *result = PyTuple_Pack(2, builder->data, shape);
+	Py_DECREF(shape);
+	Py_CLEAR(builder->data);
+	return result;
+}
+
+#endif /* NUMERIC_BUILDER_H */
@@ -0,0 +1,53 @@
+/*
+ * numeric_items generator implementation for ijson's C backend
+ */
+
+#include "common.h"
+#include "numeric_items.h"
+#include "numeric_items_basecoro.h"
+#include "basic_parse_basecoro.h"
+
+/*
+ * __init__, destructor, __iter__ and __next__
+ */
+static int numericitemsgen_init(NumericItemsGen *self, PyObject *args, PyObject *kwargs)
+{
+	PyObject *reading_args = PySequence_GetSlice(args, 0, 2);
+	PyObject *numeric_items_args = PySequence_GetSlice(args, 2, 4);
+	pipeline_node coro_pipeline[] = {
+		{&NumericItemsBasecoro_Type, numeric_items_args, NULL},
+		{&BasicParseBasecoro_Type, NULL, kwargs},
+		{NULL}
+	};
+	int res = reading_generator_init(&self->reading_gen, reading_args, coro_pipeline);
+	Py_DECREF(numeric_items_args);
+	Py_DECREF(reading_args);
+	return res;
+}
+
+static void numericitemsgen_dealloc(NumericItemsGen *self)
+{
+	reading_generator_dealloc(&self->reading_gen);
+	Py_TYPE(self)->tp_free((PyObject*)self);
+}
+
+static PyObject* numericitemsgen_iternext(PyObject *self)
+{
+	NumericItemsGen *gen = (NumericItemsGen *)self;
+	return reading_generator_next(&gen->reading_gen);
+}
+
+/*
+ * numeric_items generator object type
+ */
+PyTypeObject NumericItemsGen_Type = {
+	PyVarObject_HEAD_INIT(NULL, 0)
+	.tp_basicsize = sizeof(NumericItemsGen),
+	.tp_name = "_yajl2.numeric_items",
+	.tp_doc = "Generates (data, shape) pairs of numeric arrays",
+	.tp_init = (initproc)numericitemsgen_init,
+	.tp_dealloc = (destructor)numericitemsgen_dealloc,
+	.tp_flags = Py_TPFLAGS_DEFAULT,
+	.tp_iter = ijson_return_self,
+	.tp_iternext = numericitemsgen_iternext
+};
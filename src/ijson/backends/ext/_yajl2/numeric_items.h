@@ -0,0 +1,24 @@
+/*
+ * numeric_items generator for ijson's C backend
+ */
+
+#ifndef NUMERIC_ITEMS_H
+#define NUMERIC_ITEMS_H
+
+#include "reading_generator.h"
+
+/**
+ * numeric_items generator object structure
+ */
+typedef struct {
+	PyObject_HEAD
+	reading_generator_t reading_gen;
+} NumericItemsGen;
+
+
+/**
+ * numeric_items generator object type
+ */
+extern PyTypeObject NumericItemsGen_Type;
+
+#endif /* NUMERIC_ITEMS_H */
\ No newline at end of file
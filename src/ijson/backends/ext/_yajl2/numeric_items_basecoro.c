@@ -0,0 +1,163 @@
+/*
+ * numeric_items_basecoro coroutine implementation for ijson's C backend
+ */
+
+#include "basic_parse_basecoro.h"
+#include "common.h"
+#include "numeric_items_basecoro.h"
+
+#define get_coro(ctx) ((NumericItemsBasecoro *)((yajl_parse_context *)ctx)->target_send)
+
+/*
+ * Sends the array that has just been built to the target
+ */
+static int numeric_items_send(NumericItemsBasecoro *coro)
+{
+	PyObject *result;
+	Z_N(result = numeric_builder_finish(&coro->builder));
+	int ok;
+	if (PyList_Check(coro->target_send)) {
+		ok = PyList_Append(coro->target_send, result) == 0;
+	}
+	else {
+		PyObject *ret = PyObject_CallFunctionObjArgs(coro->target_send, result, NULL);
+		ok = ret != NULL;
+		Py_XDECREF(ret);
+	}
+	Py_DECREF(result);
+	return ok;
+}
+
+/*
+ * The YAJL callbacks. Values not under the prefix are skipped, and the rest
+ * must be numbers or arrays
+ */
+static int numeric_items_non_numeric(void *ctx, int is_container)
+{
+	prefix_matcher_t *matcher = &get_coro(ctx)->matcher;
+	int wanted = prefix_matcher_value(matcher, is_container);
+	if (wanted != 1) {
+		return wanted != -1;
+	}
+	// maps leading to the prefix
+	if (is_container && matcher->full_depth == 0) {
+		return 1;
+	}
+	PyErr_SetString(PyExc_ValueError, "Numeric arrays can only contain numbers and arrays");
+	return 0;
+}
+
+static int null(void *ctx) {
+	return numeric_items_non_numeric(ctx, 0);
+}
+
+static int boolean(void *ctx, int val) {
+	return numeric_items_non_numeric(ctx, 0);
+}
+
+static int string_cb(void *ctx, const unsigned char *stringVal, size_t stringLen) {
+	return numeric_items_non_numeric(ctx, 0);
+}
+
+static int start_map(void *ctx) {
+	return numeric_items_non_numeric(ctx, 1);
+}
+
+static int map_key(void *ctx, const unsigned char *key, size_t stringLen) {
+	prefix_matcher_map_key(&get_coro(ctx)->matcher, (const char *)key, stringLen);
+	return 1;
+}
+
+static int end_map(void *ctx) {
+	prefix_matcher_end(&get_coro(ctx)->matcher);
+	return 1;
+}
+
+static int number(void *ctx, const char *numberVal, size_t numberLen) {
+	NumericItemsBasecoro *coro = get_coro(ctx);
+	int wanted = prefix_matcher_value(&coro->matcher, 0);
+	if (wanted != 1) {
+		return wanted != -1;
+	}
+	// a number directly under the prefix
+	if (coro->matcher.full_depth == 0) {
+		Z_M1(numeric_builder_start(&coro->builder));
+		Z_M1(numeric_builder_number(&coro->builder, numberVal, numberLen));
+		return numeric_items_send(coro);
+	}
+	Z_M1(numeric_builder_number(&coro->builder, numberVal, numberLen));
+	return 1;
+}
+
+static int start_array(void *ctx) {
+	NumericItemsBasecoro *coro = get_coro(ctx);
+	int wanted = prefix_matcher_value(&coro->matcher, 2);
+	if (wanted != 1) {
+		return wanted != -1;
+	}
+	// arrays leading to the prefix
+	if (coro->matcher.full_depth == 0) {
+		return 1;
+	}
+	if (coro->matcher.full_depth == 1) {
+		Z_M1(numeric_builder_start(&coro->builder));
+	}
+	Z_M1(numeric_builder_start_array(&coro->builder));
+	return 1;
+}
+
+static int end_array(void *ctx) {
+	NumericItemsBasecoro *coro = get_coro(ctx);
+	int building = coro->matcher.full_depth != 0;
+	prefix_matcher_end(&coro->matcher);
+	if (!building) {
+		return 1;
+	}
+	Z_M1(numeric_builder_end_array(&coro->builder));
+	if (coro->matcher.full_depth == 0) {
+		return numeric_items_send(coro);
+	}
+	return 1;
+}
+
+yajl_callbacks numeric_items_callbacks = {
+	null, boolean, NULL, NULL, number, string_cb,
+	start_map, map_key, end_map, start_array, end_array
+};
+
+/*
+ * __init__ and destructor
+ */
+static int numeric_items_basecoro_init(NumericItemsBasecoro *self, PyObject *args, PyObject *kwargs)
+{
+	PyObject *prefix, *typecode;
+	self->target_send = NULL;
+	self->prefixes = NULL;
+	prefix_matcher_create(&self->matcher);
+	numeric_builder_create(&self->builder);
+	M1_Z(PyArg_ParseTuple(args, "OUU", &self->target_send, &prefix, &typecode));
+	Py_INCREF(self->target_send);
+	M1_M1(numeric_builder_init(&self->builder, typecode));
+	M1_N(self->prefixes = PyTuple_Pack(1, prefix));
+	M1_M1(prefix_matcher_init(&self->matcher, self->prefixes));
+	return 0;
+}
+
+static void numeric_items_basecoro_dealloc(NumericItemsBasecoro *self)
+{
+	prefix_matcher_destroy(&self->matcher);
+	numeric_builder_destroy(&self->builder);
+	Py_XDECREF(self->prefixes);
+	Py_XDECREF(self->target_send);
+	Py_TYPE(self)->tp_free((PyObject*)self);
+}
+
+PyTypeObject NumericItemsBasecoro_Type = {
+	PyVarObject_HEAD_INIT(NULL, 0)
+	.tp_basicsize = sizeof(NumericItemsBasecoro),
+	.tp_name = "_yajl2.numeric_items_basecoro",
+	.tp_doc = "Coroutine building numeric arrays out of basic_parse_basecoro's YAJL callbacks",
+	.tp_init = (initproc)numeric_items_basecoro_init,
+	.tp_dealloc = (destructor)numeric_items_basecoro_dealloc,
+	.tp_flags = Py_TPFLAGS_DEFAULT,
+};
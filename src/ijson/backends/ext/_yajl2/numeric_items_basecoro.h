@@ -0,0 +1,47 @@
+/*
+ * numeric_items_basecoro coroutine for ijson's C backend
+ */
+
+#ifndef NUMERIC_ITEMS_BASECORO_H
+#define NUMERIC_ITEMS_BASECORO_H
+
+#define PY_SSIZE_T_CLEAN
+#include <Python.h>
+#include <yajl/yajl_parse.h>
+
+#include "numeric_builder.h"
+#include "prefix_matcher.h"
+
+/**
+ * numeric_items_basecoro coroutine object structure
+ *
+ * This coroutine doesn't receive events, but is driven directly by the YAJL
+ * callbacks in numeric_items_callbacks, which basic_parse_basecoro uses when
+ * this coroutine is its target. Numbers under the prefix are thus written
+ * into their arrays without creating Python objects for them.
+ */
+typedef struct {
+    PyObject_HEAD
+    PyObject *target_send;
+    PyObject *prefixes;
+    prefix_matcher_t matcher;
+    numeric_builder_t builder;
+} NumericItemsBasecoro;
+
+/**
+ * numeric_items_basecoro coroutine object type
+ */
+extern PyTypeObject NumericItemsBasecoro_Type;
+
+/**
+ * Utility function to check if an object is a numeric_items_basecoro coroutine or not
+ */
+#define NumericItemsBasecoro_Check(o) (Py_TYPE(o) == &NumericItemsBasecoro_Type)
+
+/**
+ * The YAJL callbacks feeding a numeric_items_basecoro coroutine, which expect
+ * a yajl_parse_context targeting the coroutine
+ */
+extern yajl_callbacks numeric_items_callbacks;
+
+#endif // NUMERIC_ITEMS_BASECORO_H
@@ -0,0 +1,53 @@
+/*
+ * offsets generator implementation for ijson's C backend
+ */
+
+#include "common.h"
+#include "offsets.h"
+#include "offsets_basecoro.h"
+#include "basic_parse_basecoro.h"
+
+/*
+ * __init__, destructor, __iter__ and __next__
+ */
+static int offsetsgen_init(OffsetsGen *self, PyObject *args, PyObject *kwargs)
+{
+	PyObject *reading_args = PySequence_GetSlice(args, 0, 2);
+	PyObject *offsets_args = PySequence_GetSlice(args, 2, 4);
+	pipeline_node coro_pipeline[] = {
+		{&OffsetsBasecoro_Type, offsets_args, NULL},
+		{&BasicParseBasecoro_Type, NULL, kwargs},
+		{NULL}
+	};
+	int res = reading_generator_init(&self->reading_gen, reading_args, coro_pipeline);
+	Py_DECREF(offsets_args);
+	Py_DECREF(reading_args);
+	return res;
+}
+
+static void offsetsgen_dealloc(OffsetsGen *self)
+{
+	reading_generator_dealloc(&self->reading_gen);
+	Py_TYPE(self)->tp_free((PyObject*)self);
+}
+
+static PyObject* offsetsgen_iternext(PyObject *self)
+{
+	OffsetsGen *gen = (OffsetsGen *)self;
+	return reading_generator_next(&gen->reading_gen);
+}
+
+/*
+ * offsets generator object type
+ */
+PyTypeObject OffsetsGen_Type = {
+	PyVarObject_HEAD_INIT(NULL, 0)
+	.tp_basicsize = sizeof(OffsetsGen),
+	.tp_name = "_yajl2.offsets",
+	.tp_doc = "Generates the (number, offset, end) checkpoints of array items",
+	.tp_init = (initproc)offsetsgen_init,
+	.tp_dealloc = (destructor)offsetsgen_dealloc,
+	.tp_flags = Py_TPFLAGS_DEFAULT,
+	.tp_iter = ijson_return_self,
+	.tp_iternext = offsetsgen_iternext
+};
@@ -0,0 +1,24 @@
+/*
+ * offsets generator for ijson's C backend
+ */
+
+#ifndef OFFSETS_H
+#define OFFSETS_H
+
+#include "reading_generator.h"
+
+/**
+ * offsets generator object structure
+ */
+typedef struct {
+	PyObject_HEAD
+	reading_generator_t reading_gen;
+} OffsetsGen;
+
+
+/**
+ * offsets generator object type
+ */
+extern PyTypeObject OffsetsGen_Type;
+
+#endif /* OFFSETS_H */
\ No newline at end of file
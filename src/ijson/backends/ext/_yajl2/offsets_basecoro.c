@@ -0,0 +1,177 @@
+/*
+ * offsets_basecoro coroutine implementation for ijson's C backend
+ */
+
+#include "basic_parse_basecoro.h"
+#include "common.h"
+#include "offsets_basecoro.h"
+
+#define get_coro(ctx) ((OffsetsBasecoro *)((yajl_parse_context *)ctx)->target_send)
+
+/*
+ * Records a checkpoint at the item that is about to start
+ */
+static int offsets_add_checkpoint(OffsetsBasecoro *coro)
+{
+	if (coro->n_checkpoints == coro->size) {
+		Py_ssize_t new_size = coro->size ? coro->size * 2 : 64;
+		offsets_checkpoint *checkpoints = PyMem_Realloc(coro->checkpoints, new_size * sizeof(offsets_checkpoint));
+		if (!checkpoints) {
+			PyErr_NoMemory();
+			return -1;
+		}
+		coro->checkpoints = checkpoints;
+		coro->size = new_size;
+	}
+	offsets_checkpoint *checkpoint = &coro->checkpoints[coro->n_checkpoints++];
+	checkpoint->number = coro->number;
+	checkpoint->offset = coro->last;
+	return 0;
+}
+
+/*
+ * Sends the checkpoints of the array that has just finished to the target
+ */
+static int offsets_send(OffsetsBasecoro *coro)
+{
+	for (Py_ssize_t i = 0; i != coro->n_checkpoints; i++) {
+		offsets_checkpoint *checkpoint = &coro->checkpoints[i];
+		PyObject *result;
+		Z_N(result = Py_BuildValue("(nKK)", checkpoint->number, checkpoint->offset, coro->last));
+		int ok;
+		if (PyList_Check(coro->target_send)) {
+			ok = PyList_Append(coro->target_send, result) == 0;
+		}
+		else {
+			PyObject *ret = PyObject_CallFunctionObjArgs(coro->target_send, result, NULL);
+			ok = ret != NULL;
+			Py_XDECREF(ret);
+		}
+		Py_DECREF(result);
+		if (!ok) {
+			return 0;
+		}
+	}
+	coro->n_checkpoints = 0;
+	return 1;
+}
+
+/*
+ * The YAJL callbacks. Only the structure of the document is followed, and
+ * no Python objects are created for its values
+ */
+static int offsets_value(void *ctx, int is_container)
+{
+	OffsetsBasecoro *coro = get_coro(ctx);
+	prefix_matcher_t *matcher = &coro->matcher;
+	// items are the values found at the prefix inside an array
+	int in_array = !matcher->full_depth && !matcher->skip_depth && matcher->stack_used &&
+	               !matcher->stack[matcher->stack_used - 1].is_map;
+	int wanted;
+	Z_M1(wanted = prefix_matcher_value(matcher, is_container));
+	if (in_array && wanted && matcher->full_depth == (is_container != 0)) {
+		if (!coro->in_array || coro->number % coro->every == 0) {
+			Z_M1(offsets_add_checkpoint(coro));
+		}
+		coro->in_array = 1;
+		coro->number++;
+	}
+	coro->last = yajl_parse_context_offset((yajl_parse_context *)ctx);
+	return 1;
+}
+
+static int null(void *ctx) {
+	return offsets_value(ctx, 0);
+}
+
+static int boolean(void *ctx, int val) {
+	return offsets_value(ctx, 0);
+}
+
+static int number(void *ctx, const char *numberVal, size_t numberLen) {
+	return offsets_value(ctx, 0);
+}
+
+static int string_cb(void *ctx, const unsigned char *stringVal, size_t stringLen) {
+	return offsets_value(ctx, 0);
+}
+
+static int start_map(void *ctx) {
+	return offsets_value(ctx, 1);
+}
+
+static int start_array(void *ctx) {
+	return offsets_value(ctx, 2);
+}
+
+static int map_key(void *ctx, const unsigned char *key, size_t stringLen) {
+	OffsetsBasecoro *coro = get_coro(ctx);
+	prefix_matcher_map_key(&coro->matcher, (const char *)key, stringLen);
+	coro->last = yajl_parse_context_offset((yajl_parse_context *)ctx);
+	return 1;
+}
+
+static int end_container(void *ctx) {
+	OffsetsBasecoro *coro = get_coro(ctx);
+	prefix_matcher_t *matcher = &coro->matcher;
+	// while inside an array of items, the only container finishing outside
+	// the items is the array itself
+	int items_end = coro->in_array && !matcher->full_depth && !matcher->skip_depth;
+	prefix_matcher_end(matcher);
+	coro->last = yajl_parse_context_offset((yajl_parse_context *)ctx);
+	if (items_end) {
+		coro->in_array = 0;
+		return offsets_send(coro);
+	}
+	return 1;
+}
+
+yajl_callbacks offsets_callbacks = {
+	null, boolean, NULL, NULL, number, string_cb,
+	start_map, map_key, end_container, start_array, end_container
+};
+
+/*
+ * __init__ and destructor
+ */
+static int offsets_basecoro_init(OffsetsBasecoro *self, PyObject *args, PyObject *kwargs)
+{
+	PyObject *prefix;
+	self->target_send = NULL;
+	self->prefixes = NULL;
+	self->number = 0;
+	self->last = 0;
+	self->in_array = 0;
+	self->checkpoints = NULL;
+	self->n_checkpoints = 0;
+	self->size = 0;
+	prefix_matcher_create(&self->matcher);
+	M1_Z(PyArg_ParseTuple(args, "OUn", &self->target_send, &prefix, &self->every));
+	Py_INCREF(self->target_send);
+	if (self->every < 1) {
+		PyErr_SetString(PyExc_ValueError, "every must be a positive number of items");
+		return -1;
+	}
+	M1_N(self->prefixes = PyTuple_Pack(1, prefix));
+	M1_M1(prefix_matcher_init(&self->matcher, self->prefixes));
+	return 0;
+}
+
+static void offsets_basecoro_dealloc(OffsetsBasecoro *self)
+{
+	prefix_matcher_destroy(&self->matcher);
+	PyMem_Free(self->checkpoints);
+	Py_XDECREF(self->prefixes);
+	Py_XDECREF(self->target_send);
+	Py_TYPE(self)->tp_free((PyObject*)self);
+}
+
+PyTypeObject OffsetsBasecoro_Type = {
+	PyVarObject_HEAD_INIT(NULL, 0)
+	.tp_basicsize = sizeof(OffsetsBasecoro),
+	.tp_name = "_yajl2.offsets_basecoro",
+	.tp_doc = "Coroutine finding the byte offsets of array items out of basic_parse_basecoro's YAJL callbacks",
+	.tp_init = (initproc)offsets_basecoro_init,
+	.tp_dealloc = (destructor)offsets_basecoro_dealloc,
+	.tp_flags = Py_TPFLAGS_DEFAULT,
+};
@@ -0,0 +1,63 @@
+/*
+ * offsets_basecoro coroutine for ijson's C backend
+ */
+
+#ifndef OFFSETS_BASECORO_H
+#define OFFSETS_BASECORO_H
+
+#define PY_SSIZE_T_CLEAN
+#include <Python.h>
+#include <yajl/yajl_parse.h>
+
+#include "prefix_matcher.h"
+
+/* An item where parsing can be restarted */
+typedef struct _offsets_checkpoint {
+	Py_ssize_t number;
+	unsigned long long offset;
+} offsets_checkpoint;
+
+/**
+ * offsets_basecoro coroutine object structure
+ *
+ * This coroutine doesn't receive events, but is driven directly by the YAJL
+ * callbacks in offsets_callbacks, which basic_parse_basecoro uses when this
+ * coroutine is its target. It follows the items of the arrays found under the
+ * prefix, and records the byte offset at which every Nth item (and the first
+ * item of each array) starts, which is the offset just after the previous
+ * item or the opening bracket of the array. When an array finishes, its
+ * checkpoints are sent as (number, offset, end) tuples, where number is the
+ * index of the item among all items found so far, and end is the offset just
+ * after the closing bracket of the array.
+ */
+typedef struct {
+    PyObject_HEAD
+    PyObject *target_send;
+    PyObject *prefixes;
+    prefix_matcher_t matcher;
+    Py_ssize_t every;
+    Py_ssize_t number;
+    unsigned long long last;
+    int in_array;
+    offsets_checkpoint *checkpoints;
+    Py_ssize_t n_checkpoints;
+    Py_ssize_t size;
+} OffsetsBasecoro;
+
+/**
+ * offsets_basecoro coroutine object type
+ */
+extern PyTypeObject OffsetsBasecoro_Type;
+
+/**
+ * Utility function to check if an object is an offsets_basecoro coroutine or not
+ */
+#define OffsetsBasecoro_Check(o) (Py_TYPE(o) == &OffsetsBasecoro_Type)
+
+/**
+ * The YAJL callbacks feeding an offsets_basecoro coroutine, which expect
+ * a yajl_parse_context targeting the coroutine
+ */
+extern yajl_callbacks offsets_callbacks;
+
+#endif // OFFSETS_BASECORO_H
@@ -8,21 +8,78 @@
  * Copyright by UWA (in the framework of the ICRAR)
  */
 
+#include "columns_basecoro.h"
 #include "common.h"
 #include "items_basecoro.h"
 #include "kvitems_basecoro.h"
 #include "parse_basecoro.h"
 
+static int parse_basecoro_push_match(ParseBasecoro *self, pm_state match)
+{
+	if (self->matches_used == self->matches_size) {
+		Py_ssize_t new_size = self->matches_size ? self->matches_size * 2 : 16;
+		pm_state *matches = PyMem_Realloc(self->matches, new_size * sizeof(pm_state));
+		if (!matches) {
+			PyErr_NoMemory();
+			return -1;
+		}
+		self->matches = matches;
+		self->matches_size = new_size;
+	}
+	self->matches[self->matches_used++] = match;
+	return 0;
+}
+
 /*
  * __init__, destructor, __iter__ and __next__
  */
 static int parse_basecoro_init(ParseBasecoro *self, PyObject *args, PyObject *kwargs)
 {
+	prefix_matcher_create(&self->matcher);
+	self->mode = PATHS_STRINGS;
+	self->matches = NULL;
+	self->matches_size = 0;
+	self->matches_used = 0;
 	M1_Z(PyArg_ParseTuple(args, "O", &self->target_send));
 	Py_INCREF(self->target_send);
 	M1_N(self->path = PyList_New(0));
 	M1_N(self->module_state = get_state_from_imported_module());
 
+	// When feeding items/kvitems/columns directly, values that can't be part of their
+	// results don't need to be created by basic_parse_basecoro, and paths
+	// are matched against their prefixes without building them
+	if (ItemsBasecoro_Check(self->target_send) &&
+	    automaton_isactive(&((ItemsBasecoro *)self->target_send)->automaton)) {
+		self->mode = PATHS_NONE;
+	}
+	else if (ItemsBasecoro_Check(self->target_send)) {
+		M1_M1(prefix_matcher_init(&self->matcher, ((ItemsBasecoro *)self->target_send)->prefixes));
+	}
+	else if (KVItemsBasecoro_Check(self->target_send) || ColumnsBasecoro_Check(self->target_send)) {
+		PyObject *prefix = KVItemsBasecoro_Check(self->target_send) ?
+		    ((KVItemsBasecoro *)self->target_send)->prefix : ((ColumnsBasecoro *)self->target_send)->prefix;
+		PyObject *prefixes;
+		M1_N(prefixes = PyTuple_Pack(1, prefix));
+		int res = prefix_matcher_init(&self->matcher, prefixes);
+		Py_DECREF(prefixes);
+		M1_M1(res);
+	}
+	// Only the selected members of the values under the prefix are wanted
+	PyObject *fields = NULL;
+	if (ItemsBasecoro_Check(self->target_send)) {
+		fields = ((ItemsBasecoro *)self->target_send)->kept_fields;
+	}
+	else if (KVItemsBasecoro_Check(self->target_send)) {
+		fields = ((KVItemsBasecoro *)self->target_send)->keys;
+	}
+	if (self->matcher.enabled && fields) {
+		M1_M1(prefix_matcher_project(&self->matcher, fields));
+	}
+	if (self->matcher.enabled) {
+		self->mode = PATHS_MATCH;
+		M1_M1(parse_basecoro_push_match(self, _pm_root(&self->matcher)));
+	}
+
 	PyObject *empty;
 	M1_N(empty = PyUnicode_FromString(""));
 	int res = PyList_Append(self->path, empty);
@@ -36,19 +93,44 @@ static void parse_basecoro_dealloc(ParseBasecoro *self)
 {
 	Py_XDECREF(self->path);
 	Py_XDECREF(self->target_send);
+	prefix_matcher_destroy(&self->matcher);
+	PyMem_Free(self->matches);
 	Py_TYPE(self)->tp_free((PyObject*)self);
 }
 
-PyObject* parse_basecoro_send_impl(PyObject *self, PyObject *event, PyObject *value)
+/*
+ * Joins a path and a new component, optionally separated by a dot,
+ * with a single allocation
+ */
+static PyObject *parse_basecoro_join(PyObject *path, int dot, PyObject *component)
+{
+	Py_ssize_t path_len = PyUnicode_GET_LENGTH(path);
+	Py_ssize_t component_len = PyUnicode_GET_LENGTH(component);
+	Py_UCS4 maxchar = PyUnicode_MAX_CHAR_VALUE(path);
+	Py_UCS4 component_maxchar = PyUnicode_MAX_CHAR_VALUE(component);
+	if (component_maxchar > maxchar) {
+		maxchar = component_maxchar;
+	}
+	PyObject *joined;
+	N_N(joined = PyUnicode_New(path_len + dot + component_len, maxchar));
+	if (PyUnicode_CopyCharacters(joined, 0, path, 0, path_len) == -1 ||
+	    (dot && PyUnicode_WriteChar(joined, path_len, '.') == -1) ||
+	    PyUnicode_CopyCharacters(joined, path_len + dot, component, 0, component_len) == -1) {
+		Py_DECREF(joined);
+		return NULL;
+	}
+	return joined;
+}
+
+/*
+ * Calculates the path of the event as a string, keeping the stack of
+ * paths up to date
+ */
+static PyObject *parse_basecoro_path(ParseBasecoro *gen, PyObject *event, PyObject *value)
 {
-	ParseBasecoro *gen = (ParseBasecoro *)self;
 	Py_ssize_t npaths = PyList_GET_SIZE(gen->path);
 	enames_t enames = gen->module_state->enames;
-	PyObject *dot = gen->module_state->dot;
-	PyObject *dotitem = gen->module_state->dotitem;
-	PyObject *item = gen->module_state->item;
 
-	// Calculate current prefix
 	PyObject *prefix;
 	if (event == enames.end_array_ename || event == enames.end_map_ename) {
 		// pop
@@ -58,19 +140,10 @@ PyObject* parse_basecoro_send_impl(PyObject *self, PyObject *event, PyObject *va
 	}
 	else if (event == enames.map_key_ename) {
 
-		// last_path = path_stack[-2]
 		// to_append = '.' + value if len(path_stack) > 1 else value
 		// new_path = path_stack[-2] + to_append
-		PyObject *last_path = PyList_GET_ITEM(gen->path, npaths - 2);
-		PyObject *last_path_dot = NULL;
-		if (npaths > 2) {
-			last_path_dot = PyUnicode_Concat(last_path, dot);
-			N_N(last_path_dot);
-			last_path = last_path_dot;
-		}
-		PyObject *new_path = PyUnicode_Concat(last_path, value);
-		N_N(new_path);
-		Py_XDECREF(last_path_dot);
+		PyObject *new_path;
+		N_N(new_path = parse_basecoro_join(PyList_GET_ITEM(gen->path, npaths - 2), npaths > 2, value));
 		PyList_SetItem(gen->path, npaths - 1, new_path);
 
 		prefix = PyList_GET_ITEM(gen->path, npaths - 2);
@@ -86,28 +159,90 @@ PyObject* parse_basecoro_send_impl(PyObject *self, PyObject *event, PyObject *va
 		// path_stack.append(path_stack[-1] + to_append)
 		PyObject *last_path = PyList_GET_ITEM(gen->path, npaths - 1);
 		if (PyUnicode_GET_LENGTH(last_path) > 0) {
-			PyObject *new_path = PyUnicode_Concat(last_path, dotitem);
-			N_N(new_path);
+			PyObject *new_path;
+			N_N(new_path = parse_basecoro_join(last_path, 1, gen->module_state->item));
 			N_M1(PyList_Append(gen->path, new_path));
 			Py_DECREF(new_path);
 		}
 		else {
-			N_M1(PyList_Append(gen->path, item));
+			N_M1(PyList_Append(gen->path, gen->module_state->item));
 		}
 	}
 	else if (event == enames.start_map_ename) {
-		Py_INCREF(Py_None);
 		N_M1(PyList_Append(gen->path, Py_None));
 	}
 
+	return prefix;
+}
+
+/*
+ * Finds the prefix of the target equal to the path of the event (or NULL),
+ * keeping the stack of path matches up to date. No path is ever built.
+ */
+static int parse_basecoro_match(ParseBasecoro *gen, PyObject *event, PyObject *value, PyObject **prefix)
+{
+	prefix_matcher_t *matcher = &gen->matcher;
+	Py_ssize_t nmatches = gen->matches_used;
+	enames_t enames = gen->module_state->enames;
+
+	pm_state match;
+	if (event == enames.end_array_ename || event == enames.end_map_ename) {
+		nmatches = --gen->matches_used;
+		match = gen->matches[nmatches - 1];
+	}
+	else if (event == enames.map_key_ename) {
+		pm_state map_match = gen->matches[nmatches - 2];
+		Py_ssize_t len;
+		const char *key;
+		M1_N(key = PyUnicode_AsUTF8AndSize(value, &len));
+		gen->matches[nmatches - 1] = _pm_relevance(matcher, map_match, nmatches > 2, key, len);
+		match = map_match;
+	}
+	else {
+		match = gen->matches[nmatches - 1];
+	}
+
+	if (event == enames.start_array_ename) {
+		M1_M1(parse_basecoro_push_match(gen, _pm_relevance(matcher, match, match.matched > 0, "item", 4)));
+	}
+	else if (event == enames.start_map_ename) {
+		pm_state member = {PM_NONE, 0, 0};
+		M1_M1(parse_basecoro_push_match(gen, member));
+	}
+
+	*prefix = _pm_matched_prefix(matcher, match);
+	return 0;
+}
+
+PyObject* parse_basecoro_send_impl(PyObject *self, PyObject *event, PyObject *value)
+{
+	ParseBasecoro *gen = (ParseBasecoro *)self;
+
+	PyObject *prefix = NULL;
+	if (gen->mode == PATHS_STRINGS) {
+		N_N(prefix = parse_basecoro_path(gen, event, value));
+	}
+	else if (gen->mode == PATHS_MATCH) {
+		N_M1(parse_basecoro_match(gen, event, value, &prefix));
+	}
+
+	PyObject *res;
 	if (KVItemsBasecoro_Check(gen->target_send)) {
-		kvitems_basecoro_send_impl(gen->target_send, prefix, event, value);
+		N_N(res = kvitems_basecoro_send_impl(gen->target_send, prefix, event, value));
+		Py_DECREF(res);
 	}
 	else if (ItemsBasecoro_Check(gen->target_send)) {
-		items_basecoro_send_impl(gen->target_send, prefix, event, value);
+		N_N(res = items_basecoro_send_impl(gen->target_send, prefix, event, value));
+		Py_DECREF(res);
+		if (gen->mode == PATHS_MATCH && items_basecoro_rejected(gen->target_send)) {
+			prefix_matcher_skip_rest(&gen->matcher);
+		}
+	}
+	else if (ColumnsBasecoro_Check(gen->target_send)) {
+		N_N(res = columns_basecoro_send_impl(gen->target_send, prefix, event, value));
+		Py_DECREF(res);
 	}
 	else {
-		PyObject *res;
 		N_N(res = PyTuple_Pack(3, prefix, event, value));
 		CORO_SEND(gen->target_send, res);
 		Py_DECREF(res);
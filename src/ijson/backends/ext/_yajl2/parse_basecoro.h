@@ -15,6 +15,19 @@
 #include <Python.h>
 
 #include "module_state.h"
+#include "prefix_matcher.h"
+
+/**
+ * How parse_basecoro keeps track of the path of events
+ */
+typedef enum _path_mode {
+	/* paths are built as strings for the target */
+	PATHS_STRINGS,
+	/* paths are matched against the prefixes of an items/kvitems target */
+	PATHS_MATCH,
+	/* paths are not needed by the target */
+	PATHS_NONE,
+} path_mode;
 
 /**
  * parse_basecoro coroutine object structure
@@ -24,6 +37,11 @@ typedef struct {
     PyObject *target_send;
     PyObject *path;
     yajl2_state *module_state;
+    prefix_matcher_t matcher;
+    path_mode mode;
+    pm_state *matches;
+    Py_ssize_t matches_size;
+    Py_ssize_t matches_used;
 } ParseBasecoro;
 
 /**
@@ -0,0 +1,136 @@
+/*
+ * parser object implementation for ijson's C backend
+ */
+
+#include "common.h"
+#include "parser.h"
+
+/*
+ * Builds a new coroutine pipeline for the parser
+ */
+static int parser_build(Parser *self)
+{
+	PyObject *coro;
+	M1_N(coro = PyObject_CallFunctionObjArgs(self->factory, self->results, NULL));
+	if (!BasicParseBasecoro_Check(coro)) {
+		PyErr_SetString(PyExc_TypeError, "factory must return a basic_parse_basecoro");
+		Py_DECREF(coro);
+		return -1;
+	}
+	Py_XSETREF(self->coro, (BasicParseBasecoro *)coro);
+	self->closed = 0;
+	self->clean = 0;
+	return 0;
+}
+
+/*
+ * Returns the results accumulated so far, and forgets about them
+ */
+static PyObject *parser_take_results(Parser *self)
+{
+	Py_ssize_t n = PyList_GET_SIZE(self->results);
+	PyObject *results;
+	N_N(results = PyList_GetSlice(self->results, 0, n));
+	if (PyList_SetSlice(self->results, 0, n, NULL) == -1) {
+		Py_DECREF(results);
+		return NULL;
+	}
+	return results;
+}
+
+/*
+ * __init__ and destructor
+ */
+static int parser_init(Parser *self, PyObject *args, PyObject *kwargs)
+{
+	PyObject *factory = NULL;
+	PyObject *results = NULL;
+	char *kwlist[] = {"factory", "results", NULL};
+	M1_Z(PyArg_ParseTupleAndKeywords(args, kwargs, "OO!", kwlist, &factory, &PyList_Type, &results));
+	Py_INCREF(factory);
+	Py_XSETREF(self->factory, factory);
+	Py_INCREF(results);
+	Py_XSETREF(self->results, results);
+	return parser_build(self);
+}
+
+static void parser_dealloc(Parser *self)
+{
+	Py_XDECREF(self->factory);
+	Py_XDECREF(self->results);
+	Py_XDECREF(self->coro);
+	Py_TYPE(self)->tp_free((PyObject*)self);
+}
+
+/*
+ * feed, close and reset
+ */
+static PyObject* parser_feed(PyObject *self, PyObject *arg)
+{
+	Parser *parser = (Parser *)self;
+	if (parser->closed) {
+		PyErr_SetString(PyExc_ValueError, "parser is closed");
+		return NULL;
+	}
+	Py_buffer bufview;
+	N_M1(PyObject_GetBuffer(arg, &bufview, PyBUF_SIMPLE));
+	PyObject *ret = Py_None;
+	if (bufview.len) {
+		ret = ijson_yajl_parse(parser->coro, bufview.buf, bufview.len);
+	}
+	PyBuffer_Release(&bufview);
+	if (!ret) {
+		parser->closed = 1;
+		return NULL;
+	}
+	return parser_take_results(parser);
+}
+
+static PyObject* parser_close(PyObject *self, PyObject *args)
+{
+	Parser *parser = (Parser *)self;
+	if (!parser->closed) {
+		parser->closed = 1;
+		N_N(ijson_yajl_parse(parser->coro, NULL, 0));
+		parser->clean = 1;
+	}
+	return parser_take_results(parser);
+}
+
+static PyObject* parser_reset(PyObject *self, PyObject *args)
+{
+	Parser *parser = (Parser *)self;
+	N_M1(PyList_SetSlice(parser->results, 0, PyList_GET_SIZE(parser->results), NULL));
+	// After a whole document has been parsed the pipeline is back in its
+	// initial state, and only YAJL needs to start over
+	if (parser->clean) {
+		N_M1(ijson_yajl_reset(parser->coro));
+		parser->closed = 0;
+		parser->clean = 0;
+	}
+	else {
+		N_M1(parser_build(parser));
+	}
+	Py_RETURN_NONE;
+}
+
+static PyMethodDef parser_methods[] = {
+	{"feed", parser_feed, METH_O, "Parses a chunk of data, returning the results found in it"},
+	{"close", parser_close, METH_NOARGS, "Finishes parsing, returning the last results"},
+	{"reset", parser_reset, METH_NOARGS, "Prepares the parser to parse a new document"},
+	{NULL, NULL, 0, NULL}
+};
+
+/*
+ * parser object type
+ */
+PyTypeObject Parser_Type = {
+	PyVarObject_HEAD_INIT(NULL, 0)
+	.tp_basicsize = sizeof(Parser),
+	.tp_name = "_yajl2.parser",
+	.tp_doc = "Push parser, fed with chunks of data",
+	.tp_init = (initproc)parser_init,
+	.tp_dealloc = (destructor)parser_dealloc,
+	.tp_flags = Py_TPFLAGS_DEFAULT | Py_TPFLAGS_BASETYPE,
+	.tp_methods = parser_methods
+};
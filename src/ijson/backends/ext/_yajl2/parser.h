@@ -0,0 +1,35 @@
+/*
+ * parser object for ijson's C backend
+ */
+
+#ifndef PARSER_H
+#define PARSER_H
+
+#define PY_SSIZE_T_CLEAN
+#include <Python.h>
+
+#include "basic_parse_basecoro.h"
+
+/**
+ * parser object structure
+ *
+ * A push parser, fed with chunks of data, returning the results found in
+ * each. The coroutine pipeline doing the actual work is built by calling
+ * a factory with the list the results are sent to.
+ */
+typedef struct {
+	PyObject_HEAD
+	PyObject *factory;
+	PyObject *results;
+	BasicParseBasecoro *coro;
+	int closed;
+	int clean;
+} Parser;
+
+
+/**
+ * parser object type
+ */
+extern PyTypeObject Parser_Type;
+
+#endif /* PARSER_H */
@@ -0,0 +1,226 @@
+/*
+ * predicate_t type and associated methods
+ */
+
+#ifndef PREDICATE_H
+#define PREDICATE_H
+
+#include <string.h>
+
+#define PY_SSIZE_T_CLEAN
+#include <Python.h>
+
+#include "common.h"
+#include "event_names.h"
+#include "prefix_matcher.h"
+
+/*
+ * Operator codes. Comparisons use the codes of Python's rich comparisons,
+ * as in ijson.common._WHERE_OPERATORS
+ */
+#define PREDICATE_IN 6
+
+/**
+ * predicate_t structure.
+ *
+ * Evaluates a where predicate, as compiled by ijson.common._compile_where
+ * (a tuple of (path, conditions) pairs), on the events of a value as they
+ * are found. The fields of the predicate are followed with a prefix matcher,
+ * and the value is rejected as soon as one of them doesn't satisfy its
+ * conditions.
+ */
+typedef struct _predicate {
+	PyObject *paths;
+	PyObject *conditions;
+	prefix_matcher_t matcher;
+	char *seen;
+	Py_ssize_t n_seen;
+	int rejected;
+} predicate_t;
+
+/**
+ * Initializes an empty predicate which can be safely destroyed.
+ *
+ * @param predicate the predicate to empty-initialize
+ */
+static inline
+void predicate_create(predicate_t *predicate)
+{
+	memset(predicate, 0, sizeof(predicate_t));
+	prefix_matcher_create(&predicate->matcher);
+}
+
+static inline
+int _predicate_invalid(void)
+{
+	PyErr_SetString(PyExc_ValueError, "Invalid where predicate");
+	return -1;
+}
+
+/* Checks that the conditions of a field are (code, operand) pairs */
+static inline
+int _predicate_check_conditions(PyObject *conditions)
+{
+	if (!PyTuple_Check(conditions)) {
+		return _predicate_invalid();
+	}
+	for (Py_ssize_t i = 0; i != PyTuple_GET_SIZE(conditions); i++) {
+		PyObject *condition = PyTuple_GET_ITEM(conditions, i);
+		if (!PyTuple_Check(condition) || PyTuple_GET_SIZE(condition) != 2) {
+			return _predicate_invalid();
+		}
+		long code = PyLong_AsLong(PyTuple_GET_ITEM(condition, 0));
+		if (code == -1 && PyErr_Occurred()) {
+			return -1;
+		}
+		if (code < Py_LT || code > PREDICATE_IN) {
+			return _predicate_invalid();
+		}
+	}
+	return 0;
+}
+
+/**
+ * Initializes a predicate.
+ *
+ * @param predicate the predicate to initialize
+ * @param where a compiled where predicate
+ * @return 0 if successful, -1 in case of an error
+ */
+static inline
+int predicate_init(predicate_t *predicate, PyObject *where)
+{
+	if (!PyTuple_Check(where)) {
+		return _predicate_invalid();
+	}
+	Py_ssize_t n = PyTuple_GET_SIZE(where);
+	M1_N(predicate->paths = PyTuple_New(n));
+	M1_N(predicate->conditions = PyTuple_New(n));
+	for (Py_ssize_t i = 0; i != n; i++) {
+		PyObject *path, *conditions;
+		M1_Z(PyArg_ParseTuple(PyTuple_GET_ITEM(where, i), "UO", &path, &conditions));
+		M1_M1(_predicate_check_conditions(conditions));
+		Py_INCREF(path);
+		PyTuple_SET_ITEM(predicate->paths, i, path);
+		Py_INCREF(conditions);
+		PyTuple_SET_ITEM(predicate->conditions, i, conditions);
+	}
+	if (n && !(predicate->seen = PyMem_Calloc(n, 1))) {
+		PyErr_NoMemory();
+		return -1;
+	}
+	return prefix_matcher_init(&predicate->matcher, predicate->paths);
+}
+
+/**
+ * Destroys a predicate and all its associated contents
+ * @param predicate The predicate to destroy
+ */
+static inline
+void predicate_destroy(predicate_t *predicate)
+{
+	prefix_matcher_destroy(&predicate->matcher);
+	Py_XDECREF(predicate->paths);
+	Py_XDECREF(predicate->conditions);
+	PyMem_Free(predicate->seen);
+}
+
+/**
+ * Whether the predicate has been initialized
+ */
+#define predicate_isactive(predicate) ((predicate)->paths != NULL)
+
+/* Whether a scalar satisfies the given conditions */
+static inline
+int _predicate_holds(PyObject *conditions, PyObject *value)
+{
+	for (Py_ssize_t i = 0; i != PyTuple_GET_SIZE(conditions); i++) {
+		PyObject *condition = PyTuple_GET_ITEM(conditions, i);
+		int code = (int)PyLong_AsLong(PyTuple_GET_ITEM(condition, 0));
+		PyObject *operand = PyTuple_GET_ITEM(condition, 1);
+		int holds;
+		if (code == PREDICATE_IN) {
+			holds = PySequence_Contains(operand, value);
+		}
+		else {
+			holds = PyObject_RichCompareBool(value, operand, code);
+		}
+		// values that can't be compared don't satisfy the condition
+		if (holds == -1 && PyErr_ExceptionMatches(PyExc_TypeError)) {
+			PyErr_Clear();
+			holds = 0;
+		}
+		if (holds != 1) {
+			return holds;
+		}
+	}
+	return 1;
+}
+
+/**
+ * Follows an event of the value the predicate is evaluated on.
+ *
+ * @param predicate A predicate
+ * @param enames The module-internal event names
+ * @param event The event name
+ * @param value The event value
+ * @return 1 if the value is not rejected (yet), 0 if it is, -1 in case of an
+ * error
+ */
+static inline
+int predicate_event(predicate_t *predicate, enames_t *enames, PyObject *event, PyObject *value)
+{
+	if (predicate->rejected) {
+		return 0;
+	}
+	M1_M1(prefix_matcher_event(&predicate->matcher, enames, event, value));
+	PyObject *path = predicate->matcher.matched;
+	if (!path) {
+		return 1;
+	}
+	Py_ssize_t index = 0;
+	while (PyTuple_GET_ITEM(predicate->paths, index) != path) {
+		index++;
+	}
+	// only scalars satisfy conditions
+	int holds = 0;
+	if (event != enames->start_map_ename && event != enames->start_array_ename) {
+		M1_M1(holds = _predicate_holds(PyTuple_GET_ITEM(predicate->conditions, index), value));
+	}
+	if (!holds) {
+		predicate->rejected = 1;
+		return 0;
+	}
+	if (!predicate->seen[index]) {
+		predicate->seen[index] = 1;
+		predicate->n_seen++;
+	}
+	return 1;
+}
+
+/**
+ * Starts evaluating the predicate on the value starting with the given event.
+ *
+ * @return 1 if the value is not rejected (yet), 0 if it is, -1 in case of an
+ * error
+ */
+static inline
+int predicate_start(predicate_t *predicate, enames_t *enames, PyObject *event, PyObject *value)
+{
+	prefix_matcher_reset(&predicate->matcher);
+	if (predicate->seen) {
+		memset(predicate->seen, 0, PyTuple_GET_SIZE(predicate->paths));
+	}
+	predicate->n_seen = 0;
+	predicate->rejected = 0;
+	return predicate_event(predicate, enames, event, value);
+}
+
+/**
+ * Whether the value the predicate was evaluated on (once finished) satisfied
+ * all its conditions.
+ */
+#define predicate_accepted(predicate) \
+	(!(predicate)->rejected && (predicate)->n_seen == PyTuple_GET_SIZE((predicate)->paths))
+
+#endif /* PREDICATE_H */
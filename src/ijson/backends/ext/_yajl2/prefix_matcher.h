@@ -0,0 +1,479 @@
+/*
+ * prefix_matcher_t type and associated methods
+ */
+
+#ifndef PREFIX_MATCHER_H
+#define PREFIX_MATCHER_H
+
+#include <stdlib.h>
+#include <string.h>
+
+#define PY_SSIZE_T_CLEAN
+#include <Python.h>
+
+#include "common.h"
+#include "event_names.h"
+
+/*
+ * Relevance of a value for the prefixes being matched: either none of them,
+ * the value is the object for one of them, or its path is a strict ancestor
+ * of some of them, in which case `matched` indicates how many bytes of
+ * the prefixes in the [lo, hi) range it matches.
+ */
+#define PM_NONE -1
+#define PM_FULL -2
+
+typedef struct _pm_state {
+	Py_ssize_t matched;
+	Py_ssize_t lo;
+	Py_ssize_t hi;
+} pm_state;
+
+typedef struct _pm_container {
+	int is_map;
+	int sep;
+	pm_state state;
+} pm_container;
+
+typedef struct _pm_prefix {
+	char *bytes;
+	Py_ssize_t len;
+	PyObject *object;
+} pm_prefix;
+
+/**
+ * prefix_matcher_t structure.
+ *
+ * Follows the structure of the document being parsed (at the basic_parse
+ * level) and decides which events can possibly influence the results of an
+ * items/kvitems coroutine looking for a set of prefixes. Events for values
+ * whose path can never be, or lead to, any of the prefixes are reported as
+ * unwanted, so their Python values need not be created at all.
+ *
+ * Paths are matched against the UTF-8 representation of the prefixes
+ * following the same rules used by parse_basecoro to calculate them.
+ * Prefixes are kept sorted, so the ones still matching the current path
+ * always form a contiguous range.
+ *
+ * A matcher can optionally have a projection: another matcher following the
+ * values found under the prefixes (as if they were top-level values), so only
+ * the members leading to, or under, a set of fields are wanted.
+ */
+typedef struct _prefix_matcher {
+	int enabled;
+	struct _prefix_matcher *projection;
+	pm_prefix *prefixes;
+	Py_ssize_t n_prefixes;
+	pm_container *stack;
+	Py_ssize_t stack_size;
+	Py_ssize_t stack_used;
+	pm_state next_member;
+	Py_ssize_t skip_depth;
+	Py_ssize_t full_depth;
+	Py_ssize_t skip_rest_depth;
+	PyObject *matched;
+} prefix_matcher_t;
+
+/**
+ * Initializes a disabled prefix matcher which can be safely destroyed.
+ *
+ * @param matcher the matcher to empty-initialize
+ */
+static inline
+void prefix_matcher_create(prefix_matcher_t *matcher)
+{
+	memset(matcher, 0, sizeof(prefix_matcher_t));
+}
+
+static inline
+int _pm_prefix_cmp(const void *a, const void *b)
+{
+	const pm_prefix *pa = a, *pb = b;
+	Py_ssize_t len = pa->len < pb->len ? pa->len : pb->len;
+	int cmp = memcmp(pa->bytes, pb->bytes, len);
+	if (cmp != 0) {
+		return cmp;
+	}
+	return (pa->len > pb->len) - (pa->len < pb->len);
+}
+
+/**
+ * Initializes a prefix matcher for the given prefixes. If any of the prefixes
+ * is not a string the matcher is left disabled, so all events are wanted.
+ *
+ * @param matcher the matcher to initialize
+ * @param prefixes a tuple with the prefixes to match, which must outlive the
+ * matcher
+ * @return 0 if successful, -1 in case of an error
+ */
+static inline
+int prefix_matcher_init(prefix_matcher_t *matcher, PyObject *prefixes)
+{
+	Py_ssize_t n = PyTuple_GET_SIZE(prefixes);
+	for (Py_ssize_t i = 0; i != n; i++) {
+		if (!PyUnicode_Check(PyTuple_GET_ITEM(prefixes, i))) {
+			return 0;
+		}
+	}
+	if (n && !(matcher->prefixes = PyMem_Calloc(n, sizeof(pm_prefix)))) {
+		PyErr_NoMemory();
+		return -1;
+	}
+	for (Py_ssize_t i = 0; i != n; i++) {
+		Py_ssize_t len;
+		const char *utf8;
+		M1_N(utf8 = PyUnicode_AsUTF8AndSize(PyTuple_GET_ITEM(prefixes, i), &len));
+		if (!(matcher->prefixes[i].bytes = PyMem_Malloc(len + 1))) {
+			PyErr_NoMemory();
+			return -1;
+		}
+		memcpy(matcher->prefixes[i].bytes, utf8, len + 1);
+		matcher->prefixes[i].len = len;
+		matcher->prefixes[i].object = PyTuple_GET_ITEM(prefixes, i);
+		matcher->n_prefixes++;
+	}
+	qsort(matcher->prefixes, n, sizeof(pm_prefix), _pm_prefix_cmp);
+	matcher->enabled = 1;
+	return 0;
+}
+
+/**
+ * Destroys a prefix matcher and all its associated contents
+ * @param matcher The matcher to destroy
+ */
+static inline
+void prefix_matcher_destroy(prefix_matcher_t *matcher)
+{
+	for (Py_ssize_t i = 0; i != matcher->n_prefixes; i++) {
+		PyMem_Free(matcher->prefixes[i].bytes);
+	}
+	PyMem_Free(matcher->prefixes);
+	PyMem_Free(matcher->stack);
+	if (matcher->projection) {
+		prefix_matcher_destroy(matcher->projection);
+		PyMem_Free(matcher->projection);
+	}
+}
+
+/**
+ * Sets the projection of a prefix matcher, so only the given fields of the
+ * values under the prefixes (and the containers leading to them) are wanted.
+ *
+ * @param matcher the matcher whose projection is set
+ * @param fields a tuple with the fields to project as strings, which must
+ * outlive the matcher
+ * @return 0 if successful, -1 in case of an error
+ */
+static inline
+int prefix_matcher_project(prefix_matcher_t *matcher, PyObject *fields)
+{
+	if (!(matcher->projection = PyMem_Malloc(sizeof(prefix_matcher_t)))) {
+		PyErr_NoMemory();
+		return -1;
+	}
+	prefix_matcher_create(matcher->projection);
+	return prefix_matcher_init(matcher->projection, fields);
+}
+
+/**
+ * Converts a collection of fields into a tuple that can be used as the
+ * projection of a matcher.
+ *
+ * @param fields a collection of strings
+ * @param what the name of the fields, for error messages
+ * @return A new tuple with the fields, or NULL in case of an error
+ */
+static inline
+PyObject *prefix_matcher_fields(PyObject *fields, const char *what)
+{
+	if (PyUnicode_Check(fields) || PyBytes_Check(fields)) {
+		PyErr_Format(PyExc_TypeError, "%s must be a collection of strings, not a string", what);
+		return NULL;
+	}
+	PyObject *tuple;
+	N_N(tuple = PySequence_Tuple(fields));
+	for (Py_ssize_t i = 0; i != PyTuple_GET_SIZE(tuple); i++) {
+		if (!PyUnicode_Check(PyTuple_GET_ITEM(tuple, i))) {
+			PyErr_Format(PyExc_TypeError, "%s must be strings, not %R", what,
+			             Py_TYPE(PyTuple_GET_ITEM(tuple, i)));
+			Py_DECREF(tuple);
+			return NULL;
+		}
+	}
+	return tuple;
+}
+
+/**
+ * Resets a prefix matcher to start following a new top-level value.
+ *
+ * @param matcher the matcher to reset
+ */
+static inline
+void prefix_matcher_reset(prefix_matcher_t *matcher)
+{
+	matcher->stack_used = 0;
+	matcher->skip_depth = 0;
+	matcher->full_depth = 0;
+	matcher->skip_rest_depth = 0;
+}
+
+/**
+ * Notifies the matcher that the rest of the value currently found under one of
+ * the prefixes is not wanted, except for the events ending the containers
+ * that are already open.
+ *
+ * @param matcher the matcher
+ */
+static inline
+void prefix_matcher_skip_rest(prefix_matcher_t *matcher)
+{
+	matcher->skip_rest_depth = matcher->full_depth;
+}
+
+/* Narrows the [lo, hi) range down to the prefixes with byte c at pos */
+static inline
+void _pm_narrow(prefix_matcher_t *matcher, pm_state *state, Py_ssize_t pos, unsigned char c)
+{
+	pm_prefix *prefixes = matcher->prefixes;
+	while (state->lo < state->hi &&
+	       (prefixes[state->lo].len <= pos || (unsigned char)prefixes[state->lo].bytes[pos] < c)) {
+		state->lo++;
+	}
+	while (state->hi > state->lo &&
+	       (prefixes[state->hi - 1].len <= pos || (unsigned char)prefixes[state->hi - 1].bytes[pos] > c)) {
+		state->hi--;
+	}
+}
+
+/*
+ * Relevance of the path resulting from appending a component to the path
+ * of a container with the given state
+ */
+static inline
+pm_state _pm_relevance(prefix_matcher_t *matcher, pm_state parent, int sep,
+                       const char *component, size_t len)
+{
+	pm_state state = parent;
+	Py_ssize_t pos = parent.matched;
+	// paths under a prefix are not strict ancestors of any other
+	if (pos < 0) {
+		state.matched = PM_NONE;
+		return state;
+	}
+	if (sep) {
+		_pm_narrow(matcher, &state, pos++, '.');
+	}
+	for (size_t i = 0; i != len && state.lo != state.hi; i++) {
+		_pm_narrow(matcher, &state, pos++, component[i]);
+	}
+	state.matched = pos;
+	if (state.lo == state.hi) {
+		state.matched = PM_NONE;
+	}
+	// the shortest prefix sorts first, and encloses any others
+	else if (matcher->prefixes[state.lo].len == pos) {
+		state.matched = PM_FULL;
+	}
+	// empty paths are extended without a separator by arrays
+	else if (pos != 0) {
+		_pm_narrow(matcher, &state, pos, '.');
+		if (state.lo == state.hi) {
+			state.matched = PM_NONE;
+		}
+	}
+	return state;
+}
+
+/* Relevance of the empty path of top-level values */
+static inline
+pm_state _pm_root(prefix_matcher_t *matcher)
+{
+	pm_state state = {0, 0, matcher->n_prefixes};
+	if (matcher->n_prefixes == 0) {
+		state.matched = PM_NONE;
+	}
+	else if (matcher->prefixes[0].len == 0) {
+		state.matched = PM_FULL;
+	}
+	return state;
+}
+
+/*
+ * The prefix equal to the path with the given relevance, or NULL if there is
+ * no such prefix
+ */
+static inline
+PyObject *_pm_matched_prefix(prefix_matcher_t *matcher, pm_state state)
+{
+	return state.matched == PM_FULL ? matcher->prefixes[state.lo].object : NULL;
+}
+
+static inline
+int _pm_push(prefix_matcher_t *matcher, int is_map, pm_state state)
+{
+	if (matcher->stack_used == matcher->stack_size) {
+		Py_ssize_t new_size = matcher->stack_size ? matcher->stack_size * 2 : 8;
+		pm_container *stack = PyMem_Realloc(matcher->stack, new_size * sizeof(pm_container));
+		if (!stack) {
+			PyErr_NoMemory();
+			return -1;
+		}
+		matcher->stack = stack;
+		matcher->stack_size = new_size;
+	}
+	pm_container *container = &matcher->stack[matcher->stack_used++];
+	container->is_map = is_map;
+	container->state = state;
+	// maps nested in other values and arrays under a non-empty path
+	// separate their children paths with a dot
+	container->sep = is_map ? matcher->stack_used > 1 : state.matched > 0;
+	return 0;
+}
+
+/**
+ * Notifies the matcher that a new value (a scalar, or the start of a map or
+ * array) has been found.
+ *
+ * @param matcher A matcher
+ * @param is_container Whether the value is a map (1), an array (2) or a scalar (0)
+ * @return 1 if the event is wanted, 0 if not, -1 in case of an error
+ */
+static inline
+int prefix_matcher_value(prefix_matcher_t *matcher, int is_container)
+{
+	if (matcher->full_depth) {
+		matcher->full_depth += (is_container != 0);
+		if (matcher->skip_rest_depth) {
+			return 0;
+		}
+		return matcher->projection ? prefix_matcher_value(matcher->projection, is_container) : 1;
+	}
+	if (matcher->skip_depth) {
+		matcher->skip_depth += (is_container != 0);
+		return 0;
+	}
+
+	pm_state relevance;
+	if (matcher->stack_used == 0) {
+		relevance = _pm_root(matcher);
+	}
+	else {
+		pm_container *parent = &matcher->stack[matcher->stack_used - 1];
+		if (parent->is_map) {
+			relevance = matcher->next_member;
+		}
+		else {
+			relevance = _pm_relevance(matcher, parent->state, parent->sep, "item", 4);
+		}
+	}
+
+	if (relevance.matched == PM_FULL) {
+		matcher->full_depth = (is_container != 0);
+		matcher->matched = _pm_matched_prefix(matcher, relevance);
+		// the value itself is wanted even if none of its members are
+		if (matcher->projection && is_container) {
+			prefix_matcher_reset(matcher->projection);
+			M1_M1(prefix_matcher_value(matcher->projection, is_container));
+		}
+		return 1;
+	}
+	else if (relevance.matched == PM_NONE) {
+		matcher->skip_depth = (is_container != 0);
+		return 0;
+	}
+	else if (is_container) {
+		if (_pm_push(matcher, is_container == 1, relevance) == -1) {
+			return -1;
+		}
+		return 1;
+	}
+	// scalars at a strict ancestor of the prefixes can't be matched
+	return 0;
+}
+
+/**
+ * Notifies the matcher that a new map key has been found.
+ *
+ * @param matcher A matcher
+ * @param key The UTF-8 bytes of the key
+ * @param len The length of the key
+ * @return 1 if the event is wanted, 0 if not
+ */
+static inline
+int prefix_matcher_map_key(prefix_matcher_t *matcher, const char *key, size_t len)
+{
+	if (matcher->full_depth) {
+		if (matcher->skip_rest_depth) {
+			return 0;
+		}
+		return matcher->projection ? prefix_matcher_map_key(matcher->projection, key, len) : 1;
+	}
+	if (matcher->skip_depth) {
+		return 0;
+	}
+	pm_container *map = &matcher->stack[matcher->stack_used - 1];
+	matcher->next_member = _pm_relevance(matcher, map->state, map->sep, key, len);
+	return matcher->next_member.matched != PM_NONE;
+}
+
+/**
+ * Notifies the matcher that a map or array has finished.
+ *
+ * @param matcher A matcher
+ * @return 1 if the event is wanted, 0 if not
+ */
+static inline
+int prefix_matcher_end(prefix_matcher_t *matcher)
+{
+	if (matcher->full_depth) {
+		matcher->full_depth--;
+		if (matcher->skip_rest_depth) {
+			if (matcher->full_depth >= matcher->skip_rest_depth) {
+				return 0;
+			}
+			matcher->skip_rest_depth = matcher->full_depth;
+			return 1;
+		}
+		if (matcher->projection) {
+			return prefix_matcher_end(matcher->projection) || matcher->full_depth == 0;
+		}
+		return 1;
+	}
+	if (matcher->skip_depth) {
+		matcher->skip_depth--;
+		return 0;
+	}
+	matcher->stack_used--;
+	return 1;
+}
+
+/**
+ * Notifies the matcher of a parse event, for matchers following already
+ * parsed events rather than the YAJL callbacks. If the event is a value found
+ * at one of the prefixes, the prefix is left in the matcher's `matched`
+ * member (which is NULL otherwise).
+ *
+ * @param matcher A matcher
+ * @param enames The module-internal event names
+ * @param event The event name
+ * @param value The event value
+ * @return 1 if the event is wanted, 0 if not, -1 in case of an error
+ */
+static inline
+int prefix_matcher_event(prefix_matcher_t *matcher, enames_t *enames, PyObject *event, PyObject *value)
+{
+	matcher->matched = NULL;
+	if (event == enames->map_key_ename) {
+		Py_ssize_t len;
+		const char *key;
+		M1_N(key = PyUnicode_AsUTF8AndSize(value, &len));
+		return prefix_matcher_map_key(matcher, key, len);
+	}
+	else if (event == enames->end_map_ename || event == enames->end_array_ename) {
+		return prefix_matcher_end(matcher);
+	}
+	int is_container = event == enames->start_map_ename ? 1 : event == enames->start_array_ename ? 2 : 0;
+	return prefix_matcher_value(matcher, is_container);
+}
+
+#endif /* PREFIX_MATCHER_H */
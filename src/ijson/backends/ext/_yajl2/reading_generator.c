@@ -19,22 +19,50 @@ int reading_generator_init(reading_generator_t *self, PyObject *args, pipeline_n
 {
 	PyObject *file;
 	Py_ssize_t buf_size = 64 * 1024;
-	M1_Z(PyArg_ParseTuple(args, "On", &file, &buf_size));
+	int depths = 0;
+	self->batched = 0;
+	self->columnar = 0;
+	event_columns_create(&self->columns);
+	M1_Z(PyArg_ParseTuple(args, "On|ppp", &file, &buf_size, &self->batched, &self->columnar, &depths));
 
-	// Handle both "read" and "readinto" functions.
+	// Objects exposing their memory (e.g., mmaps) are parsed in place,
+	// starting at their current position if they have one.
+	// Otherwise handle both "read" and "readinto" functions, or pull chunks
+	// from an iterable if there are none.
 	// The latter allocates a bytearray, which is how we distinguish between
 	// the two cases later
-	if (PyObject_HasAttrString(file, "readinto")) {
+	self->view.obj = NULL;
+	self->read_func = NULL;
+	self->buf_size = NULL;
+	self->buffer = NULL;
+	self->chunks = NULL;
+	self->in_place = PyObject_CheckBuffer(file);
+	if (self->in_place) {
+		M1_M1(PyObject_GetBuffer(file, &self->view, PyBUF_SIMPLE));
+		self->view_chunk = buf_size;
+		self->view_pos = 0;
+		if (PyObject_HasAttrString(file, "tell")) {
+			PyObject *ppos;
+			M1_N(ppos = PyObject_CallMethod(file, "tell", NULL));
+			self->view_pos = PyLong_AsSsize_t(ppos);
+			Py_DECREF(ppos);
+			M1_M1(self->view_pos);
+			self->view_pos = Py_MIN(self->view_pos, self->view.len);
+		}
+	}
+	else if (PyObject_HasAttrString(file, "readinto")) {
 		M1_N(self->read_func = PyObject_GetAttrString(file, "readinto"));
 		PyObject *pbuf_size = Py_BuildValue("n", buf_size);
 		self->buffer = PyObject_CallFunctionObjArgs((PyObject *)&PyByteArray_Type, pbuf_size, NULL);
 		M1_N(self->buffer);
 		Py_DECREF(pbuf_size);
 	}
-	else {
+	else if (PyObject_HasAttrString(file, "read")) {
 		M1_N(self->read_func = PyObject_GetAttrString(file, "read"));
-		self->buf_size = PyLong_FromSsize_t(buf_size);
-		self->buffer = NULL;
+		M1_N(self->buf_size = PyLong_FromSsize_t(buf_size));
+	}
+	else {
+		M1_N(self->chunks = PyObject_GetIter(file));
 	}
 
 	M1_N(self->events = PyList_New(0));
@@ -43,6 +71,10 @@ int reading_generator_init(reading_generator_t *self, PyObject *args, pipeline_n
 	M1_N(self->coro = chain(self->events, coro_pipeline));
 	assert(("reading_generator works only with basic_parse_basecoro",
 	        BasicParseBasecoro_Check(self->coro)));
+	if (self->columnar) {
+		M1_M1(event_columns_init(&self->columns, depths));
+		((BasicParseBasecoro *)self->coro)->ctx.columns = &self->columns;
+	}
 	return 0;
 }
 
@@ -55,11 +87,16 @@ void reading_generator_dealloc(reading_generator_t *self)
 	Py_XDECREF(self->exc.value);
 	Py_XDECREF(self->exc.traceback);
 #endif
+	if (self->view.obj) {
+		PyBuffer_Release(&self->view);
+	}
 	Py_XDECREF(self->read_func);
 	Py_XDECREF(self->events);
 	Py_XDECREF(self->buffer);
+	Py_XDECREF(self->chunks);
 	Py_XDECREF(self->buf_size);
 	Py_XDECREF(self->coro);
+	event_columns_destroy(&self->columns);
 }
 
 static void reading_generator_catch_exception(reading_generator_t *self)
@@ -95,21 +132,78 @@ static void reading_generator_set_exception(reading_generator_t *self)
 #endif
 }
 
-PyObject *reading_generator_next(reading_generator_t *self)
+/* Returns the number of events parsed but not yet returned */
+static Py_ssize_t reading_generator_pending(reading_generator_t *self)
 {
-	PyObject *events = self->events;
-	Py_ssize_t nevents = PyList_Size(events);
+	if (self->columnar) {
+		return event_columns_size(&self->columns);
+	}
+	return PyList_Size(self->events);
+}
+
+/*
+ * Reads and parses data until some events are available, or no more data can
+ * be read. Returns the number of events available, or -1 in case of an error.
+ */
+static Py_ssize_t reading_generator_fill(reading_generator_t *self)
+{
+	Py_ssize_t nevents = reading_generator_pending(self);
 	BasicParseBasecoro *basic_parse_basecoro = (BasicParseBasecoro *)self->coro;
 	while (nevents == 0 && !reading_generator_exception_caught(self)) {
 
 		/* Read data and pass it down to the co-routine */
 		Py_buffer view;
 		Py_ssize_t length;
-		if (self->buffer == NULL) {
+		if (self->in_place) {
+			// parse directly out of the object's memory, which is released
+			// as soon as the document is parsed (e.g., so mmaps can be closed)
+			if (!self->view.obj) {
+				break;
+			}
+			length = Py_MIN(self->view_chunk, self->view.len - self->view_pos);
+			PyObject *send_res = ijson_yajl_parse(basic_parse_basecoro, (char *)self->view.buf + self->view_pos, length);
+			self->view_pos += length;
+			if (!send_res) {
+				reading_generator_catch_exception(self);
+			}
+			if (!send_res || length == 0) {
+				PyBuffer_Release(&self->view);
+			}
+		}
+		else if (self->chunks) {
+			// the document ends when the iterable is exhausted,
+			// empty chunks in the middle are skipped
+			PyObject *chunk = PyIter_Next(self->chunks);
+			if (!chunk && PyErr_Occurred()) {
+				return -1;
+			}
+			else if (!chunk) {
+				length = 0;
+				if (!ijson_yajl_parse(basic_parse_basecoro, NULL, 0)) {
+					reading_generator_catch_exception(self);
+				}
+			}
+			else {
+				int res = PyObject_GetBuffer(chunk, &view, PyBUF_SIMPLE);
+				Py_DECREF(chunk);
+				M1_M1(res);
+				length = view.len;
+				if (length == 0) {
+					PyBuffer_Release(&view);
+					continue;
+				}
+				PyObject *send_res = ijson_yajl_parse(basic_parse_basecoro, view.buf, length);
+				PyBuffer_Release(&view);
+				if (!send_res) {
+					reading_generator_catch_exception(self);
+				}
+			}
+		}
+		else if (self->buffer == NULL) {
 			// read_func is "read"
 			PyObject *pbuffer = PyObject_CallFunctionObjArgs(self->read_func, self->buf_size, NULL);
-			N_N(pbuffer);
-			N_M1(PyObject_GetBuffer(pbuffer, &view, PyBUF_SIMPLE));
+			M1_N(pbuffer);
+			M1_M1(PyObject_GetBuffer(pbuffer, &view, PyBUF_SIMPLE));
 			length = view.len;
 			PyObject *send_res = ijson_yajl_parse(basic_parse_basecoro, view.buf, view.len);
 			Py_DECREF(pbuffer);
@@ -121,26 +215,43 @@ PyObject *reading_generator_next(reading_generator_t *self)
 		else {
 			// read_func is "readinto"
 			PyObject *plength = PyObject_CallFunctionObjArgs(self->read_func, self->buffer, NULL);
-			N_N(plength);
+			M1_N(plength);
 			length = PyLong_AsLong(plength);
-			N_M1(length);
+			M1_M1(length);
 			Py_DECREF(plength);
-			N_M1(PyObject_GetBuffer(self->buffer, &view, PyBUF_SIMPLE));
+			M1_M1(PyObject_GetBuffer(self->buffer, &view, PyBUF_SIMPLE));
 			PyObject *send_res = ijson_yajl_parse(basic_parse_basecoro, view.buf, length);
 			PyBuffer_Release(&view);
 			if (!send_res) {
 				reading_generator_catch_exception(self);
 			}
 		}
-		nevents = PyList_Size(events);
+		nevents = reading_generator_pending(self);
 
 		if (length == 0) {
 			break;
 		}
 	}
+	return nevents;
+}
+
+PyObject *reading_generator_next(reading_generator_t *self)
+{
+	PyObject *events = self->events;
+	Py_ssize_t nevents = reading_generator_fill(self);
+	N_M1(nevents);
 
 	// events are now probably available
-	if (nevents > 0) {
+	if (nevents > 0 && self->columnar) {
+		return event_columns_export(&self->columns);
+	}
+	else if (nevents > 0 && self->batched) {
+		PyObject *batch;
+		N_N(batch = PyList_GetSlice(events, 0, nevents));
+		N_M1(PyList_SetSlice(events, 0, nevents, NULL));
+		return batch;
+	}
+	else if (nevents > 0) {
 		PyObject *val = PyList_GetItem(events, self->pos++);
 		Py_INCREF(val);
 
@@ -160,4 +271,4 @@ PyObject *reading_generator_next(reading_generator_t *self)
 	// no events, let's end the show
 	PyErr_SetNone(PyExc_StopIteration);
 	return NULL;
-}
\ No newline at end of file
+}
@@ -15,6 +15,7 @@
 #include <Python.h>
 
 #include "coro_utils.h"
+#include "event_columns.h"
 
 /**
  * reading_generator_t type definition
@@ -24,7 +25,12 @@ typedef struct _reading_generator {
     PyObject *read_func;
     PyObject *buf_size;
     PyObject *buffer;
+    PyObject *chunks;
     PyObject *events;
+    Py_buffer view;
+    Py_ssize_t view_pos;
+    Py_ssize_t view_chunk;
+    int in_place;
 #if PY_VERSION_HEX >= 0x030C0000
     PyObject *exc;
 #else
@@ -35,14 +41,23 @@ typedef struct _reading_generator {
    } exc;
 #endif
     Py_ssize_t pos;
+    int batched;
+    int columnar;
+    event_columns_t columns;
 } reading_generator_t;
 
 /**
  * Initialises a reading_generator_t object from the given arguments, which
- * should contain a file-like object and a buffer size (optional).
+ * should contain a file-like object (or an object supporting the buffer
+ * protocol, like an mmap, whose contents are then parsed directly out of its
+ * memory, or an iterable of bytes-like chunks, which are parsed as they are
+ * pulled from it), a buffer size, and optionally whether
+ * events should be returned in batches, whether batches should be in
+ * columnar form, and whether columns should include event depths.
  *
  * @param self A reading_generator_t object
- * @param args A tuple containing a file-like object and a buffer size (optional)
+ * @param args A tuple containing a file-like object, a buffer size and
+ *  the optional batched, columnar and depths flags
  * @param coro_pipeline A description of the coroutine pipeline to create internally
  *  in this reading generator, where data will be pushed to, and which will send
  *  events to the events list
@@ -61,7 +76,10 @@ void reading_generator_dealloc(reading_generator_t *self);
  * file-like object, feeding it into its coro, with results ending
  * up in self->events, from which they are returned.
  * @param self A reading_generator_t object
- * @return The next event generated from this iterative process
+ * @return The next event generated from this iterative process, or a list
+ *  with all the events generated out of the next chunk of data if this
+ *  generator returns events in batches, or a (codes, depths, values) tuple
+ *  with the same events if it returns them in columnar form
  */
 PyObject *reading_generator_next(reading_generator_t *self);
 
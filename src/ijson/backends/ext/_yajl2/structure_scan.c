@@ -0,0 +1,53 @@
+/*
+ * Structural scanning of JSON documents for ijson's C backend
+ */
+
+#include "common.h"
+#include "structure_scan.h"
+
+typedef struct _scan_state {
+	int in_string;
+	int escaped;
+	Py_ssize_t depth;
+} scan_state;
+
+static inline
+void scan_byte(scan_state *state, unsigned char c)
+{
+	if (state->in_string) {
+		if (state->escaped) {
+			state->escaped = 0;
+		}
+		else if (c == '\\') {
+			state->escaped = 1;
+		}
+		else if (c == '"') {
+			state->in_string = 0;
+		}
+		return;
+	}
+	switch (c) {
+	case '"': state->in_string = 1; break;
+	case '[': case '{': state->depth++; break;
+	case ']': case '}': state->depth--; break;
+	}
+}
+
+PyObject *ijson_scan_structure(PyObject *self, PyObject *buffer)
+{
+	Py_buffer view;
+	N_M1(PyObject_GetBuffer(buffer, &view, PyBUF_SIMPLE));
+	scan_state outside = {0, 0, 0};
+	scan_state inside = {1, 0, 0};
+	const unsigned char *data = view.buf;
+	Py_BEGIN_ALLOW_THREADS
+	for (Py_ssize_t i = 0; i != view.len; i++) {
+		scan_byte(&outside, data[i]);
+		scan_byte(&inside, data[i]);
+	}
+	Py_END_ALLOW_THREADS
+	PyBuffer_Release(&view);
+	return Py_BuildValue("((Nn)(Nn))",
+	                     PyBool_FromLong(outside.in_string), outside.depth,
+	                     PyBool_FromLong(inside.in_string), inside.depth);
+}
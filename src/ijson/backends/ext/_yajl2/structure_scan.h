@@ -0,0 +1,23 @@
+/*
+ * Structural scanning of JSON documents for ijson's C backend
+ */
+
+#ifndef STRUCTURE_SCAN_H
+#define STRUCTURE_SCAN_H
+
+#define PY_SSIZE_T_CLEAN
+#include <Python.h>
+
+/**
+ * Scans a chunk of a JSON document (any object supporting the buffer
+ * protocol) which doesn't start with an escaped character, speculating on
+ * whether it starts outside or inside a string.
+ *
+ * @return A new ((in_string, delta), (in_string, delta)) tuple with, for a
+ * chunk starting outside and inside a string respectively, whether the chunk
+ * ends inside a string, and how much the nesting depth changes across it; or
+ * NULL in case of an error
+ */
+PyObject *ijson_scan_structure(PyObject *self, PyObject *buffer);
+
+#endif /* STRUCTURE_SCAN_H */
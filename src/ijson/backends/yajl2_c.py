@@ -24,12 +24,25 @@ def basic_parse_gen(file, **kwargs):
     buf_size = _get_buf_size(kwargs)
     return _yajl2.basic_parse(f, buf_size, **kwargs)
 
+def basic_parse_batches_gen(file, **kwargs):
+    f = compat.bytes_reader(file)
+    buf_size = _get_buf_size(kwargs)
+    return _yajl2.basic_parse(f, buf_size, True, **kwargs)
+
+def basic_parse_columns_gen(file, depths=False, **kwargs):
+    f = compat.bytes_reader(file)
+    buf_size = _get_buf_size(kwargs)
+    return _yajl2.basic_parse(f, buf_size, False, True, depths, **kwargs)
+
 def basic_parse_async(file, **kwargs):
     buf_size = _get_buf_size(kwargs)
     return _yajl2.basic_parse_async(file, buf_size, **kwargs)
 
 @utils.coroutine
 def parse_basecoro(target, **kwargs):
+    # columns are built by feeding columns_basecoro directly
+    if isinstance(target, _yajl2.columns_basecoro):
+        return _yajl2.parse_basecoro(target, **kwargs)
     return _yajl2.parse_basecoro(target.send, **kwargs)
 
 def parse_gen(file, **kwargs):
@@ -37,34 +50,76 @@ def parse_gen(file, **kwargs):
     buf_size = _get_buf_size(kwargs)
     return _yajl2.parse(f, buf_size, **kwargs)
 
+def parse_batches_gen(file, **kwargs):
+    f = compat.bytes_reader(file)
+    buf_size = _get_buf_size(kwargs)
+    return _yajl2.parse(f, buf_size, True, **kwargs)
+
 def parse_async(file, **kwargs):
     buf_size = _get_buf_size(kwargs)
     return _yajl2.parse_async(file, buf_size, **kwargs)
 
 @utils.coroutine
-def kvitems_basecoro(target, prefix, map_type=None, **kwargs):
-    return _yajl2.kvitems_basecoro(target.send, prefix, map_type, **kwargs)
+def kvitems_basecoro(target, prefix, map_type=None, keys=None, **kwargs):
+    return _yajl2.kvitems_basecoro(target.send, prefix, map_type, keys, **kwargs)
 
-def kvitems_gen(file, prefix, map_type=None, **kwargs):
+def kvitems_gen(file, prefix, map_type=None, keys=None, **kwargs):
     f = compat.bytes_reader(file)
     buf_size = _get_buf_size(kwargs)
-    return _yajl2.kvitems(f, buf_size, prefix, map_type, **kwargs)
+    return _yajl2.kvitems(f, buf_size, prefix, map_type, keys, **kwargs)
 
-def kvitems_async(file, prefix, map_type=None, **kwargs):
+def kvitems_async(file, prefix, map_type=None, keys=None, batch=False, **kwargs):
     buf_size = _get_buf_size(kwargs)
-    return _yajl2.kvitems_async(file, buf_size, prefix, map_type, **kwargs)
+    return _yajl2.kvitems_async(file, buf_size, batch, prefix, map_type, keys, **kwargs)
+
+_get_automaton = lambda prefix, prefixes, wildcards: (
+    common._compile_wildcards(prefix, prefixes) if wildcards else None
+)
 
 @utils.coroutine
-def items_basecoro(target, prefix, map_type=None, **kwargs):
-    return _yajl2.items_basecoro(target.send, prefix, map_type, **kwargs)
+def items_basecoro(target, prefix, map_type=None, prefixes=None, wildcards=False, fields=None,
+                   where=None, **kwargs):
+    common._check_prefixes(prefix, prefixes)
+    automaton = _get_automaton(prefix, prefixes, wildcards)
+    where = common._compile_where(where)
+    return _yajl2.items_basecoro(target.send, prefix, map_type, prefixes, automaton, fields, where, **kwargs)
+
+def items_gen(file, prefix=None, map_type=None, prefixes=None, wildcards=False, fields=None,
+              where=None, **kwargs):
+    f = compat.bytes_reader(file)
+    buf_size = _get_buf_size(kwargs)
+    common._check_prefixes(prefix, prefixes)
+    automaton = _get_automaton(prefix, prefixes, wildcards)
+    where = common._compile_where(where)
+    return _yajl2.items(f, buf_size, prefix, map_type, prefixes, automaton, fields, where, **kwargs)
 
-def items_gen(file, prefix, map_type=None, **kwargs):
+def items_async(file, prefix=None, map_type=None, prefixes=None, wildcards=False, fields=None,
+                where=None, batch=False, **kwargs):
+    buf_size = _get_buf_size(kwargs)
+    common._check_prefixes(prefix, prefixes)
+    automaton = _get_automaton(prefix, prefixes, wildcards)
+    where = common._compile_where(where)
+    return _yajl2.items_async(file, buf_size, batch, prefix, map_type, prefixes, automaton, fields, where, **kwargs)
+
+@utils.coroutine
+def columns_basecoro(target, prefix, fields=None):
+    return _yajl2.columns_basecoro(target.send, prefix, fields)
+
+def numeric_items_gen(file, prefix, typecode, **kwargs):
     f = compat.bytes_reader(file)
     buf_size = _get_buf_size(kwargs)
-    return _yajl2.items(f, buf_size, prefix, map_type, **kwargs)
+    return _yajl2.numeric_items(f, buf_size, prefix, typecode, **kwargs)
 
-def items_async(file, prefix, map_type=None, **kwargs):
+def offsets_gen(file, prefix, every, **kwargs):
+    f = compat.bytes_reader(file)
     buf_size = _get_buf_size(kwargs)
-    return _yajl2.items_async(file, buf_size, prefix, map_type, **kwargs)
+    return _yajl2.offsets(f, buf_size, prefix, every, **kwargs)
+
+class Parser(_yajl2.parser):
+    __doc__ = common._PARSER_DOC
+
+    def __init__(self, method='items', *args, **kwargs):
+        factory = common._parser_factory(globals(), method, args, kwargs)
+        super().__init__(factory, utils.sendable_list())
 
 common.enrich_backend(globals())
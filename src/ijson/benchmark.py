@@ -84,6 +84,9 @@ def load_backends():
     return backends
 _backends = load_backends()
 
+def parse_workers(s):
+    return [int(workers) for workers in s.split(',')]
+
 def parse_backends(s):
     backends = collections.OrderedDict()
     for name in s.split(','):
@@ -214,6 +217,51 @@ def run_benchmarks(args, benchmark_func=None, fname=None):
         print("%.3f, %s, %s, %s, %.3f, %.3f, %.3f, %.3f, %.3f, %.3f, %.3f, %.3f" % results)
 
 
+def run_scaling_benchmarks(args, benchmark_func=None, fname=None):
+    assert bool(benchmark_func) != bool(fname)
+    if benchmark_func:
+        bname = benchmark_func.__name__
+        with progress_message('Generating data for benchmark %s...' % (bname,)):
+            source = benchmark_func(args.size)
+            size = len(source)
+    else:
+        bname = fname
+        source = fname
+        size = os.stat(fname).st_size
+
+    # The same amount of documents is parsed with each number of workers
+    n_documents = 2 * max(args.workers)
+    method_args = ()
+    if args.method in ('items', 'kvitems'):
+        method_args = args.prefix,
+    method_kwargs = {
+        'multiple_values': args.multiple_values,
+        'use_float': args.use_float,
+        'buf_size': args.bufsize,
+    }
+
+    for backend_name in args.backends:
+        for workers in args.workers:
+            durations = []
+            now = time.perf_counter
+            for iteration in range(args.iterations):
+                start = now()
+                results = ijson.parse_many(
+                    [source] * n_documents, args.method, *method_args,
+                    workers=workers, backend=backend_name, **method_kwargs
+                )
+                for _ in results:
+                    pass
+                durations.append(now() - start)
+            megabytes = n_documents * size / 1024. / 1024.
+            results = (
+                (megabytes, '%s-w%d' % (args.method, workers), bname, backend_name) +
+                stats(durations) +
+                stats([megabytes / duration for duration in durations])
+            )
+            print("%.3f, %s, %s, %s, %.3f, %.3f, %.3f, %.3f, %.3f, %.3f, %.3f, %.3f" % results)
+
+
 def main():
     DEFAULT_N = 100000
     DEFAULT_ITERATIONS = 1
@@ -251,6 +299,9 @@ def main():
     parser.add_argument('-a', '--async', action='store_true', default=False,
                         dest='run_async', help='Benchmark asyncio-enabled methods')
     parser.add_argument('-p', '--prefix', help='Prefix (used with -M items|kvitems)', default='')
+    parser.add_argument('-w', '--workers', type=parse_workers,
+                        help='Comma-separated list of worker counts; benchmark how parsing many '
+                             'copies of the input with ijson.parse_many scales with them')
 
     args = parser.parse_args()
     if args.list:
@@ -262,12 +313,13 @@ def main():
         return
 
     print("#mbytes, method, test_case, backend, time_min, time_avg, time_median, time_max, mb_per_sec_min, mb_per_sec_avg, mb_per_sec_median, mb_per_sec_max")
+    run = run_scaling_benchmarks if args.workers else run_benchmarks
     if args.inputs:
         for filename in args.inputs:
-            run_benchmarks(args, fname=filename)
+            run(args, fname=filename)
     else:
         for benchmark in args.benchmarks:
-            run_benchmarks(args, benchmark)
+            run(args, benchmark)
 
 if __name__ == '__main__':
     main()
@@ -1,14 +1,29 @@
 '''
 Backend independent higher level interfaces, common exceptions.
 '''
+import array
 import decimal
 import inspect
-import io
+import itertools
+import mmap
+import operator
+import os
 import warnings
 
 from ijson import compat, utils, utils35
 
 
+EVENT_NAMES = (
+    'null', 'boolean', 'integer', 'double', 'number', 'string',
+    'start_map', 'map_key', 'end_map', 'start_array', 'end_array',
+)
+"""
+Names of the events reported by ``basic_parse_columnar``, indexed by their codes.
+"""
+
+_EVENT_CODES = {name: code for code, name in enumerate(EVENT_NAMES)}
+
+
 class JSONError(Exception):
     '''
     Base exception for all parsing errors.
@@ -137,41 +152,378 @@ class ObjectBuilder:
             self.containers[-1](value)
 
 
+def _check_prefixes(prefix, prefixes):
+    if prefixes is None:
+        if prefix is None:
+            raise TypeError("Either prefix or prefixes must be given")
+        return None
+    if prefix is not None:
+        raise ValueError("Only one of prefix or prefixes can be given")
+    if isinstance(prefixes, (str, bytes)):
+        raise TypeError("prefixes must be a collection of prefixes, not a string")
+    return tuple(prefixes)
+
+
+def _compile_wildcards(prefix, prefixes):
+    '''
+    Compiles the given prefix (or prefixes) into a deterministic automaton
+    matching paths component by component, where ``*`` matches any single
+    component and ``**`` matches any number of them (including none).
+
+    The automaton is returned as a ``(transitions, defaults, items, accepts)``
+    tuple of per-state tuples: a dictionary with the next state for the
+    map keys named by the patterns, the next state for any other map key,
+    the next state for array items, and the first pattern accepting the state
+    (or ``None``). State 0 is the state of top-level values.
+    '''
+    patterns = _check_prefixes(prefix, prefixes)
+    if patterns is None:
+        patterns = (prefix,)
+    for pattern in patterns:
+        if not isinstance(pattern, str):
+            raise TypeError("Wildcard prefixes must be strings, not %r" % type(pattern))
+    components = [tuple(pattern.split('.')) if pattern else () for pattern in patterns]
+
+    def closure(positions):
+        result = set()
+        while positions:
+            i, j = position = positions.pop()
+            if position not in result:
+                result.add(position)
+                if j < len(components[i]) and components[i][j] == '**':
+                    positions.append((i, j + 1))
+        return frozenset(result)
+
+    def step(positions, component):
+        following = []
+        for i, j in positions:
+            if j < len(components[i]):
+                expected = components[i][j]
+                if expected == '**':
+                    following.append((i, j))
+                elif expected == '*' or expected == component:
+                    following.append((i, j + 1))
+        return closure(following)
+
+    literals = {c for pattern in components for c in pattern if c not in ('*', '**')}
+    literals.add('item')
+    start = closure([(i, 0) for i in range(len(patterns))])
+    states = {start: 0}
+    pending = [start]
+    transitions, defaults, items, accepts = [], [], [], []
+
+    def state_id(positions):
+        if positions not in states:
+            states[positions] = len(states)
+            pending.append(positions)
+        return states[positions]
+
+    while len(transitions) < len(states):
+        positions = pending[len(transitions)]
+        default = state_id(step(positions, None))
+        targets = {}
+        for literal in literals:
+            target = state_id(step(positions, literal))
+            if target != default:
+                targets[literal] = target
+        transitions.append(targets)
+        defaults.append(default)
+        items.append(targets.get('item', default))
+        accepted = [i for i, j in positions if j == len(components[i])]
+        accepts.append(patterns[min(accepted)] if accepted else None)
+
+    return tuple(transitions), tuple(defaults), tuple(items), tuple(accepts)
+
+
+def _check_fields(fields, what='fields'):
+    if fields is None:
+        return None
+    if isinstance(fields, (str, bytes)):
+        raise TypeError("%s must be a collection of strings, not a string" % what)
+    fields = tuple(fields)
+    for field in fields:
+        if not isinstance(field, str):
+            raise TypeError("%s must be strings, not %r" % (what, type(field)))
+    return fields
+
+
+class _Projection:
+    '''
+    Follows the events of a value (as if it was a top-level value) and decides
+    which of them are part of its projection onto the given fields: those under
+    the fields, and the containers (and map keys) leading to them.
+    '''
+
+    def __init__(self, fields):
+        self.fields = frozenset(fields)
+        self.ancestors = frozenset(
+            field[:i] for field in fields for i, c in enumerate(field) if c == '.'
+        )
+        if fields:
+            self.ancestors |= {''}
+        self.reset()
+
+    def reset(self):
+        # paths of the containers leading to the fields, and whether they're maps
+        self.containers = []
+        self.member = None
+        self.full_depth = 0
+        self.skip_depth = 0
+        # the field the last value was found at, if any
+        self.matched = None
+
+    def event(self, event, value):
+        starts = event in ('start_map', 'start_array')
+        ends = event in ('end_map', 'end_array')
+        self.matched = None
+        if self.full_depth or self.skip_depth:
+            depth = starts - ends
+            if self.full_depth:
+                self.full_depth += depth
+                return True
+            self.skip_depth += depth
+            return False
+        if ends:
+            self.containers.pop()
+            return True
+        if not self.containers:
+            path = ''
+        else:
+            parent, is_map = self.containers[-1]
+            if event == 'map_key':
+                self.member = parent + '.' + value if parent else value
+                return self.member in self.fields or self.member in self.ancestors
+            path = self.member if is_map else parent + '.item' if parent else 'item'
+        if path in self.fields:
+            self.full_depth = int(starts)
+            self.matched = path
+            return True
+        elif path in self.ancestors and starts:
+            self.containers.append((path, event == 'start_map'))
+            return True
+        self.skip_depth = int(starts)
+        return False
+
+
+# The operators of ``where`` predicates, indexed by their codes. Comparisons
+# have the same codes as Python's rich comparisons (i.e., Py_LT, Py_LE, ...)
+_WHERE_OPERATORS = ('<', '<=', '==', '!=', '>', '>=', 'in')
+_WHERE_FUNCTIONS = (
+    operator.lt, operator.le, operator.eq, operator.ne, operator.gt, operator.ge,
+    lambda value, operand: value in operand,
+)
+_SCALAR_TYPES = (str, int, float, decimal.Decimal, type(None))
+
+
+def _compile_where(where):
+    '''
+    Compiles a ``where`` predicate, a mapping from the paths of scalar fields
+    (relative to the objects being filtered) to the conditions they must
+    satisfy: either a scalar they must be equal to, or a mapping of operators
+    (``==``, ``!=``, ``<``, ``<=``, ``>``, ``>=`` or ``in``) to their operands.
+
+    The predicate is returned as a tuple of ``(path, conditions)`` pairs, with
+    a tuple of ``(operator code, operand)`` pairs as the conditions.
+    '''
+    if where is None:
+        return None
+    if not hasattr(where, 'items'):
+        raise TypeError("where must be a mapping of fields to conditions, not %r" % type(where))
+    compiled = []
+    for path, condition in where.items():
+        if not isinstance(path, str):
+            raise TypeError("where fields must be strings, not %r" % type(path))
+        if isinstance(condition, _SCALAR_TYPES):
+            condition = {'==': condition}
+        elif not hasattr(condition, 'items'):
+            raise TypeError("Conditions must be scalars or mappings of operators, not %r" % type(condition))
+        conditions = []
+        for op, operand in condition.items():
+            if op not in _WHERE_OPERATORS:
+                raise ValueError("Unknown operator in where predicate: %r" % (op,))
+            code = _WHERE_OPERATORS.index(op)
+            if op == 'in':
+                if isinstance(operand, (str, bytes)):
+                    raise TypeError("The operand of 'in' must be a collection, not a string")
+                operand = frozenset(operand)
+            conditions.append((code, operand))
+        compiled.append((path, tuple(conditions)))
+    return tuple(compiled)
+
+
+class _Predicate:
+    '''
+    Evaluates a compiled ``where`` predicate over the events of a value as they
+    are found, rejecting the value as soon as one of its conditions fails.
+    '''
+
+    def __init__(self, where):
+        self.conditions = dict(where)
+        self.paths = _Projection(self.conditions)
+        self.reset()
+
+    def reset(self):
+        self.paths.reset()
+        self.seen = set()
+        self.rejected = False
+
+    def _holds(self, path, value):
+        try:
+            return all(_WHERE_FUNCTIONS[code](value, operand) for code, operand in self.conditions[path])
+        except TypeError:
+            # values that can't be compared don't satisfy the condition
+            return False
+
+    def event(self, event, value):
+        '''Follows an event, returning whether the value is not yet rejected'''
+        if self.rejected:
+            return False
+        self.paths.event(event, value)
+        path = self.paths.matched
+        if path is not None:
+            # only scalars satisfy conditions
+            if event in ('start_map', 'start_array') or not self._holds(path, value):
+                self.rejected = True
+                return False
+            self.seen.add(path)
+        return True
+
+    def start(self, event, value):
+        '''Starts evaluating the predicate on the value starting with this event'''
+        self.reset()
+        return self.event(event, value)
+
+    def accepted(self):
+        '''Whether the value satisfied all conditions, once finished'''
+        return not self.rejected and len(self.seen) == len(self.conditions)
+
+
+def _build_object(event, value, map_type, projection=None, predicate=None):
+    '''
+    Builds an object out of the events following the given start_map or
+    start_array event, returning it once the container ends. If a
+    ``projection`` is given, only the members it selects are built.
+    If a ``predicate`` is given, the object stops being built as soon as
+    the predicate rejects it.
+    '''
+    object_depth = 1
+    builder = ObjectBuilder(map_type=map_type)
+    building = not predicate or predicate.start(event, value)
+    if building:
+        builder.event(event, value)
+    if projection:
+        projection.reset()
+        projection.event(event, value)
+    while True:
+        _, event, value = (yield)
+        if event in ('start_map', 'start_array'):
+            object_depth += 1
+        elif event in ('end_map', 'end_array'):
+            object_depth -= 1
+            if not object_depth:
+                break
+        if not building:
+            continue
+        building = not predicate or predicate.event(event, value)
+        if building and (not projection or projection.event(event, value)):
+            builder.event(event, value)
+    del builder.containers[:]
+    return builder.value if building else None
+
+
+def _matched_value(event, value, map_type, projection, predicate):
+    '''
+    Builds the value starting with the given event if it is accepted by the
+    predicate (if any), returning it and whether it was accepted.
+    '''
+    if event in ('start_map', 'start_array'):
+        value = yield from _build_object(event, value, map_type, projection, predicate)
+    elif predicate:
+        predicate.start(event, value)
+    return value, not predicate or predicate.accepted()
+
+
+def _wildcard_items(target, automaton, map_type, multiple, projection, predicate):
+    transitions, defaults, items, accepts = automaton
+    # the states of the open containers, and whether they are arrays
+    states = []
+    arrays = []
+    key_state = 0
+    while True:
+        current, event, value = (yield)
+        if event == 'map_key':
+            key_state = transitions[states[-1]].get(value, defaults[states[-1]])
+            continue
+        elif event in ('end_map', 'end_array'):
+            states.pop()
+            arrays.pop()
+            continue
+        if not states:
+            state = 0
+        elif arrays[-1]:
+            state = items[states[-1]]
+        else:
+            state = key_state
+        matched = accepts[state]
+        if matched is not None:
+            value, accepted = yield from _matched_value(event, value, map_type, projection, predicate)
+            if accepted:
+                target.send((matched, value) if multiple else value)
+        elif event in ('start_map', 'start_array'):
+            states.append(state)
+            arrays.append(event == 'start_array')
+
+
 @utils.coroutine
-def items_basecoro(target, prefix, map_type=None):
+def items_basecoro(target, prefix, map_type=None, prefixes=None, wildcards=False, fields=None,
+                   where=None):
     '''
     An couroutine dispatching native Python objects constructed from the events
     under a given prefix.
+
+    If a collection of ``prefixes`` is given instead, objects under any of them
+    are dispatched as ``(prefix, object)`` tuples. If ``wildcards`` is set,
+    prefixes are patterns where ``*`` and ``**`` components match any one
+    and any number of path components, respectively. If ``fields`` are given,
+    objects are built only with the members at those paths (relative to
+    the objects themselves). If a ``where`` predicate is given (see
+    _compile_where), only the objects satisfying it are dispatched.
     '''
+    fields = _check_fields(fields)
+    projection = _Projection(fields) if fields is not None else None
+    where = _compile_where(where)
+    predicate = _Predicate(where) if where is not None else None
+    if wildcards:
+        automaton = _compile_wildcards(prefix, prefixes)
+        yield from _wildcard_items(target, automaton, map_type, prefixes is not None, projection, predicate)
+    prefixes = _check_prefixes(prefix, prefixes)
+    if prefixes is not None:
+        prefixes = frozenset(prefixes)
     while True:
         current, event, value = (yield)
-        if current == prefix:
-            if event in ('start_map', 'start_array'):
-                object_depth = 1
-                builder = ObjectBuilder(map_type=map_type)
-                while object_depth:
-                    builder.event(event, value)
-                    current, event, value = (yield)
-                    if event in ('start_map', 'start_array'):
-                        object_depth += 1
-                    elif event in ('end_map', 'end_array'):
-                        object_depth -= 1
-                del builder.containers[:]
-                target.send(builder.value)
-            else:
-                target.send(value)
+        if current == prefix if prefixes is None else current in prefixes:
+            matched = current
+            value, accepted = yield from _matched_value(event, value, map_type, projection, predicate)
+            if accepted:
+                target.send(value if prefixes is None else (matched, value))
 
 
 @utils.coroutine
-def kvitems_basecoro(target, prefix, map_type=None):
+def kvitems_basecoro(target, prefix, map_type=None, keys=None):
     '''
     An coroutine dispatching (key, value) pairs constructed from the events
-    under a given prefix. The prefix should point to JSON objects
+    under a given prefix. The prefix should point to JSON objects. If ``keys``
+    are given, only the members with those keys are dispatched.
     '''
+    keys = _check_fields(keys, 'keys')
+    if keys is not None:
+        keys = frozenset(keys)
     builder = None
     while True:
         path, event, value = (yield)
         while path == prefix and event == 'map_key':
+            if keys is not None and value not in keys:
+                break
             object_depth = 0
             key = value
             builder = ObjectBuilder(map_type=map_type)
@@ -191,6 +543,176 @@ def kvitems_basecoro(target, prefix, map_type=None):
             target.send((key, builder.value))
 
 
+# numpy-like names (e.g., f8, i4, u1) of the array typecodes numbers can be
+# stored as, taking the first typecode of each kind and size
+_NUMERIC_TYPECODES = {
+    '%s%d' % ('f' if typecode in 'fd' else 'i' if typecode.islower() else 'u',
+              array.array(typecode).itemsize): typecode
+    for typecode in reversed('bBhHiIlLqQfd')
+}
+_NUMERIC_TYPECODES.update((typecode, typecode) for typecode in 'bBhHiIlLqQfd')
+
+
+def _numeric_typecode(dtype):
+    typecode = _NUMERIC_TYPECODES.get(dtype) if isinstance(dtype, str) else None
+    if typecode is None:
+        try:
+            import numpy
+            dtype = numpy.dtype(dtype)
+            if dtype.isnative:
+                typecode = _NUMERIC_TYPECODES.get(dtype.char)
+        except (ImportError, TypeError):
+            pass
+    if typecode is None:
+        raise ValueError("Unsupported dtype: %r" % (dtype,))
+    return typecode
+
+
+def _numeric_value(value, typecode):
+    if typecode in 'fd':
+        return float(value)
+    if value != int(value):
+        raise ValueError("%s is not an integer" % value)
+    return int(value)
+
+
+def _not_rectangular():
+    return ValueError("Numeric arrays must be rectangular")
+
+
+def _build_numeric_array(event, value, typecode):
+    '''
+    Builds a numeric array out of the given number or start_array event and
+    the events following it, returning its (data, shape) once it ends.
+    '''
+    data = array.array(typecode)
+    # the length of each level of the array, and the elements found so far
+    # in each open one
+    dims = []
+    counts = []
+    ndim = None
+    while True:
+        if event == 'number':
+            # numbers must be found at the deepest level
+            if ndim is None and len(counts) != len(dims):
+                raise _not_rectangular()
+            ndim = len(counts) if ndim is None else ndim
+            if len(counts) != ndim:
+                raise _not_rectangular()
+            if counts:
+                counts[-1] += 1
+            data.append(_numeric_value(value, typecode))
+        elif event == 'start_array':
+            if ndim is not None and len(counts) >= ndim:
+                raise _not_rectangular()
+            if counts:
+                counts[-1] += 1
+            if len(counts) == len(dims):
+                dims.append(None)
+            counts.append(0)
+        elif event == 'end_array':
+            count = counts.pop()
+            if dims[len(counts)] is None:
+                dims[len(counts)] = count
+            elif dims[len(counts)] != count:
+                raise _not_rectangular()
+        else:
+            raise ValueError("Numeric arrays can only contain numbers and arrays")
+        if not counts:
+            return data, tuple(dims)
+        _, event, value = (yield)
+
+
+@utils.coroutine
+def numeric_items_basecoro(target, prefix, typecode):
+    '''
+    An coroutine dispatching the numeric arrays (or numbers) found under a given
+    prefix as (data, shape) tuples, with their numbers stored in a buffer
+    of the given array typecode.
+    '''
+    while True:
+        current, event, value = (yield)
+        if current == prefix:
+            target.send((yield from _build_numeric_array(event, value, typecode)))
+
+
+def _numeric_arrays(results, typecode):
+    try:
+        import numpy
+    except ImportError:
+        numpy = None
+    for data, shape in results:
+        if numpy is not None:
+            yield numpy.frombuffer(data, dtype=typecode).reshape(shape)
+        # memoryviews can't have zero-length dimensions
+        elif 0 in shape:
+            yield memoryview(data).cast('B').cast(typecode)
+        else:
+            yield memoryview(data).cast('B').cast(typecode, shape)
+
+
+_INT64_MIN = -2**63
+_INT64_MAX = 2**63 - 1
+
+
+def _column(values):
+    '''
+    A column with the given values, which is an array of integers or floats
+    if all values can be stored as such, or the list of values otherwise.
+    '''
+    integers = floats = bool(values)
+    for value in values:
+        if type(value) is int:
+            if not _INT64_MIN <= value <= _INT64_MAX:
+                return values
+        elif type(value) is float:
+            integers = False
+        else:
+            return values
+    if integers:
+        return array.array('q', values)
+    elif floats:
+        return array.array('d', values)
+    return values
+
+
+@utils.coroutine
+def columns_basecoro(target, prefix, fields=None):
+    '''
+    An coroutine building columns out of the members of the objects under a
+    given prefix, with one value per object in each column (None for missing
+    members). If ``fields`` are given, only columns for those members are
+    built. Columns are sent as a dictionary once the coroutine is closed.
+    '''
+    if isinstance(fields, (str, bytes)):
+        raise TypeError("fields must be a collection of field names, not a string")
+    columns = {} if fields is None else {field: [] for field in fields}
+    rows = 0
+    try:
+        while True:
+            path, event, value = (yield)
+            if path != prefix or event != 'start_map':
+                continue
+            row = {}
+            _, event, value = (yield)
+            while event == 'map_key':
+                key = value
+                _, event, value = (yield)
+                if event in ('start_map', 'start_array'):
+                    value = yield from _build_object(event, value, None)
+                if fields is None or key in columns:
+                    row[key] = value
+                _, event, value = (yield)
+            for key in row:
+                if key not in columns:
+                    columns[key] = [None] * rows
+            for key, column in columns.items():
+                column.append(row.get(key))
+            rows += 1
+    except GeneratorExit:
+        target.send({key: _column(column) for key, column in columns.items()})
+
+
 def integer_or_decimal(str_value):
     '''
     Converts string with a numeric value into an int or a Decimal.
@@ -214,7 +736,21 @@ def number(str_value):
     return integer_or_decimal(str_value)
 
 def file_source(f, buf_size=64*1024):
-    '''A generator that yields data from a file-like object'''
+    '''
+    A generator that yields data from a file-like object, a memoryview, or the
+    chunks of a document given by an iterable
+    '''
+    if isinstance(f, memoryview):
+        for start in range(0, len(f), buf_size):
+            yield f[start:start + buf_size].tobytes()
+        yield b''
+        return
+    elif isinstance(f, _Chunks):
+        for chunk in f:
+            if chunk:
+                yield chunk if type(chunk) is bytes else bytes(memoryview(chunk))
+        yield b''
+        return
     f = compat.bytes_reader(f)
     while True:
         data = f.read(buf_size)
@@ -236,17 +772,28 @@ def _parse_pipeline(backend, config):
     )
 
 
-def _items_pipeline(backend, prefix, map_type, config):
+def _items_pipeline(backend, prefix, map_type, prefixes, wildcards, fields, where, config):
+    _check_prefixes(prefix, prefixes)
+    return (
+        (backend['items_basecoro'], (prefix,),
+         {'map_type': map_type, 'prefixes': prefixes, 'wildcards': wildcards, 'fields': fields,
+          'where': where}),
+        (backend['parse_basecoro'], [], {}),
+        (backend['basic_parse_basecoro'], [], config)
+    )
+
+
+def _kvitems_pipeline(backend, prefix, map_type, keys, config):
     return (
-        (backend['items_basecoro'], (prefix,), {'map_type': map_type}),
+        (backend['kvitems_basecoro'], (prefix,), {'map_type': map_type, 'keys': keys}),
         (backend['parse_basecoro'], [], {}),
         (backend['basic_parse_basecoro'], [], config)
     )
 
 
-def _kvitems_pipeline(backend, prefix, map_type, config):
+def _numeric_items_pipeline(backend, prefix, typecode, config):
     return (
-        (backend['kvitems_basecoro'], (prefix,), {'map_type': map_type}),
+        (backend['numeric_items_basecoro'], (prefix, typecode), {}),
         (backend['parse_basecoro'], [], {}),
         (backend['basic_parse_basecoro'], [], config)
     )
@@ -271,23 +818,100 @@ def _make_parse_coro(backend):
 
 
 def _make_items_coro(backend):
-    def items_coro(target, prefix, map_type=None, **config):
+    def items_coro(target, prefix=None, map_type=None, prefixes=None, wildcards=False,
+                   fields=None, where=None, **config):
         return utils.chain(
             target,
-            *_items_pipeline(backend, prefix, map_type, config)
+            *_items_pipeline(backend, prefix, map_type, prefixes, wildcards, fields, where, config)
         )
     return items_coro
 
 
 def _make_kvitems_coro(backend):
-    def kvitems_coro(target, prefix, map_type=None, **config):
+    def kvitems_coro(target, prefix, map_type=None, keys=None, **config):
         return utils.chain(
             target,
-            *_kvitems_pipeline(backend, prefix, map_type, config)
+            *_kvitems_pipeline(backend, prefix, map_type, keys, config)
         )
     return kvitems_coro
 
 
+_PARSER_METHODS = ('basic_parse', 'parse', 'items', 'kvitems')
+
+
+def _parser_factory(backend, method, args, kwargs):
+    '''
+    Returns a function building the coroutine pipeline of ``method``, with
+    the given arguments, sending its results to a given target
+    '''
+    if method not in _PARSER_METHODS:
+        raise ValueError("method must be one of %s" % ', '.join(_PARSER_METHODS))
+    coro = backend[method + '_coro']
+    return lambda target: coro(target, *args, **kwargs)
+
+
+_PARSER_DOC = '''
+A push parser, fed with chunks of data as they become available, and
+returning the results of ``method`` (one of ``basic_parse``, ``parse``,
+``items`` or ``kvitems``) found in each of them. Additional arguments are
+given to ``method``.
+
+Once the whole document has been fed, ``close`` returns the last results.
+Parsers are closed after errors, and ``close`` then returns the results found
+before them. ``reset`` prepares the parser for a new document.
+'''
+
+
+def _make_parser(backend):
+    class Parser:
+        __doc__ = _PARSER_DOC
+
+        def __init__(self, method='items', *args, **kwargs):
+            self._factory = _parser_factory(backend, method, args, kwargs)
+            self._results = utils.sendable_list()
+            self._coro = self._factory(self._results)
+
+        def feed(self, data):
+            '''Parses a chunk of data, returning the results found in it'''
+            if self._coro is None:
+                raise ValueError("parser is closed")
+            if data:
+                try:
+                    self._coro.send(data if type(data) is bytes else bytes(memoryview(data)))
+                except:
+                    self._coro = None
+                    raise
+            return self._take_results()
+
+        def close(self):
+            '''Finishes parsing, returning the last results'''
+            if self._coro is not None:
+                coro, self._coro = self._coro, None
+                try:
+                    coro.send(b'')
+                except StopIteration:
+                    pass
+            return self._take_results()
+
+        def reset(self):
+            '''Prepares the parser to parse a new document'''
+            if self._coro is not None:
+                # discard the document being parsed
+                try:
+                    self._coro.close()
+                except JSONError:
+                    pass
+            del self._results[:]
+            self._coro = self._factory(self._results)
+
+        def _take_results(self):
+            results = self._results[:]
+            del self._results[:]
+            return results
+
+    return Parser
+
+
 def is_awaitablefunction(func):
     """True if `func` is an awaitable function"""
     return (
@@ -305,8 +929,11 @@ def is_async_file(f):
     )
 
 def is_file(x):
-    """True if x has a `read` method"""
-    return hasattr(x, 'read')
+    """
+    True if x has a `read` method, or is a memoryview or an iterable of chunks
+    read like a file
+    """
+    return hasattr(x, 'read') or isinstance(x, (memoryview, _Chunks))
 
 
 def is_iterable(x):
@@ -314,11 +941,296 @@ def is_iterable(x):
     return hasattr(x, '__iter__')
 
 
-def _get_source(source):
-    if isinstance(source, bytes):
-        return io.BytesIO(source)
+class _Chunks:
+    '''The chunks of a document given by an iterable, read like a file'''
+
+    def __init__(self, chunks):
+        self.chunks = chunks
+
+    def __iter__(self):
+        return self.chunks
+
+
+class _ChunksOrEvents(_Chunks):
+    '''
+    An iterable giving either the chunks of a document or events, which is
+    only told by its first element once it's iterated. Read like a file, it
+    must give chunks.
+    '''
+
+    def __iter__(self):
+        iterator = iter(self.chunks)
+        for first in iterator:
+            if not isinstance(first, (bytes, bytearray, memoryview)):
+                raise ValueError("Unknown chunk type: %r" % type(first))
+            yield first
+        yield from iterator
+
+    def results(self, chunks_gen, events_gen):
+        '''
+        Returns an iterator over the results of either ``chunks_gen`` or
+        ``events_gen``, given the chunks or events of this iterable. Nothing
+        is pulled from it until the results are iterated.
+        '''
+        def gens():
+            iterator = iter(self.chunks)
+            for first in iterator:
+                rest = itertools.chain((first,), iterator)
+                if isinstance(first, (bytes, bytearray, memoryview)):
+                    yield chunks_gen(_Chunks(rest))
+                else:
+                    yield events_gen(rest)
+                return
+            yield events_gen(iterator)
+        # results are then pulled from the chosen generator without an
+        # extra python frame in between
+        return itertools.chain.from_iterable(gens())
+
+
+def _advise_sequential(mapping):
+    # not available in all platforms and python versions
+    if hasattr(mapping, 'madvise') and hasattr(mmap, 'MADV_SEQUENTIAL'):
+        mapping.madvise(mmap.MADV_SEQUENTIAL)
+
+
+def _map_file(path):
+    '''
+    Memory-maps the file at ``path``. The mapping is not closed explicitly,
+    but unmapped once parsers stop referencing it (i.e., when parsing
+    finishes, on CPython).
+    '''
+    with open(path, 'rb') as f:
+        # empty files can't be mapped
+        if not os.fstat(f.fileno()).st_size:
+            return b''
+        mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    _advise_sequential(mapping)
+    return mapping
+
+
+# decompression modules are only imported when needed, as they are rarely
+# used and slow down importing ijson
+def _gzip_decompressor():
+    import zlib
+    return zlib.decompressobj(zlib.MAX_WBITS | 16)
+
+
+def _bz2_decompressor():
+    import bz2
+    return bz2.BZ2Decompressor()
+
+
+def _xz_decompressor():
+    import lzma
+    return lzma.LZMADecompressor()
+
+
+def _zstd_decompressor():
+    # available in the standard library only from python 3.14
+    try:
+        from compression import zstd
+        return zstd.ZstdDecompressor()
+    except ImportError:
+        import zstandard
+        return zstandard.ZstdDecompressor().decompressobj()
+
+
+_DECOMPRESSORS = {
+    'gzip': _gzip_decompressor,
+    'bz2': _bz2_decompressor,
+    'xz': _xz_decompressor,
+    'zstd': _zstd_decompressor,
+}
+
+_COMPRESSION_MAGICS = (
+    (b'\x1f\x8b', 'gzip'),
+    (b'BZh', 'bz2'),
+    (b'\xfd7zXZ\x00', 'xz'),
+    (b'\x28\xb5\x2f\xfd', 'zstd'),
+)
+
+
+def _detect_compression(header):
+    '''The compression of the data starting with the given (6 byte) header'''
+    for magic, compression in _COMPRESSION_MAGICS:
+        if header[:len(magic)] == magic:
+            return compression
+    return None
+
+
+def _sniff_compression(chunks):
+    '''
+    Detects the compression of the data given by an iterable of chunks,
+    returning it together with an iterator over the same chunks
+    '''
+    chunks = iter(chunks)
+    header = []
+    size = 0
+    for chunk in chunks:
+        header.append(chunk)
+        size += len(chunk)
+        if size >= 6:
+            break
+    compression = _detect_compression(b''.join(bytes(chunk) for chunk in header)[:6])
+    return compression, itertools.chain(header, chunks)
+
+
+def _read_chunks(f, buf_size):
+    while True:
+        data = f.read(buf_size)
+        if not data:
+            break
+        yield data
+
+
+def _path_chunks(path, buf_size):
+    with open(path, 'rb') as f:
+        yield from _read_chunks(f, buf_size)
+
+
+def _decompress(chunks, new_decompressor):
+    '''
+    Decompresses the data given by an iterable of chunks, which can contain
+    several concatenated streams (or members, or frames)
+    '''
+    decompressor = new_decompressor()
+    started = False
+    for data in chunks:
+        while data:
+            started = True
+            decompressed = decompressor.decompress(data)
+            if decompressed:
+                yield decompressed
+            if not decompressor.eof:
+                break
+            data = decompressor.unused_data
+            decompressor = new_decompressor()
+            started = False
+    if started:
+        raise EOFError("Compressed data ended before the end-of-stream marker was reached")
+
+
+def _put_unless_stopped(q, stopped, item):
+    import queue
+    while not stopped.is_set():
+        try:
+            q.put(item, timeout=0.1)
+            return True
+        except queue.Full:
+            pass
+    return False
+
+
+def _read_ahead(chunks, depth=4):
+    '''
+    Iterates over chunks produced by a background thread, which runs ahead
+    of the consumer by up to ``depth`` chunks, and stops when the consumer
+    does
+    '''
+    # only imported when reading ahead, as they slow down importing ijson
+    import queue
+    import threading
+    q = queue.Queue(depth)
+    stopped = threading.Event()
+    def produce():
+        try:
+            for chunk in chunks:
+                if not _put_unless_stopped(q, stopped, (chunk, None)):
+                    return
+            end = (None, None)
+        except BaseException as e:
+            end = (None, e)
+        _put_unless_stopped(q, stopped, end)
+    threading.Thread(target=produce, name='ijson-read-ahead', daemon=True).start()
+    try:
+        while True:
+            chunk, error = q.get()
+            if error is not None:
+                raise error
+            elif chunk is None:
+                return
+            yield chunk
+    finally:
+        stopped.set()
+
+
+def _decompressed_source(source, compression, buf_size):
+    '''
+    Returns the chunks of the decompressed contents of the given source, or
+    the source itself if it's not compressed and ``compression`` is "auto"
+    '''
+    if compression != 'auto' and compression not in _DECOMPRESSORS:
+        raise ValueError("Unknown compression: %r" % (compression,))
+
+    if isinstance(source, os.PathLike):
+        if compression == 'auto':
+            with open(source, 'rb') as f:
+                compression = _detect_compression(f.read(6))
+            if compression is None:
+                return _get_source(source)
+        chunks = _path_chunks(source, buf_size)
+    else:
+        source = _get_source(source)
+        if is_async_file(source):
+            raise ValueError("Decompressing asynchronous files is not supported")
+        elif isinstance(source, (mmap.mmap, memoryview)):
+            view = memoryview(source)
+            if isinstance(source, mmap.mmap):
+                view = view[source.tell():]
+            if compression == 'auto':
+                compression = _detect_compression(view[:6].tobytes())
+                if compression is None:
+                    return source
+            chunks = (view[start:start + buf_size] for start in range(0, len(view), buf_size))
+        elif isinstance(source, _Chunks):
+            chunks = iter(source)
+        elif is_file(source):
+            chunks = _read_chunks(source, buf_size)
+        else:
+            raise ValueError("Unknown source type: %r" % type(source))
+        if compression == 'auto':
+            compression, chunks = _sniff_compression(chunks)
+            if compression is None:
+                return _Chunks(chunks)
+
+    return _Chunks(_read_ahead(_decompress(chunks, _DECOMPRESSORS[compression])))
+
+
+def _read_ahead_source(source, buf_size):
+    '''
+    Returns the chunks of the given source read ahead on a background thread,
+    or the source itself if it doesn't need to be read
+    '''
+    if isinstance(source, os.PathLike):
+        chunks = _path_chunks(source, buf_size)
+    else:
+        source = _get_source(source)
+        if isinstance(source, _Chunks):
+            chunks = iter(source)
+        elif is_file(source) and not is_async_file(source) and \
+                not isinstance(source, (mmap.mmap, memoryview)):
+            chunks = _read_chunks(compat.bytes_reader(source), buf_size)
+        else:
+            return source
+    return _Chunks(_read_ahead(chunks))
+
+
+def _get_source(source, compression=None, buf_size=64*1024, read_ahead=False):
+    if compression is not None:
+        return _decompressed_source(source, compression, buf_size)
+    elif read_ahead:
+        return _read_ahead_source(source, buf_size)
+    if isinstance(source, os.PathLike):
+        return _map_file(source)
+    elif isinstance(source, mmap.mmap):
+        _advise_sequential(source)
+        return source
+    elif isinstance(source, (bytes, bytearray, memoryview)):
+        return memoryview(source).cast('B')
     elif isinstance(source, str):
-        return io.StringIO(source)
+        return memoryview(source.encode('utf-8'))
+    elif is_iterable(source) and not is_file(source):
+        return _ChunksOrEvents(source)
     return source
 
 
@@ -341,26 +1253,79 @@ def _make_parse_gen(backend):
 
 
 def _make_items_gen(backend):
-    def items_gen(file_obj, prefix, map_type=None, buf_size=64*1024, **config):
+    def items_gen(file_obj, prefix=None, map_type=None, buf_size=64*1024, prefixes=None,
+                  wildcards=False, fields=None, where=None, **config):
         return utils.coros2gen(
             file_source(file_obj, buf_size=buf_size),
-            *_items_pipeline(backend, prefix, map_type, config)
+            *_items_pipeline(backend, prefix, map_type, prefixes, wildcards, fields, where, config)
         )
     return items_gen
 
 
 def _make_kvitems_gen(backend):
-    def kvitems_gen(file_obj, prefix, map_type=None, buf_size=64*1024, **config):
+    def kvitems_gen(file_obj, prefix, map_type=None, buf_size=64*1024, keys=None, **config):
         return utils.coros2gen(
             file_source(file_obj, buf_size=buf_size),
-            *_kvitems_pipeline(backend, prefix, map_type, config)
+            *_kvitems_pipeline(backend, prefix, map_type, keys, config)
         )
     return kvitems_gen
 
 
+def _make_numeric_items_gen(backend):
+    def numeric_items_gen(file_obj, prefix, typecode, buf_size=64*1024, **config):
+        return utils.coros2gen(
+            file_source(file_obj, buf_size=buf_size),
+            *_numeric_items_pipeline(backend, prefix, typecode, config)
+        )
+    return numeric_items_gen
+
+
+def _make_basic_parse_batches_gen(backend):
+    def basic_parse_batches_gen(file_obj, buf_size=64*1024, **config):
+        return utils.coros2batches(
+            file_source(file_obj, buf_size=buf_size),
+            *_basic_parse_pipeline(backend, config)
+        )
+    return basic_parse_batches_gen
+
+
+def _make_parse_batches_gen(backend):
+    def parse_batches_gen(file_obj, buf_size=64*1024, **config):
+        return utils.coros2batches(
+            file_source(file_obj, buf_size=buf_size),
+            *_parse_pipeline(backend, config)
+        )
+    return parse_batches_gen
+
+
+def _columns(batch, depths, depth):
+    codes = array.array('B', [_EVENT_CODES[event] for event, _ in batch])
+    values = [value for _, value in batch]
+    if depths is None:
+        return (codes, None, values), depth
+    # containers' start and end events are at the depth of their parent
+    for event, _ in batch:
+        if event == 'end_map' or event == 'end_array':
+            depth -= 1
+        depths.append(depth)
+        if event == 'start_map' or event == 'start_array':
+            depth += 1
+    return (codes, depths, values), depth
+
+
+def _make_basic_parse_columns_gen(backend):
+    def basic_parse_columns_gen(file_obj, depths=False, buf_size=64*1024, **config):
+        depth = 0
+        for batch in backend['basic_parse_batches_gen'](file_obj, buf_size=buf_size, **config):
+            columns, depth = _columns(batch, array.array('I') if depths else None, depth)
+            yield columns
+    return basic_parse_columns_gen
+
+
 def _make_basic_parse(backend):
-    def basic_parse(source, buf_size=64*1024, **config):
-        source = _get_source(source)
+    def basic_parse(source, buf_size=64*1024, compression=None,
+                    read_ahead=False, **config):
+        source = _get_source(source, compression, buf_size, read_ahead)
         if is_async_file(source):
             return backend['basic_parse_async'](
                 source, buf_size=buf_size, **config
@@ -374,58 +1339,185 @@ def _make_basic_parse(backend):
 
 
 def _make_parse(backend):
-    def parse(source, buf_size=64*1024, **config):
-        source = _get_source(source)
+    def parse(source, buf_size=64*1024, compression=None,
+              read_ahead=False, **config):
+        source = _get_source(source, compression, buf_size, read_ahead)
+
+        def parse_file(file_obj):
+            return backend['parse_gen'](
+                file_obj, buf_size=buf_size, **config
+            )
+
+        def parse_events(events):
+            return utils.coros2gen(events,
+                (backend['parse_basecoro'], (), {})
+            )
+
         if is_async_file(source):
             return backend['parse_async'](
                 source, buf_size=buf_size, **config
             )
+        elif isinstance(source, _ChunksOrEvents):
+            return source.results(parse_file, parse_events)
         elif is_file(source):
-            return backend['parse_gen'](
-                source, buf_size=buf_size, **config
-            )
+            return parse_file(source)
         elif is_iterable(source):
-            return utils.coros2gen(source,
-                (backend['parse_basecoro'], (), {})
-            )
+            return parse_events(source)
         raise ValueError("Unknown source type: %r" % type(source))
     return parse
 
 
+def _fixed_size_batches(batches, batch_size):
+    pending = []
+    try:
+        for batch in batches:
+            pending.extend(batch)
+            while len(pending) >= batch_size:
+                yield pending[:batch_size]
+                del pending[:batch_size]
+    except Exception:
+        if pending:
+            yield pending
+        raise
+    if pending:
+        yield pending
+
+
+def _batched(batches_gen, source, batch_size, buf_size, compression, read_ahead, config):
+    if batch_size is not None and batch_size < 1:
+        raise ValueError("batch_size must be a positive integer")
+    source = _get_source(source, compression, buf_size, read_ahead)
+    if is_async_file(source) or not is_file(source):
+        raise ValueError("Unknown source type: %r" % type(source))
+    batches = batches_gen(source, buf_size=buf_size, **config)
+    if batch_size is None:
+        return batches
+    return _fixed_size_batches(batches, batch_size)
+
+
+def _make_basic_parse_batched(backend):
+    def basic_parse_batched(source, batch_size=None, buf_size=64*1024, compression=None,
+                            read_ahead=False, **config):
+        return _batched(
+            backend['basic_parse_batches_gen'], source, batch_size, buf_size, compression, read_ahead, config
+        )
+    return basic_parse_batched
+
+
+def _make_parse_batched(backend):
+    def parse_batched(source, batch_size=None, buf_size=64*1024, compression=None,
+                      read_ahead=False, **config):
+        return _batched(
+            backend['parse_batches_gen'], source, batch_size, buf_size, compression, read_ahead, config
+        )
+    return parse_batched
+
+
+def _make_basic_parse_columnar(backend):
+    def basic_parse_columnar(source, depths=False, buf_size=64*1024, compression=None,
+                             read_ahead=False, **config):
+        source = _get_source(source, compression, buf_size, read_ahead)
+        if is_async_file(source) or not is_file(source):
+            raise ValueError("Unknown source type: %r" % type(source))
+        return backend['basic_parse_columns_gen'](
+            source, depths=depths, buf_size=buf_size, **config
+        )
+    return basic_parse_columnar
+
+
+def _make_numeric_items(backend):
+    def numeric_items(source, prefix, dtype='f8', buf_size=64*1024, compression=None,
+                      read_ahead=False, **config):
+        typecode = _numeric_typecode(dtype)
+        source = _get_source(source, compression, buf_size, read_ahead)
+        if is_async_file(source) or not is_file(source):
+            raise ValueError("Unknown source type: %r" % type(source))
+        results = backend['numeric_items_gen'](
+            source, prefix, typecode, buf_size=buf_size, **config
+        )
+        return _numeric_arrays(results, typecode)
+    return numeric_items
+
+
+def _make_columns(backend):
+    def columns(source, prefix, fields=None, buf_size=64*1024, compression=None,
+                read_ahead=False, **config):
+        source = _get_source(source, compression, buf_size, read_ahead)
+        if is_async_file(source) or not is_file(source):
+            raise ValueError("Unknown source type: %r" % type(source))
+        result = utils.sendable_list()
+        columns_coro = backend['columns_basecoro'](result, prefix, fields)
+        parser = utils.chain(columns_coro, *_parse_pipeline(backend, config))
+        for data in file_source(source, buf_size):
+            try:
+                parser.send(data)
+            except StopIteration:
+                break
+        columns_coro.close()
+        return result[0]
+    return columns
+
+
 def _make_items(backend):
-    def items(source, prefix, map_type=None, buf_size=64*1024, **config):
-        source = _get_source(source)
+    def items(source, prefix=None, map_type=None, buf_size=64*1024, prefixes=None,
+              wildcards=False, fields=None, where=None, compression=None,
+              read_ahead=False, **config):
+        _check_prefixes(prefix, prefixes)
+        source = _get_source(source, compression, buf_size, read_ahead)
+
+        def items_file(file_obj):
+            return backend['items_gen'](
+                file_obj, prefix, map_type=map_type, buf_size=buf_size,
+                prefixes=prefixes, wildcards=wildcards, fields=fields, where=where, **config
+            )
+
+        def items_events(events):
+            return utils.coros2gen(events,
+                (backend['items_basecoro'], (prefix,),
+                 {'map_type': map_type, 'prefixes': prefixes, 'wildcards': wildcards,
+                  'fields': fields, 'where': where})
+            )
+
         if is_async_file(source):
             return backend['items_async'](
-                source, prefix, map_type=map_type, buf_size=buf_size, **config
+                source, prefix, map_type=map_type, buf_size=buf_size,
+                prefixes=prefixes, wildcards=wildcards, fields=fields, where=where, **config
             )
+        elif isinstance(source, _ChunksOrEvents):
+            return source.results(items_file, items_events)
         elif is_file(source):
-            return backend['items_gen'](
-                source, prefix, map_type=map_type, buf_size=buf_size, **config
-            )
+            return items_file(source)
         elif is_iterable(source):
-            return utils.coros2gen(source,
-                (backend['items_basecoro'], (prefix,), {'map_type': map_type})
-            )
+            return items_events(source)
         raise ValueError("Unknown source type: %r" % type(source))
     return items
 
 
 def _make_kvitems(backend):
-    def kvitems(source, prefix, map_type=None, buf_size=64*1024, **config):
-        source = _get_source(source)
+    def kvitems(source, prefix, map_type=None, buf_size=64*1024, keys=None,
+                compression=None, read_ahead=False, **config):
+        source = _get_source(source, compression, buf_size, read_ahead)
+
+        def kvitems_file(file_obj):
+            return backend['kvitems_gen'](
+                file_obj, prefix, map_type=map_type, buf_size=buf_size, keys=keys, **config
+            )
+
+        def kvitems_events(events):
+            return utils.coros2gen(events,
+                (backend['kvitems_basecoro'], (prefix,), {'map_type': map_type, 'keys': keys})
+            )
+
         if is_async_file(source):
             return backend['kvitems_async'](
-                source, prefix, map_type=map_type, buf_size=buf_size, **config
+                source, prefix, map_type=map_type, buf_size=buf_size, keys=keys, **config
             )
+        elif isinstance(source, _ChunksOrEvents):
+            return source.results(kvitems_file, kvitems_events)
         elif is_file(source):
-            return backend['kvitems_gen'](
-                source, prefix, map_type=map_type, buf_size=buf_size, **config
-            )
+            return kvitems_file(source)
         elif is_iterable(source):
-            return utils.coros2gen(source,
-                (backend['kvitems_basecoro'], (prefix,), {'map_type': map_type})
-            )
+            return kvitems_events(source)
         raise ValueError("Unknown source type: %r" % type(source))
     return kvitems
 
@@ -512,4 +1604,24 @@ def enrich_backend(backend, **capabilities_overrides):
             factory = getattr(utils35, '_make_' + async_name)
             backend[async_name] = factory(backend)
         factory = globals()['_make_' + name]
-        backend[name] = factory(backend)
\ No newline at end of file
+        backend[name] = factory(backend)
+    for name in ('basic_parse', 'parse'):
+        batches_gen_name = name + '_batches_gen'
+        if batches_gen_name not in backend:
+            factory = globals()['_make_' + batches_gen_name]
+            backend[batches_gen_name] = factory(backend)
+        factory = globals()['_make_' + name + '_batched']
+        backend[name + '_batched'] = factory(backend)
+    if 'basic_parse_columns_gen' not in backend:
+        backend['basic_parse_columns_gen'] = _make_basic_parse_columns_gen(backend)
+    backend['basic_parse_columnar'] = _make_basic_parse_columnar(backend)
+    if 'numeric_items_basecoro' not in backend:
+        backend['numeric_items_basecoro'] = numeric_items_basecoro
+    if 'numeric_items_gen' not in backend:
+        backend['numeric_items_gen'] = _make_numeric_items_gen(backend)
+    backend['numeric_items'] = _make_numeric_items(backend)
+    if 'columns_basecoro' not in backend:
+        backend['columns_basecoro'] = columns_basecoro
+    backend['columns'] = _make_columns(backend)
+    if 'Parser' not in backend:
+        backend['Parser'] = _make_parser(backend)
\ No newline at end of file
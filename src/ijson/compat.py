@@ -34,6 +34,8 @@ def _warn_and_return(o):
 
 def bytes_reader(f):
     """Returns a file-like object that reads bytes"""
-    if type(f.read(0)) == bytes:
+    # in-memory buffers and iterables of chunks are given as they are to the
+    # C backend
+    if not hasattr(f, 'read') or type(f.read(0)) == bytes:
         return f
     return _warn_and_return(utf8reader(f))
\ No newline at end of file
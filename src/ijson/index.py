@@ -0,0 +1,139 @@
+'''
+Sidecar indices giving random access to the items of large JSON arrays.
+
+``build`` parses a document once, recording the byte offsets at which every
+Nth item under a prefix starts. ``items`` then uses those offsets to seek
+close to the requested items and parse only the part of the document
+containing them.
+'''
+
+import bisect
+import json
+
+import ijson
+from ijson import common, utils
+
+
+_FORMAT_VERSION = 1
+
+
+class Index:
+    '''
+    The byte offsets of the items of the arrays found under a prefix.
+
+    ``checkpoints`` is a list of ``(number, offset, end)`` tuples, one for
+    every Nth item and for the first item of each array, in document order.
+    ``number`` is the index of the item among all items under the prefix,
+    ``offset`` is the byte offset just after the item preceding it (or after
+    the opening bracket of its array), and ``end`` is the byte offset just
+    after the closing bracket of its array. These, together with knowing that
+    the item is inside an array, are all the parser needs to restart there.
+    '''
+
+    def __init__(self, prefix, every, checkpoints):
+        self.prefix = prefix
+        self.every = every
+        self.checkpoints = [tuple(checkpoint) for checkpoint in checkpoints]
+
+    def save(self, path):
+        '''Writes this index into the file at ``path``'''
+        with open(path, 'w') as f:
+            json.dump({
+                'version': _FORMAT_VERSION,
+                'prefix': self.prefix,
+                'every': self.every,
+                'checkpoints': self.checkpoints,
+            }, f)
+
+    @classmethod
+    def load(cls, path):
+        '''Reads an index previously saved into the file at ``path``'''
+        with open(path) as f:
+            contents = json.load(f)
+        if contents.get('version') != _FORMAT_VERSION:
+            raise ValueError('Unsupported index version: %r' % contents.get('version'))
+        return cls(contents['prefix'], contents['every'], contents['checkpoints'])
+
+
+def _offsets_gen():
+    # Offsets are taken from yajl's count of consumed bytes
+    from ijson.backends import yajl2_c
+    return yajl2_c.offsets_gen
+
+
+def build(file, prefix, path=None, every=1000, buf_size=64*1024, **config):
+    '''
+    Builds an index with the byte offsets of every ``every``-th item of the
+    arrays under ``prefix`` in ``file``, a binary file-like object, and
+    returns it. If ``path`` is given the index is also saved into it.
+
+    Building indices requires the ``yajl2_c`` backend.
+    '''
+    offsets_gen = _offsets_gen()
+    checkpoints = list(offsets_gen(file, prefix, every, buf_size=buf_size, **config))
+    index = Index(prefix, every, checkpoints)
+    if path is not None:
+        index.save(path)
+    return index
+
+
+def _array_chunks(file, offset, end, buf_size):
+    '''
+    Yields the contents of an array from the given checkpoint to its end,
+    with the leading separator removed and the opening bracket restored.
+    '''
+    file.seek(offset)
+    yield b'['
+    remaining = end - offset
+    leading = True
+    while remaining:
+        data = file.read(min(buf_size, remaining))
+        if not data:
+            raise common.IncompleteJSONError('File is shorter than its index expects')
+        remaining -= len(data)
+        if leading:
+            data = data.lstrip()
+            if data:
+                leading = False
+                if data[:1] == b',':
+                    data = data[1:]
+        yield data
+    yield b''
+
+
+def items(file, prefix, index, start=0, stop=None, buf_size=64*1024, **config):
+    '''
+    Yields the items under ``prefix`` in ``file``, a seekable binary
+    file-like object, numbered from ``start`` (inclusive) to ``stop``
+    (exclusive, or until the end if not given). ``index`` is an ``Index``
+    built with the same prefix, or the path to a saved one. Only the parts
+    of the file between the closest checkpoint before ``start`` and the
+    last item are parsed. Additional keyword arguments are given to
+    ``ijson.items_coro``.
+    '''
+    if not isinstance(index, Index):
+        index = Index.load(index)
+    if prefix != index.prefix:
+        raise ValueError('Index was built for prefix %r, not %r' % (index.prefix, prefix))
+    if not index.checkpoints or (stop is not None and start >= stop):
+        return
+    checkpoints = index.checkpoints
+    numbers = [number for number, _, _ in checkpoints]
+    offsets = [offset for _, offset, _ in checkpoints]
+
+    position = max(bisect.bisect_right(numbers, start) - 1, 0)
+    while position < len(checkpoints):
+        number, offset, end = checkpoints[position]
+        array_items = utils.coros2gen(
+            _array_chunks(file, offset, end, buf_size),
+            (ijson.items_coro, ('item',), config)
+        )
+        for item in array_items:
+            if number >= start:
+                yield item
+            number += 1
+            if stop is not None and number >= stop:
+                array_items.close()
+                return
+        # the first checkpoint after this array is the start of the next one
+        position = bisect.bisect_left(offsets, end, position + 1)
@@ -0,0 +1,71 @@
+'''
+Parallel parsing of many JSON files in sub-interpreters, each with its own
+GIL. Requires Python 3.14 or later.
+'''
+
+import marshal
+import os
+import pathlib
+import pickle
+
+import ijson
+from ijson import parallel
+
+try:
+    from concurrent.futures import InterpreterPoolExecutor
+except ImportError:
+    InterpreterPoolExecutor = None
+
+
+def _dumps(results):
+    '''
+    Serializes results to send them across interpreters. marshal is faster
+    than pickle, but only supports the core types (e.g., not Decimal or
+    user-given map types), so pickle is used only when needed.
+    '''
+    try:
+        return 'marshal', marshal.dumps(results)
+    except ValueError:
+        return 'pickle', pickle.dumps(results, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def _loads(serialized):
+    '''Deserializes results serialized by _dumps'''
+    serializer, data = serialized
+    if serializer == 'marshal':
+        return marshal.loads(data)
+    return pickle.loads(data)
+
+
+def _items_file(backend_name, path, prefix, buf_size, config):
+    '''Parses the file at ``path``, returning its serialized items'''
+    backend = ijson.get_backend(backend_name)
+    items = backend.items(pathlib.Path(path), prefix, buf_size=buf_size, **config)
+    return _dumps(list(items))
+
+
+def items_many(paths, prefix, workers=None, ordered=True, buf_size=64*1024, **config):
+    '''
+    Yields the items under ``prefix`` in each of the files at ``paths``, like
+    ``ijson.items`` does, but parsing the files in parallel.
+
+    Files are parsed by a pool of ``workers`` sub-interpreters (as many as
+    CPUs by default) using the current backend, each running with its own
+    GIL, which avoids the cost of starting processes. Items are sent back
+    serialized with marshal (or pickle, if they contain other than core types,
+    like Decimal when ``use_float`` is not given). Items are yielded in the
+    order of ``paths`` if ``ordered`` is true, otherwise the items of each
+    file are yielded as soon as it has been parsed. At most two files per
+    worker are parsed ahead of the items being consumed. Additional keyword
+    arguments are given to ``ijson.items``, and must be picklable.
+    '''
+    if InterpreterPoolExecutor is None:
+        raise RuntimeError("Sub-interpreter pools require Python 3.14 or later")
+    workers = workers or os.cpu_count() or 1
+    with InterpreterPoolExecutor(max_workers=workers) as executor:
+        calls = (
+            (_items_file, ijson.backend, os.fspath(path), prefix, buf_size, config)
+            for path in paths
+        )
+        for serialized in parallel._parallel_results(executor, calls, workers, ordered):
+            yield from _loads(serialized)
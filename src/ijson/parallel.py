@@ -0,0 +1,320 @@
+'''
+Parallel parsing of large JSON files across processes, and of many JSON
+documents across threads.
+'''
+
+import collections
+import concurrent.futures
+import os
+import re
+
+import ijson
+
+try:
+    from ijson.backends._yajl2 import scan_structure as _scan_structure
+except ImportError:
+    _scan_structure = None
+
+
+class _RangeReader:
+    '''
+    Reads bytes from a file only up to a given offset, surrounded by the
+    given head and tail
+    '''
+
+    def __init__(self, f, end, head=b'', tail=b''):
+        self.f = f
+        self.remaining = end - f.tell()
+        self.head = head
+        self.tail = tail
+
+    def read(self, n):
+        if not n:
+            return b''
+        if self.head:
+            data, self.head = self.head, b''
+            return data
+        if self.remaining:
+            data = self.f.read(min(n, self.remaining))
+            self.remaining -= len(data)
+            if data:
+                return data
+        data, self.tail = self.tail, b''
+        return data
+
+
+def _parse_range(path, start, end, prefix, backend_name, buf_size, config, head=b'', tail=b''):
+    '''Parses the document in a byte range, returning its items'''
+    backend = ijson.get_backend(backend_name)
+    with open(path, 'rb') as f:
+        f.seek(start)
+        reader = _RangeReader(f, end, head, tail)
+        return list(backend.items(reader, prefix, buf_size=buf_size, **config))
+
+
+def _parallel_results(executor, calls, workers, ordered):
+    '''
+    Submits the given calls to an executor and yields their results, with at
+    most two calls per worker in flight
+    '''
+    pending = collections.deque()
+    def submit():
+        for call in calls:
+            pending.append(executor.submit(*call))
+            return True
+        return False
+    for _ in range(2 * workers):
+        if not submit():
+            break
+    try:
+        while pending:
+            if ordered:
+                future = pending.popleft()
+            else:
+                done, _ = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+                future = done.pop()
+                pending.remove(future)
+            result = future.result()
+            submit()
+            yield result
+    finally:
+        # don't wait for results nobody will consume
+        for future in pending:
+            future.cancel()
+
+
+def _lines_ranges(path, chunk_size):
+    '''
+    Splits the file at ``path`` into byte ranges of about ``chunk_size``
+    bytes, each ending just after a newline (or at the end of the file).
+    '''
+    size = os.path.getsize(path)
+    with open(path, 'rb') as f:
+        start = 0
+        while start < size:
+            f.seek(min(start + chunk_size, size))
+            f.readline()
+            end = f.tell()
+            yield start, end
+            start = end
+
+
+def items_jsonl(path, prefix, workers=None, ordered=True, chunk_size=16*1024*1024,
+                buf_size=64*1024, **config):
+    '''
+    Yields the items under ``prefix`` of each of the newline-delimited JSON
+    documents in the file at ``path``, like ``ijson.items`` does with
+    ``multiple_values=True``, but parsing the file in parallel.
+
+    The file is split at newline boundaries into ranges of about
+    ``chunk_size`` bytes, which are parsed by a pool of ``workers`` processes
+    (as many as CPUs by default) using the current backend. Items are yielded
+    in file order if ``ordered`` is true, otherwise the items of each range are
+    yielded as soon as the range has been parsed. At most two ranges per
+    worker are parsed ahead of the items being consumed. Additional keyword
+    arguments are given to ``ijson.items``, and must be picklable.
+    '''
+    workers = workers or os.cpu_count() or 1
+    config = dict(config, multiple_values=True)
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+        calls = (
+            (_parse_range, path, start, end, prefix, ijson.backend, buf_size, config)
+            for start, end in _lines_ranges(path, chunk_size)
+        )
+        for results in _parallel_results(executor, calls, workers, ordered):
+            yield from results
+
+
+_STRING_RE = re.compile(rb'"[^"\\]*(?:\\.[^"\\]*)*"', re.DOTALL)
+_STRING_END_RE = re.compile(rb'[^"\\]*(?:\\.[^"\\]*)*"', re.DOTALL)
+_STRUCTURE_RE = re.compile(rb'["\\\[\]{},]')
+
+
+def _scan(data, in_string):
+    '''
+    Scans a chunk of a document starting inside or outside a string, and
+    returns whether it ends inside a string, and how much the nesting depth
+    changes across it
+    '''
+    if in_string:
+        match = _STRING_END_RE.match(data)
+        if not match:
+            return True, 0
+        data = data[match.end():]
+    data = _STRING_RE.sub(b'', data)
+    quote = data.find(b'"')
+    if quote != -1:
+        data = data[:quote]
+    opened = data.count(b'[') + data.count(b'{')
+    closed = data.count(b']') + data.count(b'}')
+    return quote != -1, opened - closed
+
+
+def _scan_range(path, start, end):
+    '''
+    Speculatively scans a byte range of a document, for both of the states it
+    can start in
+    '''
+    with open(path, 'rb') as f:
+        f.seek(start)
+        data = f.read(end - start)
+    if _scan_structure is not None:
+        return _scan_structure(data)
+    return _scan(data, False), _scan(data, True)
+
+
+def _chunk_starts(f, size, chunk_size):
+    '''
+    Yields offsets about ``chunk_size`` bytes apart, none of which points to
+    an escaped character, so chunks can only start inside or outside a string
+    '''
+    start = 0
+    while start < size:
+        yield start
+        start += chunk_size
+        f.seek(start - 1)
+        while start < size and f.read(1) == b'\\':
+            start += 1
+
+
+def _find_split(f, offset, in_string, depth, buf_size=64*1024):
+    '''
+    Returns the offset of the first comma separating two elements of the
+    top-level array after ``offset``, or None if the array finishes first
+    '''
+    f.seek(offset)
+    escaped = None
+    while True:
+        data = f.read(buf_size)
+        if not data:
+            return None
+        for match in _STRUCTURE_RE.finditer(data):
+            if match.start() == escaped:
+                continue
+            c = match.group()
+            if in_string:
+                if c == b'"':
+                    in_string = False
+                elif c == b'\\':
+                    escaped = match.end()
+            elif c == b'"':
+                in_string = True
+            elif c == b',':
+                if depth == 1:
+                    return offset + match.start()
+            elif c in b'[{':
+                depth += 1
+            else:
+                depth -= 1
+                if depth == 0:
+                    return None
+        escaped = 0 if escaped == len(data) else None
+        offset += len(data)
+
+
+def _array_ranges(executor, path, prefix, chunk_size, config):
+    '''
+    Splits the file at ``path`` into byte ranges of about ``chunk_size``
+    bytes, each containing whole elements of its top-level array. Ranges are
+    given as (start, end, head, tail) tuples, where head and tail are the
+    brackets that need to be added to each range to make it an array.
+
+    Chunks of the file are first scanned in parallel, speculating on whether
+    they start inside a string or not, and the results of the right guesses
+    are then combined in order to find the state in which each chunk really
+    starts. From there, the split point for each chunk is the first comma
+    separating elements of the top-level array.
+    '''
+    size = os.path.getsize(path)
+    with open(path, 'rb') as f:
+        # only items of the elements of a top-level array can be split
+        splittable = (
+            (prefix == 'item' or prefix.startswith('item.')) and
+            not config.get('multiple_values') and
+            f.read(chunk_size).lstrip()[:1] == b'['
+        )
+        if not splittable or size <= chunk_size:
+            yield 0, size, b'', b''
+            return
+
+        starts = list(_chunk_starts(f, size, chunk_size))
+        scans = executor.map(_scan_range, [path] * len(starts), starts, starts[1:] + [size])
+        in_string, depth = False, 0
+        split = None
+        for start, scan in zip(starts, scans):
+            if start and depth >= 1 and (split is None or split < start):
+                comma = _find_split(f, start, in_string, depth)
+                if comma is not None:
+                    if split is None:
+                        yield 0, comma, b'', b']'
+                    else:
+                        yield split + 1, comma, b'[', b']'
+                    split = comma
+            in_string, delta = scan[in_string]
+            depth += delta
+        if split is None:
+            yield 0, size, b'', b''
+        else:
+            yield split + 1, size, b'[', b''
+
+
+def items(path, prefix, workers=None, chunk_size=16*1024*1024, buf_size=64*1024, **config):
+    '''
+    Yields the items under ``prefix`` in the file at ``path``, in the same
+    order as ``ijson.items`` does, but parsing the elements of its top-level
+    array in parallel.
+
+    The file is split into ranges of about ``chunk_size`` bytes containing
+    whole elements of the array, found by a structural pre-scan of the file
+    that is itself run in parallel. These are then parsed by a pool of
+    ``workers`` processes (as many as CPUs by default) using the current
+    backend. Files that are not arrays, or prefixes that are not under their
+    elements (i.e., ``item`` or ``item.*``) are parsed by a single worker.
+    Additional keyword arguments are given to ``ijson.items``, and must be
+    picklable.
+    '''
+    workers = workers or os.cpu_count() or 1
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+        calls = (
+            (_parse_range, path, start, end, prefix, ijson.backend, buf_size, config, head, tail)
+            for start, end, head, tail in _array_ranges(executor, path, prefix, chunk_size, config)
+        )
+        for results in _parallel_results(executor, calls, workers, True):
+            yield from results
+
+
+_MANY_METHODS = ('basic_parse', 'parse', 'items', 'kvitems')
+
+
+def _parse_document(backend_name, method, source, args, kwargs):
+    '''Parses a whole document, returning its results'''
+    backend = ijson.get_backend(backend_name)
+    return list(getattr(backend, method)(source, *args, **kwargs))
+
+
+def parse_many(sources, method='items', *args, workers=None, ordered=True, backend=None,
+               **kwargs):
+    '''
+    Parses many independent documents concurrently, yielding a list with the
+    results of ``method`` (one of ``basic_parse``, ``parse``, ``items`` or
+    ``kvitems``) for each of the ``sources``. Additional arguments are given
+    to ``method``.
+
+    Documents are parsed by a pool of ``workers`` threads (as many as CPUs
+    by default) using the named ``backend`` (the current one by default),
+    each with its own parser. Threads run fully in parallel on free-threaded
+    builds of Python, and otherwise still tokenize documents at the same time
+    with the C backend. See ``ijson.interpreters`` for parsing files in
+    sub-interpreters instead. Results are yielded in the order of ``sources``
+    if ``ordered`` is true, otherwise as soon as they are available. At most
+    two documents per worker are parsed ahead of the results being consumed.
+    '''
+    if method not in _MANY_METHODS:
+        raise ValueError("method must be one of %s" % ', '.join(_MANY_METHODS))
+    workers = workers or os.cpu_count() or 1
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+        calls = (
+            (_parse_document, backend or ijson.backend, method, source, args, kwargs)
+            for source in sources
+        )
+        yield from _parallel_results(executor, calls, workers, ordered)
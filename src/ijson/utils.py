@@ -66,4 +66,32 @@ def coros2gen(source, *coro_pipeline):
         try:
             f.close()
         except:
-            pass
\ No newline at end of file
+            pass
+
+
+def coros2batches(source, *coro_pipeline):
+    '''
+    Like coros2gen, but the returned generator yields lists with all the values
+    dispatched by the coroutine pipeline after receiving each value coming
+    from `source`.
+    '''
+    events = sendable_list()
+    f = chain(events, *coro_pipeline)
+    try:
+        for value in source:
+            try:
+                f.send(value)
+            except Exception as ex:
+                if events:
+                    yield events
+                if isinstance(ex, StopIteration):
+                    return
+                raise
+            if events:
+                yield events[:]
+                del events[:]
+    except GeneratorExit:
+        try:
+            f.close()
+        except:
+            pass
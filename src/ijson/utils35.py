@@ -63,6 +63,29 @@ class async_iterable:
                 raise StopAsyncIteration
 
 
+class async_batches_iterable(async_iterable):
+    '''
+    Like async_iterable, but the async iterator returns lists with all the
+    values dispatched by the coroutine pipeline after receiving each chunk
+    of data.
+    '''
+
+    async def __anext__(self):
+        if not self.read:
+            self.read = await _get_read(self.f)
+        while not self.events:
+            if self.coro_finished:
+                raise StopAsyncIteration
+            data = await self.read(self.buf_size)
+            try:
+                self.coro.send(data)
+            except StopIteration:
+                self.coro_finished = True
+        batch = list(self.events)
+        self.events.clear()
+        return batch
+
+
 def _make_basic_parse_async(backend):
     def basic_parse_async(f, buf_size=64*1024, **config):
         return async_iterable(f, buf_size,
@@ -78,15 +101,19 @@ def _make_parse_async(backend):
     return parse_async
 
 def _make_items_async(backend):
-    def items_async(f, prefix, map_type=None, buf_size=64*1024, **config):
-        return async_iterable(f, buf_size,
-            *common._items_pipeline(backend, prefix, map_type, config)
+    def items_async(f, prefix=None, map_type=None, buf_size=64*1024, prefixes=None,
+                    wildcards=False, fields=None, where=None, batch=False, **config):
+        iterable = async_batches_iterable if batch else async_iterable
+        return iterable(f, buf_size,
+            *common._items_pipeline(backend, prefix, map_type, prefixes, wildcards, fields, where, config)
         )
     return items_async
 
 def _make_kvitems_async(backend):
-    def kvitems_async(f, prefix, map_type=None, buf_size=64*1024, **config):
-        return async_iterable(f, buf_size,
-            *common._kvitems_pipeline(backend, prefix, map_type, config)
+    def kvitems_async(f, prefix, map_type=None, buf_size=64*1024, keys=None, batch=False,
+                      **config):
+        iterable = async_batches_iterable if batch else async_iterable
+        return iterable(f, buf_size,
+            *common._kvitems_pipeline(backend, prefix, map_type, keys, config)
         )
     return kvitems_async
\ No newline at end of file
@@ -0,0 +1,123 @@
+"""Tests for the ijson.asyncio module"""
+
+import asyncio
+import socket
+
+import pytest
+
+from ijson import common
+from ijson.asyncio import JSONStreamProtocol
+
+from .test_base import JSON, JSON_OBJECT, JSON_KVITEMS
+
+
+class FakeTransport:
+
+    def __init__(self):
+        self.paused = False
+        self.pauses = 0
+        self.closed = False
+
+    def pause_reading(self):
+        self.paused = True
+        self.pauses += 1
+
+    def resume_reading(self):
+        self.paused = False
+
+    def close(self):
+        self.closed = True
+
+
+def _protocol(backend, *args, **kwargs):
+    protocol = JSONStreamProtocol(*args, backend=backend.backend_name, **kwargs)
+    transport = FakeTransport()
+    protocol.connection_made(transport)
+    return protocol, transport
+
+
+def _receive(protocol, data):
+    """Receives data like a transport does, in as many buffers as needed"""
+    while data:
+        buffer = protocol.get_buffer(-1)
+        n = min(len(buffer), len(data))
+        buffer[:n] = data[:n]
+        protocol.buffer_updated(n)
+        data = data[n:]
+
+
+async def _consume(protocol):
+    return [result async for result in protocol]
+
+
+def test_protocol(backend):
+    protocol, _ = _protocol(backend, 'kvitems', 'docs.item', buf_size=7)
+    _receive(protocol, JSON)
+    protocol.eof_received()
+    protocol.connection_lost(None)
+    assert JSON_KVITEMS == asyncio.run(_consume(protocol))
+
+
+def test_backpressure(backend):
+    """Reading is paused while too many results are pending"""
+    protocol, transport = _protocol(backend, 'items', 'item', max_pending=4)
+    _receive(protocol, b'[1, 2, 3, 4, 5, 6')
+    assert transport.paused
+
+    async def consume():
+        results = [await protocol.__anext__() for _ in range(2)]
+        assert transport.paused
+        results.append(await protocol.__anext__())
+        assert not transport.paused
+        _receive(protocol, b', 7]')
+        protocol.connection_lost(None)
+        return results + await _consume(protocol)
+    assert [1, 2, 3, 4, 5, 6, 7] == asyncio.run(consume())
+
+
+def test_invalid(backend):
+    """Errors are raised after all previous results, and close the transport"""
+    protocol, transport = _protocol(backend, 'items', 'item')
+    _receive(protocol, b'[1, 2, ]')
+    assert transport.closed
+    protocol.connection_lost(None)
+
+    async def consume():
+        results = []
+        with pytest.raises(common.JSONError):
+            async for result in protocol:
+                results.append(result)
+        return results
+    assert [1, 2] == asyncio.run(consume())
+
+
+def test_connection_errors(backend):
+    protocol, _ = _protocol(backend, 'items', 'item')
+    _receive(protocol, b'[1, 2')
+    protocol.connection_lost(ConnectionResetError())
+    with pytest.raises(ConnectionResetError):
+        asyncio.run(_consume(protocol))
+
+
+def test_incomplete(backend):
+    protocol, _ = _protocol(backend, 'items', 'item')
+    _receive(protocol, b'[1, 2')
+    protocol.connection_lost(None)
+    with pytest.raises(common.IncompleteJSONError):
+        asyncio.run(_consume(protocol))
+
+
+def test_socket(backend):
+    """Results are received while data is streamed through a socket"""
+    async def stream():
+        loop = asyncio.get_running_loop()
+        ours, theirs = socket.socketpair()
+        with theirs:
+            _, protocol = await loop.connect_accepted_socket(
+                lambda: JSONStreamProtocol('items', '', buf_size=16, backend=backend.backend_name),
+                ours,
+            )
+            theirs.setblocking(False)
+            await loop.sock_sendall(theirs, JSON)
+        return await _consume(protocol)
+    assert [JSON_OBJECT] == asyncio.run(stream())
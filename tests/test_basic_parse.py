@@ -172,3 +172,66 @@ def test_multiple_values(adaptor):
         adaptor.basic_parse(multiple_json, multiple_values=False)
     result = adaptor.basic_parse(multiple_json, multiple_values=True)
     assert JSON_EVENTS + JSON_EVENTS + JSON_EVENTS == result
+
+
+@pytest.mark.parametrize("buf_size", (3, 64 * 1024))
+@pytest.mark.parametrize("batch_size", (None, 1, 5, 1000))
+def test_basic_parse_batched(backend, buf_size, batch_size):
+    batches = list(backend.basic_parse_batched(JSON, batch_size=batch_size, buf_size=buf_size))
+    assert all(batches)
+    if batch_size is not None:
+        assert all(len(batch) == batch_size for batch in batches[:-1])
+        assert len(batches[-1]) <= batch_size
+    assert JSON_EVENTS == list(itertools.chain.from_iterable(batches))
+
+
+def test_basic_parse_batched_invalid_batch_size(backend):
+    with pytest.raises(ValueError):
+        backend.basic_parse_batched(JSON, batch_size=0)
+
+
+@pytest.mark.parametrize("batch_size", (None, 2))
+def test_basic_parse_batched_yields_before_error(backend, batch_size):
+    events = []
+    with pytest.raises(common.JSONError):
+        for batch in backend.basic_parse_batched(b'[1, 2, 3, }', batch_size=batch_size):
+            events.extend(batch)
+    assert [('start_array', None), ('number', 1), ('number', 2), ('number', 3)] == events
+
+
+def _event_depths(events):
+    depth = 0
+    for event, _ in events:
+        if event in ('end_map', 'end_array'):
+            depth -= 1
+        yield depth
+        if event in ('start_map', 'start_array'):
+            depth += 1
+
+
+@pytest.mark.parametrize("buf_size", (3, 64 * 1024))
+def test_basic_parse_columnar(backend, buf_size):
+    batches = list(backend.basic_parse_columnar(JSON, buf_size=buf_size))
+    assert all(codes for codes, _, _ in batches)
+    assert all(depths is None for _, depths, _ in batches)
+    events = [
+        (common.EVENT_NAMES[code], value)
+        for codes, _, values in batches
+        for code, value in zip(codes, values)
+    ]
+    assert JSON_EVENTS == events
+
+
+def test_basic_parse_columnar_depths(backend):
+    batches = list(backend.basic_parse_columnar(JSON, depths=True, buf_size=5))
+    assert all(len(codes) == len(depths) == len(values) for codes, depths, values in batches)
+    depths = list(itertools.chain.from_iterable(depths for _, depths, _ in batches))
+    assert list(_event_depths(JSON_EVENTS)) == depths
+
+
+def test_basic_parse_columnar_yields_before_error(backend):
+    values = []
+    with pytest.raises(common.JSONError):
+        for _, _, batch_values in backend.basic_parse_columnar(b'[1, 2, 3, }'):
+            values.extend(batch_values)
+    assert [None, 1, 2, 3] == values
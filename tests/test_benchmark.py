@@ -34,6 +34,9 @@ def test_benchmark(method, input_type):
     extra_args = {"gen": [], "coro": ["-c"], "async": ["-a"]}
     _do_test_benchmark(method, extra_args=extra_args[input_type])
 
+def test_workers():
+    _do_test_benchmark(extra_args=['-w', '1,2'])
+
 def test_list():
     _do_test_benchmark(extra_args=['-l'])
 
@@ -0,0 +1,106 @@
+"""Tests for the decompression of compressed inputs"""
+
+import bz2
+import gzip
+import io
+import lzma
+import subprocess
+import sys
+import threading
+import time
+
+import pytest
+
+from ijson import common
+
+from .test_base import JSON, JSON_OBJECT, JSON_EVENTS
+
+
+COMPRESSORS = {
+    'gzip': gzip.compress,
+    'bz2': bz2.compress,
+    'xz': lzma.compress,
+}
+
+
+@pytest.fixture(params=sorted(COMPRESSORS))
+def compression(request):
+    return request.param
+
+
+@pytest.fixture
+def compressed(compression):
+    return COMPRESSORS[compression](JSON)
+
+
+def _sources(data, tmp_path):
+    path = tmp_path / 'test.json.z'
+    path.write_bytes(data)
+    return (
+        data,
+        io.BytesIO(data),
+        path,
+        iter([data[:3], data[3:]]),
+    )
+
+
+@pytest.mark.parametrize("auto", [True, False])
+def test_sources(backend, compression, compressed, tmp_path, auto):
+    """All kinds of sources can be decompressed"""
+    for source in _sources(compressed, tmp_path):
+        value = 'auto' if auto else compression
+        results = list(backend.items(source, '', compression=value, buf_size=5))
+        assert [JSON_OBJECT] == results
+
+
+def test_entry_points(backend, compressed):
+    assert JSON_EVENTS == list(backend.basic_parse(compressed, compression='auto'))
+    assert [JSON_OBJECT] == list(backend.items(compressed, '', compression='auto'))
+    assert list(backend.kvitems(JSON, 'docs.item')) == list(backend.kvitems(compressed, 'docs.item', compression='auto'))
+
+
+def test_concatenated_streams(backend, compression):
+    """Several streams (or members, or frames) are decompressed one after the other"""
+    compress = COMPRESSORS[compression]
+    compressed = compress(JSON[:10]) + compress(JSON[10:])
+    assert [JSON_OBJECT] == list(backend.items(compressed, '', compression='auto', buf_size=7))
+
+
+def test_auto_uncompressed(backend, tmp_path):
+    """Uncompressed data is parsed as it is"""
+    for source in _sources(JSON, tmp_path):
+        assert [JSON_OBJECT] == list(backend.items(source, '', compression='auto'))
+
+
+def test_truncated(backend, compression, compressed):
+    with pytest.raises((EOFError, common.IncompleteJSONError)):
+        list(backend.items(compressed[:-10], '', compression=compression))
+
+
+def test_wrong_compression(backend, compressed):
+    with pytest.raises(ValueError):
+        backend.items(compressed, '', compression='lz4')
+    with pytest.raises(OSError):
+        list(backend.items(gzip.compress(JSON), '', compression='bz2'))
+
+
+def test_early_stop(backend):
+    """The background thread stops when results are not consumed anymore"""
+    threads = threading.active_count()
+    results = backend.parse(gzip.compress(JSON * 1000), multiple_values=True,
+                            compression='gzip', buf_size=16)
+    next(results)
+    del results
+    for _ in range(50):
+        if threading.active_count() == threads:
+            break
+        time.sleep(0.1)
+    assert threads == threading.active_count()
+
+
+
+def test_lazy_imports():
+    """Decompression modules are not imported together with ijson"""
+    code = "import sys, ijson; print(' '.join(m for m in ('bz2', 'lzma', 'zlib') if m in sys.modules))"
+    out = subprocess.check_output([sys.executable, '-c', code])
+    assert b'' == out.strip()
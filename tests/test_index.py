@@ -0,0 +1,100 @@
+"""Tests for the ijson.index module"""
+
+import io
+import json
+
+import pytest
+
+from ijson import common, index
+
+from .test_base import JSON, JSON_OBJECT
+
+
+try:
+    from ijson.backends import yajl2_c
+except ImportError:
+    yajl2_c = None
+
+pytestmark = pytest.mark.skipif(yajl2_c is None, reason="Building indices requires yajl2_c")
+
+
+ARRAYS = b'''{
+  "meta": {"item": [1, 2]},
+  "values": [ {"id": 0, "text": "caf\xc3\xa9 \\" ]"}, 1 ,"two", [3, [4]], {"id": 4},
+    null, true, -7.5e3 , {"nested": [5, 6]} , 9
+  ],
+  "groups": [[10, 11, 12], [], [13], [14, 15]]
+}'''
+VALUES = json.loads(ARRAYS)['values']
+
+
+@pytest.mark.parametrize("every", [1, 2, 3, 100])
+@pytest.mark.parametrize("buf_size", [1, 5, 64 * 1024])
+def test_items(every, buf_size):
+    """Any range of items can be read from an index"""
+    idx = index.build(io.BytesIO(ARRAYS), 'values.item', every=every, buf_size=buf_size)
+    f = io.BytesIO(ARRAYS)
+    for start in range(len(VALUES) + 1):
+        for stop in [None] + list(range(start, len(VALUES) + 2)):
+            values = list(index.items(f, 'values.item', idx, start, stop, use_float=True))
+            assert VALUES[start:stop] == values
+
+
+def test_checkpoints():
+    """Every Nth item and the first item of each array is a checkpoint"""
+    idx = index.build(io.BytesIO(ARRAYS), 'groups.item.item', every=2)
+    assert [0, 2, 3, 4] == [number for number, _, _ in idx.checkpoints]
+    for number, offset, end in idx.checkpoints:
+        assert ARRAYS[end - 1:end] == b']'
+        assert ARRAYS[offset - 1:offset] == b'[' or ARRAYS[offset:].lstrip()[:1] == b','
+
+
+def test_items_across_arrays():
+    """Ranges of items can span several arrays under the same prefix"""
+    idx = index.build(io.BytesIO(ARRAYS), 'groups.item.item', every=2)
+    f = io.BytesIO(ARRAYS)
+    assert [11, 12, 13, 14] == list(index.items(f, 'groups.item.item', idx, 1, 5))
+    assert [13, 14, 15] == list(index.items(f, 'groups.item.item', idx, 3))
+
+
+def test_no_items():
+    """Values under a prefix that are not array items are not indexed"""
+    idx = index.build(io.BytesIO(ARRAYS), 'meta.item')
+    assert [] == idx.checkpoints
+    assert [] == list(index.items(io.BytesIO(ARRAYS), 'meta.item', idx))
+
+
+def test_multiple_values():
+    """Arrays in multiple top-level values are indexed"""
+    data = b'[1, 2, 3] {"a": 4} ["x", "y"]'
+    idx = index.build(io.BytesIO(data), 'item', every=2, multiple_values=True)
+    assert [1, 2, 3, 'x', 'y'] == list(index.items(io.BytesIO(data), 'item', idx))
+    assert [3, 'x'] == list(index.items(io.BytesIO(data), 'item', idx, 2, 4))
+
+
+def test_save_and_load(tmp_path):
+    """Indices are saved into, and read back from, sidecar files"""
+    path = str(tmp_path / 'test.idx')
+    idx = index.build(io.BytesIO(JSON), 'docs.item', path, every=1)
+    loaded = index.Index.load(path)
+    assert idx.prefix == loaded.prefix
+    assert idx.every == loaded.every
+    assert idx.checkpoints == loaded.checkpoints
+    docs = list(index.items(io.BytesIO(JSON), 'docs.item', path, 2))
+    assert JSON_OBJECT['docs'][2:] == docs
+
+
+def test_invalid_arguments():
+    """Indices are built with a positive step and used with their prefix"""
+    with pytest.raises(ValueError):
+        index.build(io.BytesIO(ARRAYS), 'values.item', every=0)
+    idx = index.build(io.BytesIO(ARRAYS), 'values.item')
+    with pytest.raises(ValueError):
+        list(index.items(io.BytesIO(ARRAYS), 'groups.item', idx))
+
+
+def test_truncated_file():
+    """Files shorter than their index are reported"""
+    idx = index.build(io.BytesIO(ARRAYS), 'values.item')
+    with pytest.raises(common.IncompleteJSONError):
+        list(index.items(io.BytesIO(ARRAYS[:60]), 'values.item', idx, use_float=True))
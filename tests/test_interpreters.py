@@ -0,0 +1,71 @@
+"""Tests for the ijson.interpreters module"""
+
+import decimal
+import json
+
+import pytest
+
+import ijson
+from ijson import common, interpreters
+
+
+DOCUMENTS = [
+    [{"id": i * 10 + j, "value": j / 4, "tags": ["t%d" % k for k in range(j % 3)]} for j in range(10)]
+    for i in range(8)
+]
+
+
+@pytest.fixture
+def paths(tmp_path):
+    paths = []
+    for i, document in enumerate(DOCUMENTS):
+        path = tmp_path / ('%d.json' % i)
+        path.write_bytes(json.dumps(document).encode('utf-8'))
+        paths.append(str(path))
+    return paths
+
+
+@pytest.mark.parametrize("results", [
+    [1, 2.5, "three", None, True, {"a": [1, {"b": False}]}],
+    [decimal.Decimal('2.5'), {"a": decimal.Decimal('1e3')}],
+])
+def test_serialization(results):
+    """Results are serialized with marshal when possible, else with pickle"""
+    serialized = interpreters._dumps(results)
+    assert ('pickle' if isinstance(results[0], decimal.Decimal) else 'marshal') == serialized[0]
+    assert results == interpreters._loads(serialized)
+
+
+def test_items_file(paths):
+    serialized = interpreters._items_file(ijson.backend, paths[0], 'item.tags.item', 64 * 1024, {})
+    assert list(ijson.items(json.dumps(DOCUMENTS[0]), 'item.tags.item')) == interpreters._loads(serialized)
+
+
+@pytest.mark.skipif(interpreters.InterpreterPoolExecutor is None,
+                    reason="Sub-interpreter pools require Python 3.14+")
+class TestItemsMany:
+
+    def test_items_many(self, paths):
+        """Items are yielded in the order of the files"""
+        expected = [item for document in DOCUMENTS for item in document]
+        assert expected == list(interpreters.items_many(paths, 'item', workers=3, use_float=True))
+
+    def test_items_many_unordered(self, paths):
+        items = interpreters.items_many(paths, 'item.id', workers=3, ordered=False)
+        assert list(range(80)) == sorted(items)
+
+    def test_items_many_invalid(self, tmp_path, paths):
+        from concurrent.futures import interpreter
+        # exceptions that can't be sent across interpreters are wrapped
+        errors = (common.JSONError, getattr(interpreter, 'ExecutionFailed', common.JSONError))
+        invalid = tmp_path / 'invalid.json'
+        invalid.write_bytes(b'[1, ]')
+        with pytest.raises(errors):
+            list(interpreters.items_many(paths[:2] + [str(invalid)], 'item', workers=2))
+
+
+@pytest.mark.skipif(interpreters.InterpreterPoolExecutor is not None,
+                    reason="Sub-interpreter pools are available")
+def test_items_many_unavailable(paths):
+    with pytest.raises(RuntimeError):
+        list(interpreters.items_many(paths, 'item'))
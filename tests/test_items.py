@@ -1,8 +1,13 @@
 """Tests for the ijson.items method"""
 
+import array
 import collections
+import json
 import pytest
+from decimal import Decimal
 
+from .support._async_common import _aiorun
+from .support.async_ import AsyncReader
 from .test_base import ARRAY_JSON, ARRAY_JSON_OBJECT, EMPTY_MEMBER_TEST_CASES, JSON, JSON_OBJECT
 
 from ijson import JSONError
@@ -37,6 +42,178 @@ def test_items_with_dotted_name(adaptor, json, prefix, expected_items):
     assert expected_items == adaptor.items(json, prefix)
 
 
+@pytest.mark.parametrize(
+    "json, prefix, expected_items",
+    (
+        (b'{"a": {"b": [1, {"c": 2}]}, "b": [3]}', 'b.item', [3]),
+        (b'{"a": {"b": [1, {"c": 2}]}, "b": [3]}', 'a.b.item.c', [2]),
+        (b'{"a": [{"b": 1}, [{"b": 2}]], "ab": {"b": 3}}', 'a.item.b', [1]),
+        (b'{"a": [[0], {"a": 1}], "b": 2}', 'a.item.a', [1]),
+        (b'{"": {"": 0}}', '.', [0]),
+        (b'[{"a": 0}, [{"a": 1}], {"b": {"a": 2}}]', 'item.a', [0]),
+        (b'{"a": {"b": null}, "a.b": {"c": true}}', 'a.b', [None, {"c": True}]),
+        (b'{"\\u00f1": {"a": 1}, "n": {"a": 2}}', '\u00f1.a', [1]),
+    )
+)
+def test_items_skipped_members(adaptor, json, prefix, expected_items):
+    assert expected_items == adaptor.items(json, prefix)
+
+
+@pytest.mark.parametrize(
+    "json, prefixes, expected_items",
+    (
+        (b'{"a": 0, "b": [1, {"c": 2}], "c": 3}', ['a', 'b.item.c'], [('a', 0), ('b.item.c', 2)]),
+        (b'{"a": [{"b": 1}, {"b": 2}], "c": {"d": 3}}', ('a.item', 'c'), [('a.item', {"b": 1}), ('a.item', {"b": 2}), ('c', {"d": 3})]),
+        (b'{"a": {"b": 1}, "c": 2}', {'a', 'a.b'}, [('a', {"b": 1})]),
+        (b'[1, [2], {"a": 3}]', ['item', 'item.a'], [('item', 1), ('item', [2]), ('item', {"a": 3})]),
+        (b'{"a": 0}', [], []),
+    )
+)
+def test_items_multiple_prefixes(adaptor, json, prefixes, expected_items):
+    assert expected_items == adaptor.items(json, prefixes=prefixes)
+
+
+def test_items_prefix_required(adaptor):
+    """Either prefix or prefixes must be given"""
+    with pytest.raises(TypeError):
+        adaptor.items(b'[1, 2]')
+
+
+def test_items_prefix_required_entry_points(backend):
+    with pytest.raises(TypeError):
+        backend.items(b'[1, 2]')
+    with pytest.raises(TypeError):
+        backend.Parser('items')
+
+
+@pytest.mark.parametrize(
+    "json, prefix, fields, expected_items",
+    (
+        (b'[{"id": 1, "payload": {"a": [1, 2]}, "owner": {"name": "x", "age": 2}}]', 'item',
+         ['id', 'owner.name'], [{"id": 1, "owner": {"name": "x"}}]),
+        (b'[{"id": 1, "tags": [{"name": "a", "v": 1}, 2]}, {"id": 2}]', 'item',
+         ['tags.item.name'], [{"tags": [{"name": "a"}]}, {}]),
+        (b'[{"owner": "x"}, 3, [4]]', 'item', ['owner.name'], [{}, 3, []]),
+        (b'{"a": {"b": 1, "b.c": 2, "d": 3}}', 'a', ['b.c'], [{"b.c": 2}]),
+        (b'{"a": {"b": 1, "c": 2}}', 'a', [], [{}]),
+        (b'{"a": {"b": 1, "c": 2}}', 'a', [''], [{"b": 1, "c": 2}]),
+    )
+)
+def test_items_fields(adaptor, json, prefix, fields, expected_items):
+    assert expected_items == adaptor.items(json, prefix, fields=fields)
+
+
+def test_items_fields_events(backend):
+    events = backend.parse(b'[{"a": 0, "b": {"c": 1, "d": 2}}]')
+    assert [{"b": {"d": 2}}] == list(backend.items(events, 'item', fields=['b.d']))
+
+
+def test_items_fields_wildcards(adaptor):
+    json = b'{"x": {"a": 1, "b": 2}, "y": {"a": 3, "c": 4}}'
+    assert [{"a": 1}, {"a": 3}] == adaptor.items(json, '*', wildcards=True, fields=['a'])
+
+
+@pytest.mark.parametrize("fields", ('a', ['a', 1]))
+def test_items_invalid_fields(backend, fields):
+    with pytest.raises(TypeError):
+        next(backend.items(b'{"a": 0}', 'a', fields=fields))
+
+
+@pytest.mark.parametrize(
+    "where, expected_ids",
+    (
+        ({'status': 'failed'}, [1, 3, 5]),
+        ({'status': {'==': 'failed'}, 'size': {'>=': 10, '<': 100}}, [1]),
+        ({'id': {'in': [2, 3, 6]}}, [2, 3, 6]),
+        ({'status': {'!=': 'failed'}}, [2]),
+        ({'owner.name': 'b'}, [2]),
+        ({'tags.item': {'>': 0}}, [3]),
+        ({'size': {'>': 6}}, [1, 3]),
+        ({}, [1, 2, 3, 4, 5, 6]),
+    )
+)
+def test_items_where(adaptor, where, expected_ids):
+    json = b'''[
+        {"id": 1, "status": "failed", "size": 10, "owner": {"name": "a"}},
+        {"id": 2, "status": "ok", "size": 5, "owner": {"name": "b"}},
+        {"id": 3, "size": 100, "status": "failed", "tags": [1, 2]},
+        {"id": 4, "status": ["failed"], "tags": [0, 1]},
+        {"status": "failed", "id": 5, "size": "big"},
+        {"id": 6, "status": "failed", "status": "ok"}
+    ]'''
+    assert expected_ids == [item['id'] for item in adaptor.items(json, 'item', where=where)]
+
+
+def test_items_where_scalars(adaptor):
+    assert [1, 3] == adaptor.items(b'[1, 2, {"a": 3}, 3, [4]]', 'item', where={'': {'in': [1, 3]}})
+
+
+def test_items_where_fields(adaptor):
+    json = b'[{"id": 1, "a": {"b": 1, "c": 2}}, {"id": 2, "a": {"b": 2}}]'
+    assert [{"id": 2}] == adaptor.items(json, 'item', fields=['id'], where={'a.b': 2})
+
+
+def test_items_where_events(backend):
+    events = backend.parse(b'[{"a": 0, "b": 1}, {"a": 1, "b": 2}]')
+    assert [{"a": 1, "b": 2}] == list(backend.items(events, 'item', where={'a': 1}))
+
+
+@pytest.mark.parametrize(
+    "where, exception",
+    (
+        ('a', TypeError),
+        ({'a': [1]}, TypeError),
+        ({1: 1}, TypeError),
+        ({'a': {'~': 1}}, ValueError),
+        ({'a': {'in': 'abc'}}, TypeError),
+    )
+)
+def test_items_invalid_where(backend, where, exception):
+    with pytest.raises(exception):
+        next(backend.items(b'[{"a": 0}]', 'item', where=where))
+
+
+def test_items_multiple_prefixes_events(backend):
+    events = backend.parse(b'{"a": 0, "b": [1, {"c": 2}]}')
+    assert [('a', 0), ('b.item.c', 2)] == list(backend.items(events, prefixes=['a', 'b.item.c']))
+
+
+def test_items_prefix_and_prefixes(backend):
+    with pytest.raises(ValueError):
+        next(backend.items(b'{"a": 0}', 'a', prefixes=['a']))
+
+
+def test_items_string_prefixes(backend):
+    with pytest.raises(TypeError):
+        next(backend.items(b'{"a": 0}', prefixes='a'))
+
+
+@pytest.mark.parametrize(
+    "json, prefix, expected_items",
+    (
+        (b'{"data": {"t1": {"tags": [1, 2]}, "t2": {"tags": [3]}}}', 'data.*.tags.item', [1, 2, 3]),
+        (b'{"id": 0, "a": [{"id": 1}, {"b": {"id": 2}}]}', '**.id', [0, 1, 2]),
+        (b'{"a": {"b": {"c": 1}}, "c": 2}', 'a.**.c', [1]),
+        (b'{"a": [1, 2], "b": {"c": 3}}', 'a.*', [1, 2]),
+        (b'{"*": 1, "a": 2}', '*', [1, 2]),
+        (b'{"a.b": 1, "a": {"b": 2}}', 'a.b', [2]),
+        (b'[1, 2]', '**', [[1, 2]]),
+    )
+)
+def test_items_wildcards(adaptor, json, prefix, expected_items):
+    assert expected_items == adaptor.items(json, prefix, wildcards=True)
+
+
+def test_items_multiple_wildcards(adaptor):
+    json = b'{"a": {"x": 1, "y": {"id": 2}}, "b": {"id": 3}}'
+    expected = [('a.x', 1), ('**.id', 2), ('**.id', 3)]
+    assert expected == adaptor.items(json, prefixes=['a.x', '**.id'], wildcards=True)
+
+
+def test_items_wildcards_literal_by_default(adaptor):
+    assert [1] == adaptor.items(b'{"*": 1, "a": 2}', '*')
+
+
 def test_map_type(adaptor):
     obj = adaptor.items(JSON, '')[0]
     assert isinstance(obj, dict)
@@ -44,6 +221,21 @@ def test_map_type(adaptor):
     assert isinstance(obj, collections.OrderedDict)
 
 
+def test_items_repeated_keys(adaptor):
+    keys = ['k%d' % i for i in range(1000)] + ['\u00f1%d' % i for i in range(10)] + ['x' * 100]
+    objects = [{key: i for key in keys[i % 7::7]} for i in range(30)]
+    json_bytes = json.dumps(objects).encode('utf-8')
+    assert objects == adaptor.items(json_bytes, 'item')
+
+
+def test_map_type_errors(adaptor):
+    class FailingDict(dict):
+        def __setitem__(self, key, value):
+            raise ValueError("failing")
+    with pytest.raises(ValueError, match="failing"):
+        adaptor.items(JSON, '', map_type=FailingDict)
+
+
 @pytest.mark.parametrize("test_case", [
     pytest.param(value, id=name) for name, value in EMPTY_MEMBER_TEST_CASES.items()
 ])
@@ -96,3 +288,113 @@ def test_user_events(backend):
         ('', 'end_array', None),
     ]
     assert [[]] == list(backend.items(embedded_empty_list_events, 'item'))
+
+
+@pytest.mark.parametrize(
+    "json, prefix, dtype, expected",
+    (
+        (b'{"a": [1, 2.5, -3]}', 'a', 'f8', [[1.0, 2.5, -3.0]]),
+        (b'{"a": [[1, 2], [3, 4], [5, 6]]}', 'a', 'i4', [[[1, 2], [3, 4], [5, 6]]]),
+        (b'[[1, 2], [3], []]', 'item', 'u1', [[1, 2], [3], []]),
+        (b'{"a": 1, "b": {"a": 2}}', 'a', 'i8', [1]),
+        (b'[{"c": [1, 2]}, {"d": [3]}, {"c": [1e2, 2.0]}]', 'item.c', 'q', [[1, 2], [100, 2]]),
+        (b'[0, 1.5]', '', 'f', [[0.0, 1.5]]),
+    )
+)
+def test_numeric_items(backend, json, prefix, dtype, expected):
+    results = list(backend.numeric_items(json, prefix, dtype=dtype, buf_size=3))
+    assert expected == [result.tolist() for result in results]
+
+
+def test_numeric_items_shape(backend):
+    results = list(backend.numeric_items(b'{"a": [[[1], [2], [3]], [[4], [5], [6]]], "b": 7}', 'a'))
+    assert [(2, 3, 1)] == [tuple(result.shape) for result in results]
+    results = list(backend.numeric_items(b'{"a": [[[1], [2], [3]], [[4], [5], [6]]], "b": 7}', 'b'))
+    assert [()] == [tuple(result.shape) for result in results]
+
+
+@pytest.mark.parametrize(
+    "json",
+    (
+        b'[[1, 2], [3]]',
+        b'[1, [2]]',
+        b'[[1], 2]',
+        b'[[[]], [1]]',
+    )
+)
+def test_numeric_items_not_rectangular(backend, json):
+    with pytest.raises(ValueError):
+        list(backend.numeric_items(json, ''))
+
+
+@pytest.mark.parametrize("json", (b'[1, null]', b'[true]', b'["1"]', b'{"a": 1}'))
+def test_numeric_items_non_numeric(backend, json):
+    with pytest.raises(ValueError):
+        list(backend.numeric_items(json, ''))
+
+
+@pytest.mark.parametrize(
+    "json, dtype, exception",
+    (
+        (b'[1.5]', 'i8', ValueError),
+        (b'[256]', 'u1', OverflowError),
+        (b'[-1]', 'u8', OverflowError),
+        (b'[18446744073709551616]', 'u8', OverflowError),
+    )
+)
+def test_numeric_items_invalid_numbers(backend, json, dtype, exception):
+    with pytest.raises(exception):
+        list(backend.numeric_items(json, '', dtype=dtype))
+
+
+def test_numeric_items_invalid_dtype(backend):
+    with pytest.raises(ValueError):
+        backend.numeric_items(b'[1]', '', dtype='f16')
+
+
+@pytest.mark.parametrize(
+    "json, prefix, fields, expected",
+    (
+        (b'[{"a": 1, "b": 2}, {"a": 3, "b": 4}]', 'item', None, {'a': [1, 3], 'b': [2, 4]}),
+        (b'[{"a": 1}, {"b": "x"}, {"a": null}]', 'item', None, {'a': [1, None, None], 'b': [None, 'x', None]}),
+        (b'[{"a": 1, "b": 2}, {"a": 3, "c": 4}]', 'item', ['a', 'z'], {'a': [1, 3], 'z': [None, None]}),
+        (b'[{"a": [1, {"b": 2}]}, {"a": {}}]', 'item', None, {'a': [[1, {'b': 2}], {}]}),
+        (b'[{"a": 1, "a": 2}, 3, [{"a": 4}]]', 'item', None, {'a': [2]}),
+        (b'{"rows": [{"a": true}, {"a": 1}]}', 'rows.item', None, {'a': [True, 1]}),
+        (b'[]', 'item', None, {}),
+        (b'[]', 'item', ['a'], {'a': []}),
+    )
+)
+def test_columns(backend, json, prefix, fields, expected):
+    columns = backend.columns(json, prefix, fields, buf_size=3)
+    assert expected == {name: list(column) for name, column in columns.items()}
+
+
+def test_columns_types(backend):
+    json = b'[{"i": 1, "f": 1, "d": 1.5, "s": "x"}, {"i": 2, "f": 2.5, "d": 2, "s": 1}]'
+    columns = backend.columns(json, 'item')
+    assert array.array('q', [1, 2]) == columns['i']
+    assert [1, Decimal('2.5')] == columns['f']
+    assert ['x', 1] == columns['s']
+    columns = backend.columns(json, 'item', use_float=True)
+    assert array.array('q', [1, 2]) == columns['i']
+    assert array.array('d', [1.0, 2.5]) == columns['f']
+    assert array.array('d', [1.5, 2.0]) == columns['d']
+    assert ['x', 1] == columns['s']
+
+
+def test_columns_invalid_fields(backend):
+    with pytest.raises(TypeError):
+        backend.columns(b'[]', 'item', 'a')
+
+
+def test_items_async_batch(backend):
+    """Batches contain all items completed by each chunk"""
+    batches = []
+    async def run():
+        async for batch in backend.items_async(AsyncReader(ARRAY_JSON), 'item.docs.item', buf_size=50, batch=True):
+            batches.append(batch)
+    _aiorun(run())
+    assert len(batches) > 1
+    assert all(batches)
+    assert JSON_OBJECT['docs'] == [item for batch in batches for item in batch]
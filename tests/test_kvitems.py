@@ -1,5 +1,7 @@
 """Tests for the ijson.kvitems method"""
 
+from .support._async_common import _aiorun
+from .support.async_ import AsyncReader
 from .test_base import ARRAY_JSON, EMPTY_MEMBER_TEST_CASES, JSON, JSON_KVITEMS, JSON_KVITEMS_META, JSON_OBJECT
 
 import pytest
@@ -30,6 +32,34 @@ def test_kvitems_twodictlevels(adaptor):
     assert [{'id': -1}, {'id': -2}] == value
 
 
+def test_kvitems_skipped_members(adaptor):
+    json = b'{"a": {"b": {"c": 0}, "x": [{"b": {"c": 1}}]}, "a.b": {"d": [2]}}'
+    assert [('c', 0), ('d', [2])] == adaptor.kvitems(json, 'a.b')
+
+
+@pytest.mark.parametrize(
+    "keys, expected",
+    (
+        (['a', 'c'], [('a', 0), ('c', [{"a": 2}])]),
+        (['b.x'], [('b.x', 3)]),
+        ([], []),
+    )
+)
+def test_kvitems_keys(adaptor, keys, expected):
+    json = b'{"a": 0, "b": {"x": 1}, "c": [{"a": 2}], "b.x": 3}'
+    assert expected == adaptor.kvitems(json, '', keys=keys)
+
+
+def test_kvitems_keys_events(backend):
+    events = backend.parse(b'{"o": {"a": 0, "b": {"c": 1}, "d": 2}}')
+    assert [('b', {"c": 1}), ('d', 2)] == list(backend.kvitems(events, 'o', keys=['b', 'd']))
+
+
+def test_kvitems_string_keys(backend):
+    with pytest.raises(TypeError):
+        next(backend.kvitems(b'{"a": 0}', '', keys='a'))
+
+
 def test_kvitems_different_underlying_types(adaptor):
     assert JSON_KVITEMS_META == adaptor.kvitems(JSON, 'docs.item.meta')
 
@@ -72,3 +102,14 @@ def test_user_events(backend):
         ('', 'end_map', None),
     ]
     assert [('a', 0)] == list(backend.kvitems(int_element_parse_events, ''))
+
+
+def test_kvitems_async_batch(backend):
+    batches = []
+    async def run():
+        async for batch in backend.kvitems_async(AsyncReader(JSON), 'docs.item', buf_size=50, batch=True):
+            batches.append(batch)
+    _aiorun(run())
+    assert len(batches) > 1
+    assert all(batches)
+    assert JSON_KVITEMS == [kv for batch in batches for kv in batch]
@@ -40,7 +40,13 @@ def _memory_leak_detection():
             "basic_parse": lambda backend: backend.basic_parse_gen(io.BytesIO(b'[1, 2, 3, 4, 5]')),
             "parse": lambda backend: backend.parse_gen(io.BytesIO(b'[1, 2, 3, 4, 5]')),
             "items": lambda backend: backend.items_gen(io.BytesIO(b'[1, 2, 3, 4, 5]'), 'item'),
+            "items_chunks": lambda backend: backend.items(iter([b'[1, 2, ', b'', b'3, 4, 5]']), 'item'),
             "kvitems": lambda backend: backend.kvitems_gen(io.BytesIO(b'{"a": 0, "b": 1, "c": 2}'), ''),
+            "items_fields": lambda backend: backend.items_gen(io.BytesIO(b'[{"a": {"b": 1, "c": 2}, "d": 3}]'), 'item', fields=['a.b']),
+            "items_where": lambda backend: backend.items_gen(io.BytesIO(b'[{"a": 1, "b": [2]}, {"a": 2, "b": [3]}]'), 'item', where={'a': 2}),
+            "kvitems_keys": lambda backend: backend.kvitems_gen(io.BytesIO(b'{"a": 0, "b": 1, "c": 2}'), '', keys=['b']),
+            "numeric_items": lambda backend: backend.numeric_items_gen(io.BytesIO(b'[[1, 2], [3, 4]]'), '', 'd'),
+            "parser": lambda backend: backend.Parser('items', 'item').feed(b'[1, 2, 3, 4, 5]'),
         }.items()
     )
 )
@@ -49,6 +55,17 @@ def test_generator(backend, function, n, exhaust):
     _repeat(n, function, backend, exhaust=exhaust)
 
 
+
+@pytest.mark.parametrize("n", (100000,))
+def test_parser_reuse(backend, n):
+    """Tests that reusing a parser doesn't leak"""
+    parser = backend.Parser('items', 'item')
+    def parse_and_reset():
+        parser.feed(b'[{"a": 1}, {"b": [2]}]')
+        parser.close()
+        parser.reset()
+    _repeat(n, parse_and_reset)
+
 @pytest.mark.parametrize("n", (100000,))
 @pytest.mark.parametrize("invalid_construction",
     (
@@ -58,6 +75,7 @@ def test_generator(backend, function, n, exhaust):
             "parse": lambda backend: next(backend.parse_gen(io.BytesIO(b'[1, 2, 3, 4, 5]'), not_a_kwarg=0)),
             "items": lambda backend: next(backend.items_gen(io.BytesIO(b'[1, 2, 3, 4, 5]'), 'item', not_a_kwarg=0)),
             "kvitems": lambda backend: next(backend.kvitems_gen(io.BytesIO(b'{"a": 0, "b": 1, "c": 2}'), '', not_a_kwarg=0)),
+            "numeric_items": lambda backend: next(backend.numeric_items_gen(io.BytesIO(b'[[1, 2], [3, 4]]'), '', 'd', not_a_kwarg=0)),
         }.items()
     )
 )
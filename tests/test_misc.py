@@ -1,9 +1,17 @@
 import importlib.util
 import io
+import mmap
+import pathlib
+import subprocess
+import sys
+import tempfile
+import threading
+import tracemalloc
+import weakref
 
 import pytest
 
-from ijson import common
+from ijson import common, utils
 
 from tests.test_base import JSON, JSON_EVENTS, JSON_PARSE_EVENTS, JSON_OBJECT,\
     JSON_KVITEMS
@@ -22,6 +30,23 @@ class TestMisc:
             pytest.skip("yajl2_c is not built")
         importlib.util.module_from_spec(spec)
 
+    def test_yajl2_c_big_chunks_memory(self):
+        """Big chunks are parsed in slices, and the memory used for them is freed"""
+        spec = importlib.util.find_spec("ijson.backends._yajl2")
+        if spec is None:
+            pytest.skip("yajl2_c is not built")
+        from ijson.backends import yajl2_c
+        data = b'[' + b'1,' * (5 * 1024 * 1024) + b'1]'
+        coro = yajl2_c.items_coro(utils.sendable_list(), 'x')
+        tracemalloc.start()
+        try:
+            coro.send(data)
+            current, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        assert peak < 2 * 1024 * 1024
+        assert current < 256 * 1024
+
 
 class TestMainEntryPoints:
     """Tests that main API entry points work against different types of inputs automatically"""
@@ -36,13 +61,47 @@ class TestMainEntryPoints:
         assert expected_results == results
 
     def _assert_str(self, expected_results, routine, *args, **kwargs):
-        with pytest.deprecated_call():
-            results = list(routine(JSON.decode("utf-8"), *args, **kwargs))
+        results = list(routine(JSON.decode("utf-8"), *args, **kwargs))
+        assert expected_results == results
+
+    def _assert_buffers(self, expected_results, routine, *args, **kwargs):
+        for buffer in (bytearray(JSON), memoryview(JSON), memoryview(b'[]' + JSON)[2:]):
+            results = list(routine(buffer, *args, **kwargs))
+            assert expected_results == results
 
     def _assert_file(self, expected_results, routine, *args, **kwargs):
         results = list(routine(io.BytesIO(JSON), *args, **kwargs))
         assert expected_results == results
 
+    def _assert_path(self, expected_results, routine, *args, **kwargs):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = pathlib.Path(tmpdir) / 'test.json'
+            path.write_bytes(JSON)
+            results = list(routine(path, *args, **kwargs))
+        assert expected_results == results
+
+    def _assert_mmap(self, expected_results, routine, *args, **kwargs):
+        with tempfile.TemporaryFile() as f:
+            f.write(b'[] ' + JSON)
+            f.flush()
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapping:
+                # mmaps are read from their current position
+                mapping.seek(3)
+                results = list(routine(mapping, *args, **kwargs))
+        assert expected_results == results
+
+    def _assert_chunks(self, expected_results, routine, *args, **kwargs):
+        def chunks(size):
+            for start in range(0, len(JSON), size):
+                yield JSON[start:start + size]
+                # empty chunks don't finish the document
+                yield b''
+        for size in (1, 7, len(JSON)):
+            results = list(routine(chunks(size), *args, **kwargs))
+            assert expected_results == results
+        results = list(routine([bytearray(JSON[:10]), memoryview(JSON)[10:]], *args, **kwargs))
+        assert expected_results == results
+
     def _assert_async_file(self, expected_results, routine, *args, **kwargs):
         from .support.async_ import get_all
         results = get_all(routine, JSON, *args, **kwargs)
@@ -68,12 +127,46 @@ class TestMainEntryPoints:
         self._assert_invalid_type(routine, *args, **kwargs)
         self._assert_bytes(expected_results, routine, *args, **kwargs)
         self._assert_str(expected_results, routine, *args, **kwargs)
+        self._assert_buffers(expected_results, routine, *args, **kwargs)
         self._assert_file(expected_results, routine, *args, **kwargs)
+        self._assert_path(expected_results, routine, *args, **kwargs)
+        self._assert_mmap(expected_results, routine, *args, **kwargs)
+        self._assert_chunks(expected_results, routine, *args, **kwargs)
         self._assert_async_file(expected_results, routine, *args, **kwargs)
         self._assert_async_types_coroutine(expected_results, routine, *args, **kwargs)
         if previous_routine:
             self._assert_events(expected_results, previous_routine, routine, *args, **kwargs)
 
+    @pytest.mark.parametrize("data", [JSON, b'[1, ]'], ids=['valid', 'invalid'])
+    def test_mmap_released(self, backend, data):
+        """mmaps can be closed once parsed, even if their generator is still alive"""
+        with tempfile.TemporaryFile() as f:
+            f.write(data)
+            f.flush()
+            mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            results = backend.items(mapping, '')
+            try:
+                list(results)
+            except common.JSONError:
+                pass
+            mapping.close()
+
+    def test_path_mapping_released(self, backend, monkeypatch):
+        """mappings created for paths are unmapped once parsed"""
+        mappings = []
+        map_file = common._map_file
+        def tracked_map_file(path):
+            mapping = map_file(path)
+            mappings.append(weakref.ref(mapping))
+            return mapping
+        monkeypatch.setattr(common, '_map_file', tracked_map_file)
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = pathlib.Path(tmpdir) / 'test.json'
+            path.write_bytes(JSON)
+            results = backend.items(path, '')
+            assert [JSON_OBJECT] == list(results)
+            assert mappings[0]() is None
+
     def test_rich_basic_parse(self, backend):
         self._assert_entry_point(JSON_EVENTS, None, backend.basic_parse)
 
@@ -84,4 +177,70 @@ class TestMainEntryPoints:
         self._assert_entry_point([JSON_OBJECT], backend.parse, backend.items, '')
 
     def test_rich_kvitems(self, backend):
-        self._assert_entry_point(JSON_KVITEMS, backend.parse, backend.kvitems, 'docs.item')
\ No newline at end of file
+        self._assert_entry_point(JSON_KVITEMS, backend.parse, backend.kvitems, 'docs.item')
+
+    # the python backend complains about its incomplete document when its
+    # coroutines are garbage-collected after the error
+    @pytest.mark.filterwarnings("ignore::pytest.PytestUnraisableExceptionWarning")
+    def test_chunks_errors(self, backend):
+        def failing_chunks():
+            yield JSON[:10]
+            raise OSError('connection lost')
+        with pytest.raises(OSError, match='connection lost'):
+            list(backend.items(failing_chunks(), ''))
+        with pytest.raises(TypeError):
+            list(backend.items(iter([JSON[:10], 10]), ''))
+        with pytest.raises(common.IncompleteJSONError):
+            list(backend.items(iter([JSON[:10]]), ''))
+
+    @pytest.mark.filterwarnings("ignore::pytest.PytestUnraisableExceptionWarning")
+    def test_chunks_lazy(self, backend):
+        """Iterables aren't pulled from until the results are iterated"""
+        pulled = []
+        def chunks():
+            pulled.append(True)
+            yield JSON
+        def events(parse):
+            pulled.append(True)
+            yield from list(parse(JSON))
+        for routine, args, source in (
+            (backend.items, ('',), chunks()),
+            (backend.items, ('',), events(backend.parse)),
+            (backend.kvitems, ('docs.item',), events(backend.parse)),
+            (backend.parse, (), events(backend.basic_parse)),
+            (backend.basic_parse, (), chunks()),
+        ):
+            results = routine(source, *args)
+            assert not pulled
+            assert list(results)
+            assert pulled
+            del pulled[:]
+        results = backend.basic_parse(events(backend.basic_parse))
+        assert not pulled
+        with pytest.raises(ValueError):
+            list(results)
+
+    def test_read_ahead(self, backend, tmp_path):
+        path = tmp_path / 'test.json'
+        path.write_bytes(JSON)
+        sources = (JSON, io.BytesIO(JSON), path, iter([JSON[:10], JSON[10:]]))
+        for source in sources:
+            results = list(backend.items(source, '', read_ahead=True, buf_size=7))
+            assert [JSON_OBJECT] == results
+
+    def test_read_ahead_lazy_imports(self):
+        """The threading machinery of read_ahead is not imported with ijson"""
+        code = "import sys, ijson; print('queue' in sys.modules)"
+        assert b'False' == subprocess.check_output([sys.executable, '-c', code]).strip()
+
+    def test_threads(self, backend):
+        """Documents can be parsed concurrently by several threads"""
+        results = {}
+        def parse(i):
+            results[i] = list(backend.items(JSON * 50, '', multiple_values=True, buf_size=64))
+        threads = [threading.Thread(target=parse, args=(i,)) for i in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert {i: [JSON_OBJECT] * 50 for i in range(4)} == results
\ No newline at end of file
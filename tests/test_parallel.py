@@ -0,0 +1,191 @@
+"""Tests for the ijson.parallel module"""
+
+import concurrent.futures
+import decimal
+import io
+import json
+import subprocess
+import sys
+
+import pytest
+
+import ijson
+from ijson import common, parallel
+
+
+DOCUMENTS = [
+    {"id": i, "tags": ["t%d" % j for j in range(i % 4)], "text": "café " * (i % 7)}
+    for i in range(200)
+]
+
+
+@pytest.fixture
+def jsonl(tmp_path):
+    path = tmp_path / 'test.jsonl'
+    lines = [json.dumps(document, ensure_ascii=False) for document in DOCUMENTS]
+    # blank lines and a missing final newline are allowed
+    path.write_bytes(('\n'.join(lines[:50]) + '\n\n' + '\n'.join(lines[50:])).encode('utf-8'))
+    return str(path)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 100, 1024 * 1024])
+def test_items_jsonl(jsonl, chunk_size):
+    """Items are yielded in file order"""
+    with open(jsonl, 'rb') as f:
+        expected = list(ijson.items(f, 'tags.item', multiple_values=True))
+    items = list(parallel.items_jsonl(jsonl, 'tags.item', workers=2, chunk_size=chunk_size))
+    assert expected == items
+
+
+def test_items_jsonl_documents(jsonl):
+    """Whole documents are yielded with an empty prefix"""
+    assert DOCUMENTS == list(parallel.items_jsonl(jsonl, '', workers=2, chunk_size=1000))
+
+
+def test_items_jsonl_unordered(jsonl):
+    """Items can be yielded as their ranges are parsed"""
+    ids = list(parallel.items_jsonl(jsonl, 'id', workers=2, ordered=False, chunk_size=500))
+    assert list(range(len(DOCUMENTS))) == sorted(ids)
+
+
+def test_items_jsonl_config(jsonl):
+    """Additional arguments are given to items"""
+    documents = list(parallel.items_jsonl(jsonl, '', workers=2, chunk_size=1000, fields=['id']))
+    assert [{'id': document['id']} for document in DOCUMENTS] == documents
+
+
+def test_items_jsonl_ranges(jsonl):
+    """Ranges cover the whole file, and end at newlines"""
+    with open(jsonl, 'rb') as f:
+        contents = f.read()
+    ranges = list(parallel._lines_ranges(jsonl, 100))
+    assert 0 == ranges[0][0]
+    assert len(contents) == ranges[-1][1]
+    for (_, end), (start, _) in zip(ranges, ranges[1:]):
+        assert end == start
+        assert b'\n' == contents[end - 1:end]
+
+
+def test_items_jsonl_invalid(tmp_path):
+    """Errors in any range are raised"""
+    path = tmp_path / 'invalid.jsonl'
+    path.write_bytes(b'{"a": 1}\n' * 100 + b'{"a": \n' + b'{"a": 2}\n' * 100)
+    with pytest.raises(common.JSONError):
+        list(parallel.items_jsonl(str(path), 'a', workers=2, chunk_size=100))
+
+
+ARRAY = json.dumps([
+    {"id": 0, "text": "a \"quoted\", [bracketed] {braced} string\\"},
+    ["\\\\", "]", [1, [2, {",": "}"}]]],
+    "\\\"[{,",
+    None, 1.5, True, {}, [],
+    {"nested": {"id": 1, "items": [{"id": 2}, {"id": 3}]}},
+] * 20, ensure_ascii=False, indent=1).encode('utf-8')
+
+
+@pytest.fixture
+def array(tmp_path):
+    path = tmp_path / 'test.json'
+    path.write_bytes(ARRAY)
+    return str(path)
+
+
+@pytest.mark.parametrize("prefix", ['item', 'item.item', 'item.nested.items.item', '', 'item.id'])
+@pytest.mark.parametrize("chunk_size", [1, 7, 100, 1024 * 1024])
+def test_items(array, prefix, chunk_size):
+    """Items are yielded in the same order as with a sequential parse"""
+    expected = list(ijson.items(ARRAY, prefix))
+    assert expected == list(parallel.items(array, prefix, workers=2, chunk_size=chunk_size))
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 100])
+def test_items_splits(array, chunk_size):
+    """Ranges contain whole elements of the top-level array"""
+    with concurrent.futures.ProcessPoolExecutor(max_workers=2) as executor:
+        ranges = list(parallel._array_ranges(executor, array, 'item', chunk_size, {}))
+    assert len(ranges) > 1
+    elements = []
+    for start, end, head, tail in ranges:
+        elements += json.loads(head + ARRAY[start:end] + tail)
+    assert json.loads(ARRAY) == elements
+
+
+def test_items_not_array(tmp_path):
+    """Documents that aren't arrays are parsed by a single worker"""
+    path = tmp_path / 'object.json'
+    path.write_bytes(json.dumps({"item": [1, 2, 3]}).encode('utf-8'))
+    assert [1, 2, 3] == list(parallel.items(str(path), 'item.item', workers=2, chunk_size=1))
+
+
+def test_items_invalid(tmp_path):
+    """Errors in any range are raised"""
+    path = tmp_path / 'invalid.json'
+    path.write_bytes(b'[' + b'{"a": 1},' * 100 + b'{"a": ],' + b'{"a": 2},' * 100 + b'{}]')
+    with pytest.raises(common.JSONError):
+        list(parallel.items(str(path), 'item.a', workers=2, chunk_size=100))
+
+
+@pytest.mark.parametrize("in_string", [False, True])
+def test_scan(in_string):
+    """Chunks are scanned for either of the states they can start in"""
+    assert (False, 2) == parallel._scan(b'[{"a": "]"}, "\\"[", [', False)
+    assert (True, -2) == parallel._scan(b'a]", "b\\"]"}], "c', True)
+    scan_structure = parallel._scan_structure
+    if scan_structure is None:
+        pytest.skip("yajl2_c is not available")
+    for start in range(len(ARRAY)):
+        if ARRAY[start - 1:start] == b'\\':
+            continue
+        chunk = ARRAY[start:start + 50]
+        assert parallel._scan(chunk, in_string) == scan_structure(chunk)[in_string]
+
+
+def test_parse_many(tmp_path):
+    """Results are given for each document, in order"""
+    documents = [json.dumps(document).encode('utf-8') for document in DOCUMENTS]
+    path = tmp_path / 'document.json'
+    path.write_bytes(documents[0])
+    sources = [path] + documents[1:]
+    expected = [list(ijson.items(document, 'tags.item')) for document in documents]
+    assert expected == list(ijson.parse_many(sources, 'items', 'tags.item', workers=3))
+    expected = [list(ijson.basic_parse(document)) for document in documents]
+    assert expected == list(ijson.parse_many(documents, 'basic_parse', workers=3))
+
+
+def test_parse_many_file_objects():
+    """Documents are parsed in threads, so sources need not be picklable"""
+    documents = [json.dumps(document).encode('utf-8') for document in DOCUMENTS]
+    expected = [list(ijson.items(document, 'tags.item')) for document in documents]
+    files = [io.BytesIO(document) for document in documents]
+    assert expected == list(ijson.parse_many(files, 'items', 'tags.item', workers=3))
+
+
+def test_parse_many_lazy_import():
+    """parse_many and its executors are only imported when used"""
+    code = (
+        "import sys, ijson; "
+        "print(any(m in sys.modules for m in ('ijson.parallel', 'concurrent.futures', 'threading'))); "
+        "print(ijson.parse_many is sys.modules['ijson.parallel'].parse_many)"
+    )
+    assert [b'False', b'True'] == subprocess.check_output([sys.executable, '-c', code]).split()
+    with pytest.raises(AttributeError):
+        ijson.does_not_exist
+
+
+def test_parse_many_unordered():
+    documents = [json.dumps(document).encode('utf-8') for document in DOCUMENTS]
+    results = ijson.parse_many(documents, 'kvitems', '', workers=3, ordered=False, use_float=True)
+    expected = [list(ijson.kvitems(document, '')) for document in documents]
+    assert sorted(map(repr, expected)) == sorted(map(repr, results))
+
+
+def test_parse_many_backend():
+    results = ijson.parse_many([b'[1.5]'], 'items', 'item', backend='python')
+    assert [[decimal.Decimal('1.5')]] == list(results)
+
+
+def test_parse_many_invalid():
+    with pytest.raises(common.JSONError):
+        list(ijson.parse_many([b'[1]', b'[1, ]', b'[2]'], 'items', 'item', workers=2))
+    with pytest.raises(ValueError):
+        list(ijson.parse_many([b'[1]'], 'columns', 'item'))
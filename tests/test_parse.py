@@ -1,5 +1,7 @@
 """Tests for the ijson.parse method"""
 
+import itertools
+
 import pytest
 
 from .test_base import ARRAY_JSON, ARRAY_JSON_PARSE_EVENTS, JSON, JSON_PARSE_EVENTS
@@ -10,6 +12,12 @@ def test_parse(adaptor):
 def test_parse_array(adaptor):
     assert ARRAY_JSON_PARSE_EVENTS == adaptor.parse(ARRAY_JSON)
 
+@pytest.mark.parametrize("batch_size", (None, 3))
+def test_parse_batched(backend, batch_size):
+    batches = list(backend.parse_batched(JSON, batch_size=batch_size, buf_size=5))
+    assert JSON_PARSE_EVENTS == list(itertools.chain.from_iterable(batches))
+
+
 def test_coro_needs_input_with_two_elements(backend):
     int_element_basic_parse_events = list(backend.basic_parse(b'0', use_float=True))
     # all good
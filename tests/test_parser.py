@@ -0,0 +1,97 @@
+"""Tests for the Parser push interface"""
+
+import pytest
+
+from ijson import common
+
+from .test_base import JSON, JSON_EVENTS, JSON_KVITEMS, JSON_OBJECT, JSON_PARSE_EVENTS, INVALID_JSONS
+
+
+def _feed_all(parser, data, chunk_size=5):
+    results = []
+    for i in range(0, len(data), chunk_size):
+        results.extend(parser.feed(data[i:i + chunk_size]))
+    return results + parser.close()
+
+
+@pytest.mark.parametrize("method, args, expected", [
+    ('basic_parse', (), JSON_EVENTS),
+    ('parse', (), JSON_PARSE_EVENTS),
+    ('items', ('',), [JSON_OBJECT]),
+    ('kvitems', ('docs.item',), JSON_KVITEMS),
+])
+def test_methods(backend, method, args, expected):
+    assert expected == _feed_all(backend.Parser(method, *args), JSON)
+
+
+def test_results_per_chunk(backend):
+    """Each feed returns the results completed by its chunk"""
+    parser = backend.Parser('items', 'item', use_float=True)
+    assert [1, 2] == parser.feed(b'[1, 2, {"a"')
+    assert [{"a": 3}] == parser.feed(b': 3}, [4')
+    assert [[4]] == parser.feed(b']]')
+    assert [] == parser.feed(b'')
+    assert [] == parser.close()
+    assert [] == parser.close()
+
+
+def test_reset(backend):
+    """Parsers can be reused for many documents"""
+    parser = backend.Parser('items', 'item.a')
+    for i in range(3):
+        assert [i] == parser.feed(b'[{"a": %d}]' % i)
+        assert [] == parser.close()
+        parser.reset()
+    # also halfway through a document
+    assert [] == parser.feed(b'[{"a": ')
+    parser.reset()
+    assert [4] == _feed_all(parser, b'[{"a": 4}]')
+
+
+def test_multiple_values(backend):
+    parser = backend.Parser('kvitems', '', multiple_values=True)
+    assert [('a', 1), ('b', 2)] == parser.feed(b'{"a": 1} {"b": 2}')
+    assert [] == parser.close()
+
+
+def test_closed(backend):
+    parser = backend.Parser('items', '')
+    parser.feed(b'[]')
+    parser.close()
+    with pytest.raises(ValueError):
+        parser.feed(b'[]')
+
+
+@pytest.mark.parametrize("invalid", INVALID_JSONS)
+def test_invalid(backend, invalid):
+    """Parsers are closed after errors, but can be reset"""
+    parser = backend.Parser('basic_parse')
+    with pytest.raises(common.JSONError):
+        _feed_all(parser, invalid)
+    with pytest.raises(ValueError):
+        parser.feed(b'[]')
+    parser.reset()
+    assert [('start_array', None), ('end_array', None)] == _feed_all(parser, b'[]')
+
+
+def test_results_before_errors(backend):
+    parser = backend.Parser('items', 'item')
+    with pytest.raises(common.JSONError):
+        parser.feed(b'[1, 2, ]')
+    assert [1, 2] == parser.close()
+
+
+def test_incomplete(backend):
+    parser = backend.Parser('items', 'item')
+    parser.feed(b'[1, 2')
+    with pytest.raises(common.IncompleteJSONError):
+        parser.close()
+
+
+def test_invalid_method(backend):
+    with pytest.raises(ValueError):
+        backend.Parser('columns', '')
+
+
+def test_docstring(backend):
+    assert common._PARSER_DOC == backend.Parser.__doc__